@@ -0,0 +1,46 @@
+"""
+Key generation throughput per CSR key type.
+
+    python benchmarks/bench_keys.py [--seconds 2] [--types ec-p256 ed25519]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from converter.converters.csr_converter import build_csr  # noqa: E402
+from converter.engines.keys import KEY_TYPES, generate_key  # noqa: E402
+
+
+def measure(key_type: str, seconds: float, with_csr: bool) -> float:
+    """Keys (or key + CSR pairs) generated per second."""
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        key = generate_key(key_type)
+        if with_csr:
+            build_csr({"cn": "bench.example.com"}, key)
+        count += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="Time spent per key type")
+    parser.add_argument("--types", nargs="+", choices=list(KEY_TYPES), default=list(KEY_TYPES))
+    parser.add_argument("--csr", action="store_true", help="Also build and sign a CSR with each key")
+    args = parser.parse_args()
+
+    print(f"{'key type':<10} {'per second':>12} {'ms each':>10}")
+    for key_type in args.types:
+        rate = measure(key_type, args.seconds, args.csr)
+        print(f"{key_type:<10} {rate:>12.1f} {1000 / rate:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Synthetic, reproducible inputs for the benchmark suite.
+
+Every generator takes a row count and a seed, and mixes in a small share of
+invalid rows (``error_rate``) so error paths are measured too.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List
+
+#: Share of invalid rows mixed into generated inputs
+ERROR_RATE = 0.01
+
+_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+_SPAN = 5 * 365 * 86400
+
+
+def _rows(n: int, seed: int, error_rate: float, valid) -> Iterator[str]:
+    rng = random.Random(seed)
+    for i in range(n):
+        yield f"bad-{i}" if rng.random() < error_rate else valid(rng)
+
+
+def timestamps(n: int, seed: int = 1, error_rate: float = ERROR_RATE) -> Iterator[str]:
+    """Unix timestamps, some with fractional seconds."""
+    def valid(rng):
+        value = 1577836800 + rng.randrange(_SPAN)
+        return str(value) if rng.random() < 0.7 else f"{value}.{rng.randrange(1000):03d}"
+    return _rows(n, seed, error_rate, valid)
+
+
+def iso_datetimes(n: int, seed: int = 2, error_rate: float = ERROR_RATE) -> Iterator[str]:
+    """ISO 8601 datetimes with offsets, as found in logs."""
+    def valid(rng):
+        moment = _EPOCH + timedelta(seconds=rng.randrange(_SPAN))
+        return moment.isoformat()
+    return _rows(n, seed, error_rate, valid)
+
+
+def iso_variants(n: int, seed: int = 6, error_rate: float = ERROR_RATE) -> Iterator[str]:
+    """ISO 8601 datetimes as other systems write them: space separator, comma milliseconds, 'Z'."""
+    def valid(rng):
+        moment = _EPOCH + timedelta(seconds=rng.randrange(_SPAN), milliseconds=rng.randrange(1000))
+        return moment.strftime("%Y-%m-%d %H:%M:%S,") + f"{moment.microsecond // 1000:03d}Z"
+    return _rows(n, seed, error_rate, valid)
+
+
+def hex_numbers(n: int, seed: int = 3, error_rate: float = ERROR_RATE) -> Iterator[str]:
+    """Hexadecimal numbers of up to 64 bits, with a 0x prefix."""
+    return _rows(n, seed, error_rate, lambda rng: hex(rng.getrandbits(rng.choice((8, 16, 32, 64)))))
+
+
+def hex_timestamps(n: int, seed: int = 7, error_rate: float = ERROR_RATE) -> Iterator[str]:
+    """Unix timestamps in hexadecimal, as some devices log them."""
+    return _rows(n, seed, error_rate, lambda rng: hex(1577836800 + rng.randrange(_SPAN)))
+
+
+def decimal_numbers(n: int, seed: int = 4, error_rate: float = ERROR_RATE) -> Iterator[str]:
+    """Decimal numbers of up to 64 bits."""
+    return _rows(n, seed, error_rate, lambda rng: str(rng.getrandbits(rng.choice((8, 16, 32, 64)))))
+
+
+def subjects(n: int, seed: int = 5) -> List[Dict[str, str]]:
+    """CSR subjects with distinct common names."""
+    rng = random.Random(seed)
+    return [{"cn": f"host{i}.example.com", "c": "US", "st": "CA", "l": "San Francisco",
+             "o": rng.choice(("Acme", "Globex", "Initech")), "ou": "IT"} for i in range(n)]
+
+
+def write_lines(path: str, lines: Iterator[str]) -> str:
+    """Write lines to a file and return its path."""
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+    return path
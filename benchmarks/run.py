@@ -0,0 +1,126 @@
+"""
+Run the benchmark suite, save the results as JSON and compare them with a baseline.
+
+    python benchmarks/run.py [--full] [--filter number] [--output results.json]
+                             [--compare baseline.json] [--threshold 0.25]
+
+Sizes above --max-size (100,000 rows by default) are skipped unless --full
+is given. Exits with status 1 if --compare finds a regression.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from suite import BENCHMARKS, Workspace  # noqa: E402
+
+
+def measure(run, min_time: float, max_repeats: int) -> Dict[str, Any]:
+    """
+    Time a function, repeating it until ``min_time`` seconds have passed (at
+    most ``max_repeats`` times), and keep the best run.
+    """
+    times = []
+    rows = 0
+    spent = 0.0
+    while not times or (spent < min_time and len(times) < max_repeats):
+        start = time.perf_counter()
+        rows = run()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        spent += elapsed
+    best = min(times)
+    return {"seconds": best, "rows": rows, "rows_per_second": rows / best if best else None, "repeats": len(times)}
+
+
+def machine() -> Dict[str, Any]:
+    """Where the results were measured; comparisons across machines are only indicative."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def key(result: Dict[str, Any]) -> str:
+    return f"{result['name']}[{result['size']}]"
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Benchmarks slower than the baseline by more than ``threshold`` (a fraction)."""
+    previous = {key(result): result for result in baseline["results"]}
+    regressions = []
+    print(f"\n{'benchmark':<36} {'baseline':>10} {'now':>10} {'change':>8}")
+    for result in results:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        change = result["seconds"] / before["seconds"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key(result))
+        print(f"{key(result):<36} {before['seconds']:>10.4f} {result['seconds']:>10.4f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", nargs="+", default=["*"], help="Run only benchmarks matching these patterns (e.g. 'number.*')")
+    parser.add_argument("--max-size", type=int, default=100_000, help="Skip sizes above this many rows")
+    parser.add_argument("--full", action="store_true", help="Run every size, up to 10 million rows")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Repeat each benchmark for at least this many seconds")
+    parser.add_argument("--max-repeats", type=int, default=10)
+    parser.add_argument("--output", help="Save the results to this JSON file (e.g. to serve as a baseline)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare with results saved by --output")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Slowdown reported as a regression (0.25 = 25%%)")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    selected = [bench for bench in BENCHMARKS if any(fnmatch.fnmatch(bench.name, pattern) or pattern in bench.name
+                                                     for pattern in args.filter)]
+    if args.list:
+        for bench in selected:
+            print(f"{bench.name:<28} sizes {', '.join(f'{size:,}' for size in bench.sizes)}")
+        return
+
+    results = []
+    workspace = Workspace()
+    try:
+        print(f"{'benchmark':<36} {'seconds':>10} {'rows/s':>14} {'runs':>5}")
+        for bench in selected:
+            for size in bench.sizes:
+                if size > args.max_size and not args.full:
+                    continue
+                run = bench.setup(size, workspace)
+                result = dict(name=bench.name, size=size, **measure(run, args.min_time, args.max_repeats))
+                results.append(result)
+                rate = f"{result['rows_per_second']:,.0f}" if result["rows_per_second"] else "-"
+                print(f"{key(result):<36} {result['seconds']:>10.4f} {rate:>14} {result['repeats']:>5}", flush=True)
+    finally:
+        workspace.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
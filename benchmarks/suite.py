@@ -0,0 +1,253 @@
+"""
+Benchmark definitions: conversions, ISO 8601 parsing, pipelines, exports,
+CSR generation and decoding, and CLI cold start.
+
+Each benchmark prepares its input for a given size in a Workspace and
+returns the function to time, which returns the number of rows it handled.
+"""
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+import data
+from cryptography.hazmat.primitives import serialization
+
+from converter.converters.csr_converter import CSRConverter, build_csr
+from converter.converters.datetime_converter import DatetimeConverter
+from converter.converters.number_converter import NumberConverter
+from converter.core.exporters import EXPORTERS
+from converter.core.pipeline import Pipeline, Stage
+from converter.core.results import ResultBatch, ResultSink
+from converter.core.streaming import chunked
+from converter.engines.keys import generate_key
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+CONVERSION_SIZES = (1_000, 100_000, 10_000_000)
+EXPORT_SIZES = (1_000, 100_000, 1_000_000)
+PARSE_SIZES = (1_000, 100_000, 1_000_000)
+CSR_SIZES = (10, 100, 1_000)
+
+Timed = Callable[[], int]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    sizes: Tuple[int, ...]
+    setup: Callable[[int, "Workspace"], Timed]
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, sizes: Tuple[int, ...]):
+    def register(setup: Callable[[int, "Workspace"], Timed]):
+        BENCHMARKS.append(Benchmark(name, sizes, setup))
+        return setup
+    return register
+
+
+class Workspace:
+    """Temporary directory holding generated inputs, shared by the benchmarks of one run."""
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix="converter-bench-")
+        self._files: Dict[Tuple[str, int], str] = {}
+
+    def file(self, kind: str, size: int, generate: Callable[[], str]) -> str:
+        """Path of a generated input, created on first use."""
+        key = (kind, size)
+        if key not in self._files:
+            self._files[key] = generate()
+        return self._files[key]
+
+    def lines(self, kind: str, size: int) -> str:
+        """File of ``size`` synthetic lines from the ``data`` generator named ``kind``."""
+        return self.file(kind, size, lambda: data.write_lines(
+            os.path.join(self.root, f"{kind}-{size}.txt"), getattr(data, kind)(size)))
+
+    def directory(self) -> str:
+        return tempfile.mkdtemp(dir=self.root)
+
+    def close(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class CountSink(ResultSink):
+    """Discards results, counting rows."""
+    def __init__(self):
+        self.rows = 0
+
+    def write(self, batch: ResultBatch):
+        self.rows += len(batch)
+
+
+def _conversion(converter_cls, mode: str, kind: str):
+    def setup(size: int, workspace: Workspace) -> Timed:
+        path = workspace.lines(kind, size)
+
+        def run() -> int:
+            sink = CountSink()
+            converter_cls().run([sink], **{mode: "", "input": path, "no_cache": True})
+            return sink.rows
+        return run
+    return setup
+
+
+benchmark("datetime.to_dt", CONVERSION_SIZES)(_conversion(DatetimeConverter, "to_dt", "timestamps"))
+benchmark("datetime.to_ts", CONVERSION_SIZES)(_conversion(DatetimeConverter, "to_ts", "iso_datetimes"))
+benchmark("number.hex2dec", CONVERSION_SIZES)(_conversion(NumberConverter, "hex2dec", "hex_numbers"))
+benchmark("number.dec2hex", CONVERSION_SIZES)(_conversion(NumberConverter, "dec2hex", "decimal_numbers"))
+
+
+def _iso_parsing(kind: str, fast_path: bool):
+    """to_ts conversion of in-memory chunks, through the converter or fromisoformat row by row."""
+    def setup(size: int, workspace: Workspace) -> Timed:
+        with open(workspace.lines(kind, size), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        converter = DatetimeConverter()
+
+        def to_timestamp(line: str) -> float:
+            return datetime.fromisoformat(line).timestamp()
+
+        def run() -> int:
+            for chunk in chunked(lines, converter.chunk_size):
+                if fast_path:
+                    converter.convert_chunk("to_ts", chunk)
+                else:
+                    converter.convert_each(chunk, to_timestamp)
+            return len(lines)
+        return run
+    return setup
+
+
+for _kind, _label in (("iso_datetimes", "offsets"), ("iso_variants", "variants")):
+    benchmark(f"iso.fast_path.{_label}", PARSE_SIZES)(_iso_parsing(_kind, True))
+    benchmark(f"iso.fromisoformat.{_label}", PARSE_SIZES)(_iso_parsing(_kind, False))
+
+
+def _pipeline(typed: bool):
+    """hex2dec then to_dt in one Pipeline, or through the text of the first conversion as in a shell pipe."""
+    def setup(size: int, workspace: Workspace) -> Timed:
+        path = workspace.lines("hex_timestamps", size)
+
+        def run() -> int:
+            sink = CountSink()
+            if typed:
+                pipeline = Pipeline([Stage(NumberConverter(), "hex2dec"), Stage(DatetimeConverter(), "to_dt")])
+                pipeline.run([sink], input=path, no_cache=True)
+                return sink.rows
+            text = io.StringIO()
+            NumberConverter().convert_to(text, hex2dec="", input=path, no_cache=True)
+            DatetimeConverter().run([sink], to_dt=text.getvalue())
+            return sink.rows
+        return run
+    return setup
+
+
+benchmark("pipe.typed.hex2dec_to_dt", CONVERSION_SIZES)(_pipeline(True))
+benchmark("pipe.text.hex2dec_to_dt", CONVERSION_SIZES)(_pipeline(False))
+
+
+def _export(extension: str):
+    def setup(size: int, workspace: Workspace) -> Timed:
+        # Results are converted once, only writing them is timed
+        sink_batches = []
+
+        class Keep(ResultSink):
+            def write(self, batch):
+                sink_batches.append(batch)
+
+        NumberConverter().run([Keep()], hex2dec="", input=workspace.lines("hex_numbers", size), no_cache=True)
+        target = os.path.join(workspace.root, f"export-{size}{extension}")
+
+        def run() -> int:
+            sink = EXPORTERS[extension](target)
+            for batch in sink_batches:
+                sink.write(batch)
+            sink.close()
+            return size
+        return run
+    return setup
+
+
+benchmark("export.csv", EXPORT_SIZES)(_export(".csv"))
+benchmark("export.jsonl", EXPORT_SIZES)(_export(".jsonl"))
+benchmark("export.xlsx", EXPORT_SIZES)(_export(".xlsx"))
+
+
+def _write_subjects(path: str, size: int) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("cn,c,st,l,o,ou\n")
+        for subject in data.subjects(size):
+            f.write(",".join(subject[field] for field in ("cn", "c", "st", "l", "o", "ou")) + "\n")
+    return path
+
+
+def _generate(key_type: str):
+    def setup(size: int, workspace: Workspace) -> Timed:
+        subjects = workspace.file("subjects", size, lambda: _write_subjects(
+            os.path.join(workspace.root, f"subjects-{size}.csv"), size))
+
+        def run() -> int:
+            sink = CountSink()
+            CSRConverter().run([sink], generate_bulk=subjects, output_dir=workspace.directory(), key_type=key_type)
+            return sink.rows
+        return run
+    return setup
+
+
+benchmark("csr.generate.ec-p256", CSR_SIZES)(_generate("ec-p256"))
+benchmark("csr.generate.rsa2048", CSR_SIZES[:1])(_generate("rsa2048"))
+
+
+def _write_bundle(path: str, size: int) -> str:
+    key = generate_key("ec-p256")
+    with open(path, "w", encoding="utf-8") as f:
+        for subject in data.subjects(size):
+            f.write(build_csr(subject, key).public_bytes(serialization.Encoding.PEM).decode("ascii"))
+    return path
+
+
+@benchmark("csr.decode_bulk", CSR_SIZES)
+def _decode(size: int, workspace: Workspace) -> Timed:
+    bundle = workspace.file("bundle", size, lambda: _write_bundle(
+        os.path.join(workspace.root, f"bundle-{size}.pem"), size))
+
+    def run() -> int:
+        sink = CountSink()
+        CSRConverter().run([sink], decode_bulk=bundle)
+        return sink.rows
+    return run
+
+
+COLD_START = {
+    "number": ["number", "--hex2dec", "0xA"],
+    "datetime": ["datetime", "--to-dt", "1672574400"],
+    "csr": ["csr", "--generate-csr", "--cn", "example.com", "--key-type", "ec-p256"],
+}
+
+
+def _cold_start(argv: List[str]):
+    def setup(size: int, workspace: Workspace) -> Timed:
+        env = dict(os.environ, UNIVERSAL_CONVERTER_CACHE_DIR=os.path.join(workspace.root, "cache"),
+                   UNIVERSAL_CONVERTER_NO_DAEMON="1",
+                   PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")])))
+        # Warm the plugin manifest, as any installed CLI would have
+        subprocess.run([sys.executable, "-m", "converter", "--help"], capture_output=True, env=env, check=True)
+
+        def run() -> int:
+            subprocess.run([sys.executable, "-m", "converter"] + argv, capture_output=True, env=env, check=True)
+            return 1
+        return run
+    return setup
+
+
+for _name, _argv in COLD_START.items():
+    benchmark(f"cli.cold_start.{_name}", (1,))(_cold_start(_argv))
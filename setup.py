@@ -12,10 +12,18 @@ setup(
         "pandas>=2.0.0",
         "openpyxl>=3.1.0"
     ],
+    extras_require={
+        "parquet": ["pyarrow>=12.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "universal-converter=converter.cli:main",
             "universal-converter-gui=converter.gui.app:main",
         ],
+        "universal_converter.converters": [
+            "datetime=converter.converters.datetime_converter:DatetimeConverter",
+            "number=converter.converters.number_converter:NumberConverter",
+            "csr=converter.converters.csr_converter:CSRConverter",
+        ],
     },
 )
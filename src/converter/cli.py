@@ -1,13 +1,17 @@
+import os
 import sys
+import time
 import argparse
-from typing import Optional
+from typing import List, Optional
+from .client import forward
 from .core.registry import ConverterRegistry
 from .utils.logger import setup_logger
 from .core.exceptions import ConverterError
+from .core.metrics import METRICS
 from .core.arguments import InterfaceBuilder, ArgumentGroup, Argument, ArgumentType
 
-# Import converters
-from .converters import datetime_converter, number_converter, csr_converter
+# Registers the built-in converters lazily; their modules load on selection
+from . import converters
 
 logger = setup_logger()
 
@@ -40,42 +44,138 @@ class CLIBuilder(InterfaceBuilder):
         parser.add_argument(flag_name, dest=arg.name, **kwargs)
 
 
-def main():
+# Top-level options followed by a value
+VALUE_OPTIONS = {"--profile-out"}
+
+
+def _selected_command(argv: List[str], names) -> Optional[str]:
+    """Return the subcommand named on the command line, if any."""
+    tokens = iter(argv)
+    for token in tokens:
+        if token in VALUE_OPTIONS:
+            next(tokens, None)
+        elif not token.startswith("-"):
+            return token if token in names else None
+    return None
+
+
+def _report_profile(args, profiler):
+    """Print the stage summary for --profile and write the --profile-out file."""
+    if args.profile:
+        sys.stderr.write(METRICS.summary())
+    if not args.profile_out:
+        return
+    if args.profile_out.endswith(".json"):
+        with open(args.profile_out, "w", encoding="utf-8") as f:
+            f.write(METRICS.to_json())
+    else:
+        profiler.dump_stats(args.profile_out)
+    logger.info(f"Profile written to {args.profile_out}")
+
+
+def _run(args, load, kwargs):
+    """Load the converter, convert and print the results, profiling both if asked to."""
+    profiler = None
+    if args.profile_out and not args.profile_out.endswith(".json"):
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    with METRICS.stage("import", args.command):
+        converter = load()
+    converter.convert(**kwargs)
+    if profiler is not None:
+        profiler.disable()
+    if args.profile or args.profile_out:
+        _report_profile(args, profiler)
+
+
+def _add_serve_parser(subparsers):
+    serve = subparsers.add_parser("serve", help="Run a daemon that keeps the converters warm")
+    where = serve.add_mutually_exclusive_group()
+    where.add_argument("--socket", help="Unix socket to listen on (default: $UNIVERSAL_CONVERTER_SOCKET or the cache directory)")
+    where.add_argument("--port", type=int, help="Serve HTTP on 127.0.0.1 at this port instead")
+
+
+def _add_pipe_parser(subparsers, selected: bool):
+    pipe = subparsers.add_parser("pipe", help="Chain batch converters in one pass (e.g. number:hex2dec datetime:to_dt)")
+    if not selected:
+        return
+    from .core.pipeline import Pipeline
+    pipe.add_argument("stages", nargs="+", metavar="CONVERTER:MODE", help="Stages, in order")
+    builder = CLIBuilder(pipe)
+    Pipeline.configure_args(builder)
+    builder.build()
+
+
+def main(argv: Optional[List[str]] = None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    start = time.perf_counter()
     parser = argparse.ArgumentParser(description="Universal Converter Platform CLI")
+    parser.add_argument("--profile", action="store_true", help="Print time per stage, throughput and peak memory to stderr")
+    parser.add_argument("--profile-out", metavar="FILE", help="Write the stage timings (FILE.json) or cProfile stats (any other name) to FILE")
     subparsers = parser.add_subparsers(dest="command", help="Available converters")
 
-    converters = ConverterRegistry.get_converters()
+    available = ConverterRegistry.get_metadata()
+    selected = _selected_command(argv, list(available) + ["serve", "pipe"])
+    _add_serve_parser(subparsers)
+    _add_pipe_parser(subparsers, selected == "pipe")
 
-    for name, converter_cls in converters.items():
-        converter_instance = converter_cls()
-        subparser = subparsers.add_parser(name, help=converter_instance.help)
+    for name, info in available.items():
+        subparser = subparsers.add_parser(name, help=info.help)
+        if name != selected:
+            # Only the selected converter gets its arguments built
+            continue
 
-        # Build arguments
+        # Build arguments from the cached spec; the converter module itself
+        # is imported only once parsing succeeded.
         builder = CLIBuilder(subparser)
-        converter_instance.configure_args(builder)
+        info.build_args(builder)
         builder.build()
 
-        subparser.set_defaults(converter=converter_instance)
-
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    METRICS.add_time("arguments", time.perf_counter() - start)
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
-    if hasattr(args, 'converter'):
-        try:
-            # Convert Namespace to dict
-            kwargs = vars(args)
-            # Remove system args
-            clean_kwargs = {k:v for k,v in kwargs.items() if k != 'command' and k != 'converter'}
-            args.converter.convert(**clean_kwargs)
-        except ConverterError as e:
-            logger.error(str(e))
-            sys.exit(1)
-        except Exception as e:
-            logger.exception(f"An unexpected error occurred: {e}")
-            sys.exit(1)
+    try:
+        if args.command == "serve":
+            from .daemon import serve
+            serve(socket_path=args.socket, port=args.port)
+            return
+
+        # Convert Namespace to dict
+        kwargs = vars(args)
+        # Remove system args
+        clean_kwargs = {k:v for k,v in kwargs.items() if k not in ('command', 'profile', 'profile_out', 'stages')}
+        profiling = args.profile or args.profile_out
+
+        if args.command == "pipe":
+            # Pipelines run here: the daemon serves single converters
+            from .core.pipeline import Pipeline
+            _run(args, lambda: Pipeline.from_specs(args.stages), clean_kwargs)
+            return
+
+        # A running daemon answers without importing anything here
+        # (profiles are taken locally, where the work happens)
+        if not profiling and not os.environ.get("UNIVERSAL_CONVERTER_NO_DAEMON"):
+            reply = forward(args.command, clean_kwargs, available[args.command].spec, sys.stdout)
+            if reply is not None:
+                if reply["status"]:
+                    logger.error(reply.get("error", "Conversion failed"))
+                    sys.exit(reply["status"])
+                return
+
+        _run(args, lambda: ConverterRegistry.get_converter(args.command)(), clean_kwargs)
+    except ConverterError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred: {e}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
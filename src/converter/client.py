@@ -0,0 +1,103 @@
+"""
+Thin client for the ``universal-converter serve`` daemon.
+
+Kept free of heavy imports: the CLI loads it on every call to find out
+whether a daemon can take the request.
+"""
+import json
+import os
+import socket
+import time
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+from .core.arguments import ArgumentType, InterfaceBuilder
+from .core.manifest import cache_dir
+from .core.streaming import STDIN
+
+#: Argument types holding paths, which are resolved before forwarding.
+PATH_TYPES = (ArgumentType.FILE_OPEN, ArgumentType.FILE_SAVE, ArgumentType.DIRECTORY)
+
+
+def default_socket_path() -> str:
+    """Socket of the daemon: $UNIVERSAL_CONVERTER_SOCKET, else daemon.sock in the cache directory."""
+    return os.environ.get("UNIVERSAL_CONVERTER_SOCKET") or os.path.join(cache_dir(), "daemon.sock")
+
+
+def default_token_path(socket_path: Optional[str] = None) -> str:
+    """Token file of an HTTP daemon: daemon.token next to the socket."""
+    return os.path.join(os.path.dirname(socket_path or default_socket_path()), "daemon.token")
+
+
+def local_zone() -> List[Any]:
+    """
+    The local time zone, as sent with requests: naive datetimes are local
+    time, so the daemon runs them only in the caller's zone.
+    """
+    return [os.environ.get("TZ"), list(time.tzname), time.timezone, time.altzone]
+
+
+def send_messages(sock: socket.socket, request: Any) -> Iterator[Dict[str, Any]]:
+    """Send one request (or a list of them) and yield the reply messages, up to the last status."""
+    sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+    pending = len(request) if isinstance(request, list) else 1
+    reader = sock.makefile("r", encoding="utf-8")
+    for line in reader:
+        message = json.loads(line)
+        yield message
+        if "status" in message:
+            pending -= 1
+            if not pending:
+                return
+    raise ConnectionError("Daemon closed the connection")
+
+
+def prepare_args(kwargs: Dict[str, Any], spec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Make path arguments absolute, since the daemon runs in another directory.
+    :return: The arguments to forward, or None if they read stdin and must run locally.
+    """
+    if STDIN in kwargs.values():
+        return None
+    builder = InterfaceBuilder().load_spec(spec)
+    arguments = list(builder.arguments) + [arg for group in builder.groups for arg in group.arguments]
+    args = dict(kwargs)
+    for arg in arguments:
+        if arg.type in PATH_TYPES and isinstance(args.get(arg.name), str) and args[arg.name]:
+            args[arg.name] = os.path.abspath(args[arg.name])
+    return args
+
+
+def forward(command: str, kwargs: Dict[str, Any], spec: Dict[str, Any], stdout: TextIO,
+            path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Run a command on the daemon, writing its output to ``stdout``.
+    :return: The final status message ({"status": code, "error": ...}), or
+             None if no daemon is reachable or the command must run locally
+             (e.g. it depends on a time zone that differs from the daemon's).
+    """
+    path = path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    args = prepare_args(kwargs, spec)
+    if args is None:
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(0.5)
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+
+    with sock:
+        # Conversions may take long; only connecting is bounded
+        sock.settimeout(None)
+        for message in send_messages(sock, {"command": command, "args": args, "zone": local_zone()}):
+            if message.get("run_locally"):
+                return None
+            if "text" in message:
+                stdout.write(message["text"])
+            if "status" in message:
+                stdout.flush()
+                return message
+    return None
@@ -0,0 +1,9 @@
+from ..core.registry import ConverterRegistry
+
+# Built-in converters are registered by class path so that their
+# dependencies (pandas, cryptography) are only imported when selected.
+# The same targets are advertised through the entry point group in
+# setup.py; registering them here keeps a source checkout working.
+ConverterRegistry.register_lazy("datetime", __name__ + ".datetime_converter:DatetimeConverter")
+ConverterRegistry.register_lazy("number", __name__ + ".number_converter:NumberConverter")
+ConverterRegistry.register_lazy("csr", __name__ + ".csr_converter:CSRConverter")
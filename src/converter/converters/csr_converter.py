@@ -1,24 +1,150 @@
+import csv
 import datetime
-from typing import Any
+import glob
+import hashlib
+import json
+import os
+import re
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
 from cryptography import x509
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives import serialization
+from cryptography.exceptions import UnsupportedAlgorithm
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
 from cryptography.x509.oid import NameOID
 from ..core.base import BaseConverter
 from ..core.registry import ConverterRegistry
 from ..core.exceptions import ValidationError, ConversionError
 from ..core.arguments import InterfaceBuilder, ArgumentType
+from ..core.parallel import imap, resolve_workers
+from ..core.results import ResultBatch, Row
+from ..core.streaming import open_input, chunked
+from ..engines.keys import DEFAULT_KEY_TYPE, KEY_TYPES, KeyPool, generate_key, signing_hash
+
+# Subject fields accepted by CSR generation, with their OIDs
+SUBJECT_FIELDS = {
+    "cn": NameOID.COMMON_NAME,
+    "c": NameOID.COUNTRY_NAME,
+    "st": NameOID.STATE_OR_PROVINCE_NAME,
+    "l": NameOID.LOCALITY_NAME,
+    "o": NameOID.ORGANIZATION_NAME,
+    "ou": NameOID.ORGANIZATIONAL_UNIT_NAME,
+}
+
+
+def build_csr(subject: Dict[str, Any], key) -> x509.CertificateSigningRequest:
+    """
+    Build and sign a CSR for a subject given by SUBJECT_FIELDS keys, with the hash suited to the key.
+    :raises ValidationError: If the Common Name is missing.
+    """
+    if not subject.get('cn'):
+        raise ValidationError("Common Name (cn) is required for CSR generation.")
+    attributes = [x509.NameAttribute(oid, subject[field]) for field, oid in SUBJECT_FIELDS.items() if subject.get(field)]
+    return x509.CertificateSigningRequestBuilder().subject_name(x509.Name(attributes)).sign(key, signing_hash(key))
+
+
+def key_to_pem(key) -> str:
+    # Ed25519 keys have no traditional (PKCS#1 / SEC1) encoding
+    traditional = isinstance(key, (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey))
+    return key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.TraditionalOpenSSL if traditional else serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    ).decode('utf-8')
+
+
+# Fields of each CSR decoded in bulk
+DECODE_FIELDS = ["subject", "common_name", "sans", "key_type", "key_size", "signature_algorithm", "fingerprint_sha256"]
+
+PEM_CSR = re.compile(rb"-----BEGIN (?:NEW )?CERTIFICATE REQUEST-----.+?-----END (?:NEW )?CERTIFICATE REQUEST-----", re.S)
+
+
+def describe_csr(csr: x509.CertificateSigningRequest) -> Dict[str, Any]:
+    """Summary of a CSR with the DECODE_FIELDS keys."""
+    public_key = csr.public_key()
+    if isinstance(public_key, rsa.RSAPublicKey):
+        key_type, key_size = "RSA", public_key.key_size
+    elif isinstance(public_key, ec.EllipticCurvePublicKey):
+        key_type, key_size = f"EC {public_key.curve.name}", public_key.curve.key_size
+    elif isinstance(public_key, ed25519.Ed25519PublicKey):
+        key_type, key_size = "Ed25519", 256
+    else:
+        key_type, key_size = type(public_key).__name__, None
+
+    try:
+        san = csr.extensions.get_extension_for_class(x509.SubjectAlternativeName)
+        sans = "; ".join(str(name.value) for name in san.value)
+    except x509.ExtensionNotFound:
+        sans = ""
+    common_names = csr.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+
+    return {
+        "subject": csr.subject.rfc4514_string(),
+        "common_name": common_names[0].value if common_names else "",
+        "sans": sans,
+        "key_type": key_type,
+        "key_size": key_size,
+        "signature_algorithm": csr.signature_algorithm_oid._name,
+        "fingerprint_sha256": hashlib.sha256(csr.public_bytes(serialization.Encoding.DER)).hexdigest(),
+    }
+
+
+def _decode_many(items: List[bytes]) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """Decode PEM or DER CSRs into (fields, error message) pairs."""
+    results = []
+    for data in items:
+        try:
+            if data.lstrip().startswith(b"-----"):
+                csr = x509.load_pem_x509_csr(data)
+            else:
+                csr = x509.load_der_x509_csr(data)
+            results.append((describe_csr(csr), None))
+        except (ValueError, UnsupportedAlgorithm) as e:
+            results.append((None, f"Invalid CSR: {e}"))
+    return results
+
+
+def _write_pair(task: Tuple[Dict[str, Any], str, str, str]) -> Optional[str]:
+    """
+    Generate a key and CSR and write them to their files, which must not
+    exist yet. Returns an error message on failure.
+    """
+    subject, key_type, key_path, csr_path = task
+    try:
+        key = generate_key(key_type)
+        csr = build_csr(subject, key)
+        # Both files are created exclusively: a file that appeared since the
+        # name was chosen is never overwritten
+        key_fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            csr_fd = os.open(csr_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except OSError:
+            os.close(key_fd)
+            os.unlink(key_path)
+            raise
+        with os.fdopen(key_fd, "w", encoding="utf-8") as f:
+            f.write(key_to_pem(key))
+        with os.fdopen(csr_fd, "w", encoding="utf-8") as f:
+            f.write(csr.public_bytes(serialization.Encoding.PEM).decode('utf-8'))
+    except FileExistsError as e:
+        return f"Not overwriting existing file {e.filename}"
+    except (ValidationError, ValueError, OSError) as e:
+        return str(e)
+    return None
+
 
 class CSRConverter(BaseConverter):
-    @property
-    def name(self) -> str:
-        return "csr"
+    name = "csr"
+    help = "Decode CSR details or Generate new CSR"
+
+    #: Subjects generated per result batch in bulk mode.
+    bulk_batch_size = 64
 
-    @property
-    def help(self) -> str:
-        return "Decode CSR details or Generate new CSR"
+    #: Pre-generated keys for single CSRs; set by long-running hosts (GUI, server).
+    key_pool: Optional[KeyPool] = None
 
-    def configure_args(self, builder: InterfaceBuilder):
+    @classmethod
+    def configure_args(cls, builder: InterfaceBuilder):
         group = builder.add_group(exclusive=True, required=True)
 
         # Decode Mode
@@ -27,6 +153,10 @@ class CSRConverter(BaseConverter):
         # Generate Mode (Trigger)
         group.add_argument("generate_csr", type=ArgumentType.FLAG, action="store_true", help="Generate a new CSR")
 
+        # Bulk Modes
+        group.add_argument("decode_bulk", type=ArgumentType.FILE_OPEN, metavar="PATH", help="Decode every CSR of a PEM bundle, a directory or a glob pattern")
+        group.add_argument("generate_bulk", type=ArgumentType.FILE_OPEN, metavar="SUBJECTS_FILE", help="Generate a key and CSR for every subject of a CSV or JSONL file")
+
         # Group generation options for better UI organization (still global logic-wise)
         gen_group = builder.add_group(required=False)
         gen_group.add_argument("cn", metavar="COMMON_NAME", help="Common Name (e.g. example.com)")
@@ -35,69 +165,205 @@ class CSRConverter(BaseConverter):
         gen_group.add_argument("l", metavar="LOCALITY", help="Locality/City")
         gen_group.add_argument("o", metavar="ORGANIZATION", help="Organization Name")
         gen_group.add_argument("ou", metavar="ORG_UNIT", help="Organizational Unit")
+        gen_group.add_argument("key_type", metavar="KEY_TYPE", choices=list(KEY_TYPES), default=DEFAULT_KEY_TYPE,
+                               help="Private key algorithm (EC and Ed25519 keys generate much faster than RSA)")
+
+        bulk_group = builder.add_group(required=False)
+        bulk_group.add_argument("output_dir", type=ArgumentType.DIRECTORY, metavar="DIR", help="Directory for the keys and CSRs of --generate-bulk")
+        bulk_group.add_argument("workers", metavar="N", help="Decode or generate in N worker processes (0 for one per CPU)")
+        bulk_group.add_argument("export", type=ArgumentType.FILE_SAVE, metavar="OUTPUT_FILE", help="Export bulk results to a .xlsx, .csv, .jsonl or .parquet file")
+
+    def __init__(self):
+        self._report: Optional[str] = None
 
+    @classmethod
+    def warm_up(cls):
+        if cls.key_pool is None:
+            cls.key_pool = KeyPool()
 
-    def convert(self, **kwargs: Any):
+    def convert_batch(self, **kwargs: Any) -> Iterator[ResultBatch]:
+        self._report = None
         if kwargs.get('decode_csr'):
-            self._decode_csr(kwargs['decode_csr'])
+            self._report = "decode"
+            yield ResultBatch.from_rows(self._decode_csr(kwargs['decode_csr']))
         elif kwargs.get('generate_csr'):
-            self._generate_csr(kwargs)
+            self._report = "generate"
+            yield ResultBatch.from_rows(self._generate_csr(kwargs))
+        elif kwargs.get('decode_bulk'):
+            yield from self._decode_bulk(kwargs)
+        elif kwargs.get('generate_bulk'):
+            yield from self._generate_bulk(kwargs)
+
+    def render(self, batch: ResultBatch) -> str:
+        if self._report is None:
+            return super().render(batch)
+        fields = dict(zip(batch.inputs, batch.outputs))
+        if self._report == "generate":
+            return (f"=== Private Key (Keep Secret) ===\n{fields['private_key']}\n"
+                    f"\n=== CSR ===\n{fields['csr']}\n")
+
+        lines = ["=== CSR Details ===", f"Subject: {fields.get('subject')}"]
+        lines += [f"  {name.partition('.')[2]}: {value}"
+                  for name, value in zip(batch.inputs, batch.outputs) if name.startswith("subject.")]
+        sans = [value for name, value in zip(batch.inputs, batch.outputs) if name == "san"]
+        if sans:
+            lines.append("Subject Alternative Names:")
+            lines += [f"  {name}" for name in sans]
+        else:
+            lines.append("No Subject Alternative Names found.")
+        return "".join(f"{line}\n" for line in lines)
 
-    def _decode_csr(self, pem_data: str):
+    def _decode_csr(self, pem_data: str) -> List[Row]:
+        """Fields of a CSR: 'subject', one 'subject.<attribute>' per attribute and one 'san' per alternative name."""
         try:
             csr = x509.load_pem_x509_csr(pem_data.encode('utf-8'))
-            print("=== CSR Details ===")
-            print(f"Subject: {csr.subject}")
+            rows = [("subject", str(csr.subject), None)]
             for attribute in csr.subject:
-                print(f"  {attribute.oid._name}: {attribute.value}")
+                rows.append((f"subject.{attribute.oid._name}", attribute.value, None))
 
             # Extensions (SANs)
             try:
                 san = csr.extensions.get_extension_for_class(x509.SubjectAlternativeName)
-                print("Subject Alternative Names:")
-                for name in san.value:
-                    print(f"  {name}")
+                rows += [("san", str(name), None) for name in san.value]
             except x509.ExtensionNotFound:
-                print("No Subject Alternative Names found.")
+                pass
+            return rows
 
-        except Exception as e:
+        except (ValueError, UnsupportedAlgorithm) as e:
             raise ValidationError(f"Invalid CSR PEM: {e}")
 
-    def _generate_csr(self, kwargs):
-        cn = kwargs.get('cn')
-        if not cn:
+    def _decode_bulk(self, kwargs) -> Iterator[ResultBatch]:
+        """
+        Decode CSRs into structured rows with the DECODE_FIELDS columns.
+        Each row has '<file>#<n>' as input; a file without PEM blocks is read as one DER CSR.
+        """
+        workers = resolve_workers(kwargs.get('workers'))
+        labels: Deque[List[str]] = deque()
+
+        def payloads():
+            for chunk in chunked(self._read_csrs(kwargs['decode_bulk']), self.bulk_batch_size * 4):
+                labels.append([label for label, _ in chunk])
+                yield [data for _, data in chunk]
+
+        if workers > 1:
+            results = imap(_decode_many, payloads(), workers)
+        else:
+            results = map(_decode_many, payloads())
+        for chunk in results:
+            outputs, errors = zip(*chunk)
+            yield ResultBatch(labels.popleft(), list(outputs), list(errors), columns=list(DECODE_FIELDS))
+
+    @staticmethod
+    def _read_csrs(source: str) -> Iterator[Tuple[str, bytes]]:
+        if os.path.isdir(source):
+            paths = sorted(entry.path for entry in os.scandir(source) if entry.is_file())
+        elif any(char in source for char in "*?["):
+            paths = sorted(path for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+        else:
+            paths = [source]
+        if not paths:
+            raise ValidationError(f"No files match '{source}'")
+
+        for path in paths:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                raise ValidationError(f"Cannot read '{path}': {e}")
+            blocks = PEM_CSR.findall(data)
+            if not blocks:
+                yield f"{path}#1", data
+            for n, block in enumerate(blocks, 1):
+                yield f"{path}#{n}", block
+
+    def _generate_csr(self, kwargs) -> List[Row]:
+        if not kwargs.get('cn'):
             raise ValidationError("Common Name (cn) is required for CSR generation.")
 
-        c = kwargs.get('c')
-        st = kwargs.get('st')
-        l = kwargs.get('l')
-        o = kwargs.get('o')
-        ou = kwargs.get('ou')
-
-        key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-        )
-
-        subject_attributes = [x509.NameAttribute(NameOID.COMMON_NAME, cn)]
-        if c: subject_attributes.append(x509.NameAttribute(NameOID.COUNTRY_NAME, c))
-        if st: subject_attributes.append(x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, st))
-        if l: subject_attributes.append(x509.NameAttribute(NameOID.LOCALITY_NAME, l))
-        if o: subject_attributes.append(x509.NameAttribute(NameOID.ORGANIZATION_NAME, o))
-        if ou: subject_attributes.append(x509.NameAttribute(NameOID.ORGANIZATIONAL_UNIT_NAME, ou))
-
-        csr = x509.CertificateSigningRequestBuilder().subject_name(x509.Name(subject_attributes)).sign(
-            key, hashes.SHA256()
-        )
-
-        print("=== Private Key (Keep Secret) ===")
-        print(key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.TraditionalOpenSSL,
-            encryption_algorithm=serialization.NoEncryption()
-        ).decode('utf-8'))
-
-        print("\n=== CSR ===")
-        print(csr.public_bytes(serialization.Encoding.PEM).decode('utf-8'))
+        key_type = self._key_type(kwargs)
+        if self.key_pool is not None and self.key_pool.key_type == key_type:
+            key = self.key_pool.get()
+        else:
+            key = generate_key(key_type)
+        csr = build_csr(kwargs, key)
+        return [
+            ("private_key", key_to_pem(key), None),
+            ("csr", csr.public_bytes(serialization.Encoding.PEM).decode('utf-8'), None),
+        ]
+
+    def _generate_bulk(self, kwargs) -> Iterator[ResultBatch]:
+        """
+        Write '<name>.key' and '<name>.csr' to the output directory for every subject.
+        Each row has the subject's Common Name as input and the CSR path as output.
+        """
+        output_dir = kwargs.get('output_dir')
+        if not output_dir:
+            raise ValidationError("--output-dir is required for bulk CSR generation.")
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            raise ValidationError(f"Cannot create output directory '{output_dir}': {e}")
+        workers = resolve_workers(kwargs.get('workers'))
+        key_type = self._key_type(kwargs)
+
+        used: Set[str] = set()
+        tasks: Deque[Tuple[Dict[str, Any], str, str, str]] = deque()
+
+        def plan():
+            for subject in self._read_subjects(kwargs['generate_bulk']):
+                name = self._file_name(output_dir, subject.get('cn') or "", used)
+                task = (subject, key_type, os.path.join(output_dir, name + ".key"), os.path.join(output_dir, name + ".csr"))
+                tasks.append(task)
+                yield task
+
+        if workers > 1:
+            results = imap(_write_pair, plan(), workers)
+        else:
+            results = map(_write_pair, plan())
+        for chunk in chunked(results, self.bulk_batch_size):
+            done = [tasks.popleft() for _ in chunk]
+            yield ResultBatch(
+                [subject.get('cn') or "" for subject, _, _, _ in done],
+                [None if error else csr_path for (_, _, _, csr_path), error in zip(done, chunk)],
+                chunk,
+            )
+
+    @staticmethod
+    def _key_type(kwargs) -> str:
+        key_type = kwargs.get('key_type') or DEFAULT_KEY_TYPE
+        if key_type not in KEY_TYPES:
+            raise ValidationError(f"Unknown key type '{key_type}' (choose from {', '.join(KEY_TYPES)})")
+        return key_type
+
+    @staticmethod
+    def _read_subjects(path: str) -> Iterator[Dict[str, Any]]:
+        """Read subjects from a JSONL file (one object per line) or a CSV file with a header row."""
+        with open_input(path) as stream:
+            if path.lower().endswith((".jsonl", ".ndjson")):
+                for number, line in enumerate(stream, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        subject = json.loads(line)
+                    except ValueError as e:
+                        raise ValidationError(f"{path}:{number}: invalid JSON: {e}")
+                    if not isinstance(subject, dict):
+                        raise ValidationError(f"{path}:{number}: expected a JSON object")
+                    yield {str(k).strip().lower(): str(v).strip() for k, v in subject.items() if v is not None}
+            else:
+                for row in csv.DictReader(stream):
+                    yield {k.strip().lower(): v.strip() for k, v in row.items() if k and v}
+
+    @staticmethod
+    def _file_name(output_dir: str, cn: str, used: Set[str]) -> str:
+        """A file name for a subject that is unique in the run and does not overwrite existing files."""
+        base = re.sub(r"[^A-Za-z0-9._-]", "_", cn).strip("._") or "csr"
+        name, n = base, 1
+        while name in used or any(os.path.exists(os.path.join(output_dir, name + extension))
+                                  for extension in (".key", ".csr")):
+            n += 1
+            name = f"{base}_{n}"
+        used.add(name)
+        return name
 
 ConverterRegistry.register(CSRConverter)
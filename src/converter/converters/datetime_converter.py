@@ -1,68 +1,112 @@
-import datetime
-import pandas as pd
-from typing import Any
-from ..core.base import BaseConverter
+import os
+import time
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Optional, Union
+from ..core.batch import BatchConverter
+from ..core.results import ResultBatch
 from ..core.registry import ConverterRegistry
 from ..core.exceptions import ValidationError
 from ..core.arguments import InterfaceBuilder, ArgumentType
+from ..engines.timeunits import detect_unit, parse_iso, parse_timestamp, to_microseconds, format_utc
 
-class DatetimeConverter(BaseConverter):
-    @property
-    def name(self) -> str:
-        return "datetime"
+# Chunks at least this long go through the vectorized engines (and pay for
+# importing NumPy, plus pandas for to_dt, once); shorter ones are converted
+# row by row.
+VECTOR_THRESHOLD = 4096
 
-    @property
-    def help(self) -> str:
-        return "Convert between Timestamp and Datetime (Batch supported)"
+class DatetimeConverter(BatchConverter):
+    name = "datetime"
+    help = "Convert between Timestamp and Datetime (Batch supported)"
+    modes = ("to_ts", "to_dt")
+    chunk_safe = True
+    memo_modes = ("to_ts", "to_dt")
 
-    def configure_args(self, builder: InterfaceBuilder):
+    @classmethod
+    def configure_args(cls, builder: InterfaceBuilder):
         group = builder.add_group(exclusive=True, required=True)
-        group.add_argument("to_ts", type=ArgumentType.TEXT, metavar="ISO_DATETIME", help="Convert ISO datetime string(s) to timestamp")
-        group.add_argument("to_dt", type=ArgumentType.TEXT, metavar="TIMESTAMP", help="Convert timestamp(s) to ISO datetime string")
-
-        builder.add_argument("export_excel", type=ArgumentType.FILE_SAVE, metavar="OUTPUT_FILE", help="Export result to Excel file")
-
-    def convert(self, **kwargs: Any):
-        results = []
-        mode = ""
-
-        if kwargs.get('to_ts'):
-            mode = "to_ts"
-            lines = kwargs['to_ts'].splitlines()
-            for line in lines:
-                line = line.strip()
-                if not line: continue
-                try:
-                    dt = datetime.datetime.fromisoformat(line)
-                    res = dt.timestamp()
-                    results.append({"Input": line, "Output": res})
-                    print(res)
-                except ValueError as e:
-                    print(f"Error parsing '{line}': {e}")
-                    results.append({"Input": line, "Output": "Error"})
-
-        elif kwargs.get('to_dt'):
-            mode = "to_dt"
-            lines = kwargs['to_dt'].splitlines()
-            for line in lines:
-                line = line.strip()
-                if not line: continue
-                try:
-                    ts = float(line)
-                    dt = datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc)
-                    res = dt.isoformat()
-                    results.append({"Input": line, "Output": res})
-                    print(res)
-                except ValueError as e:
-                    print(f"Error parsing '{line}': {e}")
-                    results.append({"Input": line, "Output": "Error"})
-
-        if kwargs.get('export_excel') and results:
+        group.add_argument("to_ts", type=ArgumentType.TEXT, metavar="ISO_DATETIME", nargs="?", const="-", help="Convert ISO datetime string(s) to timestamp")
+        group.add_argument("to_dt", type=ArgumentType.TEXT, metavar="TIMESTAMP", nargs="?", const="-", help="Convert timestamp(s) to ISO datetime string (unit s/ms/us/ns auto-detected)")
+
+        cls.add_batch_arguments(builder)
+
+    @classmethod
+    def warm_up(cls):
+        from ..engines import datetime_engine, iso_engine  # Imports pandas once, up front
+
+    def cache_environment(self, mode: str) -> List[Any]:
+        # Naive datetimes are converted in local time
+        if mode == "to_ts":
+            return [os.environ.get("TZ"), time.tzname, time.timezone, time.altzone]
+        return []
+
+    def convert_line(self, mode: str, line: str) -> Any:
+        if mode == "to_ts":
+            return self._to_ts(line)
+        value = parse_timestamp(line)
+        return format_utc(to_microseconds(value, detect_unit([value])))
+
+    def chunk_options(self, mode: str, counts: Dict[str, int]) -> Dict[str, Any]:
+        # The unit is detected from every row, duplicates included
+        if mode == "to_dt":
+            return {"unit": self._chunk_unit(counts, counts.values())}
+        return {}
+
+    def convert_chunk(self, mode: str, lines: List[str], unit: Optional[str] = None) -> ResultBatch:
+        """
+        :param unit: Unit of the timestamps of the chunk for to_dt, detected
+                     from its lines when not given.
+        """
+        if len(lines) >= VECTOR_THRESHOLD:
+            return self._convert_vectorized(mode, lines, unit)
+        if mode == "to_ts":
+            return self.convert_each(lines, self._to_ts)
+
+        unit = unit or self._chunk_unit(lines)
+        return self.convert_each(lines, lambda line: self._to_dt(line, unit))
+
+    def _convert_vectorized(self, mode: str, lines: List[str], unit: Optional[str]) -> ResultBatch:
+        if mode == "to_ts":
+            from ..engines import iso_engine
+            values, fallback = iso_engine.iso_to_timestamps(lines)
+            return self.merge_fallback(lines, values.tolist(), fallback, self._to_ts)
+
+        from ..engines import datetime_engine
+        values, fallback, errors, unit = datetime_engine.timestamps_to_iso(lines, unit)
+        return self.merge_fallback(lines, values, fallback, lambda line: self._to_dt(line, unit), errors)
+
+    def convert_values(self, mode: str, values: List[Any]) -> ResultBatch:
+        # Numbers from an earlier stage (e.g. number:hex2dec) are timestamps
+        # already: they are not formatted and parsed again
+        if mode != "to_dt" or not values or not set(map(type, values)) <= {int, float}:
+            return super().convert_values(mode, values)
+        if len(values) >= VECTOR_THRESHOLD:
+            from ..engines import datetime_engine
+            outputs, fallback, unit = datetime_engine.epochs_to_iso(values)
+            return self.merge_fallback(values, outputs, fallback, lambda value: self._value_to_dt(value, unit))
+        unit = detect_unit(values)
+        return self.convert_each(values, lambda value: self._value_to_dt(value, unit))
+
+    @staticmethod
+    def _chunk_unit(lines: Iterable[str], counts: Optional[Iterable[int]] = None) -> str:
+        values, weights = [], []
+        for line, count in zip(lines, counts if counts is not None else repeat(1)):
             try:
-                df = pd.DataFrame(results)
-                df.to_excel(kwargs['export_excel'], index=False)
-                print(f"\nSuccessfully exported to {kwargs['export_excel']}")
-            except Exception as e:
-                print(f"\nFailed to export Excel: {e}")
+                values.append(parse_timestamp(line))
+                weights.append(count)
+            except ValueError:
+                pass
+        return detect_unit(values, weights if counts is not None else None)
+
+    @staticmethod
+    def _to_ts(line: str) -> float:
+        return parse_iso(line).timestamp()
+
+    @staticmethod
+    def _to_dt(line: str, unit: str) -> str:
+        return format_utc(to_microseconds(parse_timestamp(line), unit))
+
+    @staticmethod
+    def _value_to_dt(value: Union[int, float], unit: str) -> str:
+        return format_utc(to_microseconds(value, unit))
 
 ConverterRegistry.register(DatetimeConverter)
@@ -1,62 +1,45 @@
-import pandas as pd
-from typing import Any
-from ..core.base import BaseConverter
+from itertools import repeat
+from typing import Any, List
+from ..core.batch import BatchConverter
+from ..core.results import ResultBatch
 from ..core.registry import ConverterRegistry
 from ..core.exceptions import ValidationError
 from ..core.arguments import InterfaceBuilder, ArgumentType
 
-class NumberConverter(BaseConverter):
-    @property
-    def name(self) -> str:
-        return "number"
+class NumberConverter(BatchConverter):
+    name = "number"
+    help = "Convert between Hex and Decimal (Batch supported)"
+    modes = ("hex2dec", "dec2hex")
+    chunk_safe = True
 
-    @property
-    def help(self) -> str:
-        return "Convert between Hex and Decimal (Batch supported)"
-
-    def configure_args(self, builder: InterfaceBuilder):
+    @classmethod
+    def configure_args(cls, builder: InterfaceBuilder):
         group = builder.add_group(exclusive=True, required=True)
-        group.add_argument("hex2dec", type=ArgumentType.TEXT, metavar="HEX_VALUE", help="Convert Hex string(s) to Decimal")
-        group.add_argument("dec2hex", type=ArgumentType.TEXT, metavar="DECIMAL_VALUE", help="Convert Decimal(s) to Hex string")
-
-        builder.add_argument("export_excel", type=ArgumentType.FILE_SAVE, metavar="OUTPUT_FILE", help="Export result to Excel file")
-
-    def convert(self, **kwargs: Any):
-        results = []
-
-        if kwargs.get('hex2dec'):
-            lines = kwargs['hex2dec'].splitlines()
-            for line in lines:
-                line = line.strip()
-                if not line: continue
-                try:
-                    res = int(line, 16)
-                    results.append({"Input": line, "Output": res})
-                    print(res)
-                except ValueError:
-                    print(f"Error parsing '{line}'")
-                    results.append({"Input": line, "Output": "Error"})
-
-        elif kwargs.get('dec2hex'):
-            lines = kwargs['dec2hex'].splitlines()
-            for line in lines:
-                line = line.strip()
-                if not line: continue
-                try:
-                    val = int(line)
-                    res = hex(val)
-                    results.append({"Input": line, "Output": res})
-                    print(res)
-                except ValueError:
-                    print(f"Error parsing '{line}'")
-                    results.append({"Input": line, "Output": "Error"})
-
-        if kwargs.get('export_excel') and results:
-            try:
-                df = pd.DataFrame(results)
-                df.to_excel(kwargs['export_excel'], index=False)
-                print(f"\nSuccessfully exported to {kwargs['export_excel']}")
-            except Exception as e:
-                print(f"\nFailed to export Excel: {e}")
+        group.add_argument("hex2dec", type=ArgumentType.TEXT, metavar="HEX_VALUE", nargs="?", const="-", help="Convert Hex string(s) to Decimal")
+        group.add_argument("dec2hex", type=ArgumentType.TEXT, metavar="DECIMAL_VALUE", nargs="?", const="-", help="Convert Decimal(s) to Hex string")
+
+        cls.add_batch_arguments(builder)
+
+    def convert_line(self, mode: str, line: str) -> Any:
+        if mode == "hex2dec":
+            return int(line, 16)
+        return hex(int(line))
+
+    def convert_chunk(self, mode: str, lines: List[str]) -> ResultBatch:
+        # Same calls as convert_line, mapped over the chunk without a Python frame per line
+        if mode == "hex2dec":
+            bulk = lambda chunk: map(int, chunk, repeat(16))
+        else:
+            bulk = lambda chunk: map(hex, map(int, chunk))
+        return self.convert_each(lines, lambda line: self.convert_line(mode, line), bulk)
+
+    def convert_values(self, mode: str, values: List[Any]) -> ResultBatch:
+        # Ints from an earlier stage are formatted as they are
+        if mode == "dec2hex" and values and set(map(type, values)) == {int}:
+            return ResultBatch(list(values), list(map(hex, values)), [None] * len(values))
+        return super().convert_values(mode, values)
+
+    def format_error(self, line: str, error: Exception) -> str:
+        return f"Error parsing '{line}'"
 
 ConverterRegistry.register(NumberConverter)
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional
+
+_DONE = object()
+
+
+class AsyncLimiter:
+    """
+    Runs the blocking steps of async conversions (one result batch at a
+    time) in an executor, with at most ``max_concurrency`` steps in flight.
+
+    Every conversion waits for a slot before each batch, so a huge input
+    takes turns with other requests instead of occupying the executor until
+    it is done. Batches are only produced as the caller consumes them.
+
+    :param executor: Executor for the blocking steps. Steps of one conversion
+                     share its generator, so this must be a thread executor.
+                     Defaults to a private ThreadPoolExecutor.
+    :param max_concurrency: Maximum number of steps running at once.
+    """
+    def __init__(self, executor: Optional[Executor] = None, max_concurrency: int = 4):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        # Semaphores belong to an event loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="converter")
+        return semaphore
+
+    async def call(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking function in the executor once a slot is free."""
+        async with self._semaphore():
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def iterate(self, batches: Callable[[], Iterable[Any]]) -> AsyncIterator[Any]:
+        """
+        Iterate asynchronously over a blocking iterable, advancing it in the executor.
+        :param batches: Creates the iterable; also called in the executor.
+        """
+        iterator: Optional[Iterator[Any]] = None
+        # A cancelled step may still be running when the iterator is closed
+        lock = threading.Lock()
+
+        def start():
+            nonlocal iterator
+            with lock:
+                iterator = iter(batches())
+
+        def step():
+            with lock:
+                return next(iterator, _DONE)
+
+        def close():
+            with lock:
+                if hasattr(iterator, "close"):
+                    iterator.close()
+
+        await self.call(start)
+        try:
+            while True:
+                item = await self.call(step)
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            await asyncio.get_running_loop().run_in_executor(self.executor, close)
+
+
+#: Limiter used by converters that do not set their own.
+default_limiter = AsyncLimiter()
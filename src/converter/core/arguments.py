@@ -1,5 +1,5 @@
 from typing import List, Optional, Any, Dict
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import Enum, auto
 
 class ArgumentType(Enum):
@@ -7,6 +7,8 @@ class ArgumentType(Enum):
     TEXT = auto()      # Multiline text
     FILE_SAVE = auto() # File path for saving
     FLAG = auto()      # Boolean flag
+    FILE_OPEN = auto() # Path of an existing file (or pattern) to read
+    DIRECTORY = auto() # Directory path
 
 @dataclass
 class Argument:
@@ -17,6 +19,9 @@ class Argument:
     type: ArgumentType = ArgumentType.STRING
     default: Any = None
     action: Optional[str] = None
+    nargs: Optional[str] = None
+    const: Any = None
+    choices: Optional[List[str]] = None
 
 @dataclass
 class ArgumentGroup:
@@ -36,15 +41,47 @@ class InterfaceBuilder:
         self.groups: List[ArgumentGroup] = []
         self.arguments: List[Argument] = []
 
-    def add_argument(self, name: str, arg_type: ArgumentType = ArgumentType.STRING, **kwargs):
+    def add_argument(self, name: str, type: ArgumentType = ArgumentType.STRING, **kwargs):
         """Add a global argument for this converter."""
         # Infer FLAG type if action is store_true
         if kwargs.get('action') == 'store_true':
-            arg_type = ArgumentType.FLAG
-        self.arguments.append(Argument(name=name, type=arg_type, **kwargs))
+            type = ArgumentType.FLAG
+        self.arguments.append(Argument(name=name, type=type, **kwargs))
 
     def add_group(self, exclusive: bool = False, required: bool = False) -> ArgumentGroup:
         """Create and return a new argument group."""
         group = ArgumentGroup(exclusive=exclusive, required=required)
         self.groups.append(group)
         return group
+
+    def to_spec(self) -> Dict[str, Any]:
+        """Serialize the collected groups and arguments to plain JSON-compatible data."""
+        def arg_spec(arg: Argument) -> Dict[str, Any]:
+            spec = asdict(arg)
+            spec['type'] = arg.type.name
+            return spec
+
+        return {
+            'groups': [
+                {
+                    'exclusive': group.exclusive,
+                    'required': group.required,
+                    'arguments': [arg_spec(arg) for arg in group.arguments],
+                }
+                for group in self.groups
+            ],
+            'arguments': [arg_spec(arg) for arg in self.arguments],
+        }
+
+    def load_spec(self, spec: Dict[str, Any]):
+        """Populate this builder from data produced by ``to_spec``."""
+        def make_arg(data: Dict[str, Any]) -> Argument:
+            data = dict(data)
+            data['type'] = ArgumentType[data['type']]
+            return Argument(**data)
+
+        for group_data in spec.get('groups', []):
+            group = self.add_group(exclusive=group_data['exclusive'], required=group_data['required'])
+            group.arguments.extend(make_arg(a) for a in group_data['arguments'])
+        self.arguments.extend(make_arg(a) for a in spec.get('arguments', []))
+        return self
@@ -1,36 +1,242 @@
+import contextlib
+import io
+import shutil
+import sys
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, TextIO
 from .arguments import InterfaceBuilder
+from .exceptions import ConverterError, ExportError
+from .exporters import open_export
+from .metrics import METRICS
+from .result_cache import default_result_cache
+from .results import ResultBatch, ResultSink, TextSink, FileSink, render_lines
+
+if TYPE_CHECKING:
+    # asyncio takes a while to import; the CLI never needs it
+    from .aio import AsyncLimiter
+    from .buffer import ResultBuffer
+    from .result_cache import CachedResult
 
 class BaseConverter(ABC):
     """
     Abstract base class for all converters.
+
+    ``name`` and ``help`` are class attributes and ``configure_args`` is a
+    classmethod, so the registry can describe a converter without
+    instantiating it.
+
+    Results are produced by ``convert_batch`` as ``ResultBatch`` objects and
+    consumed by sinks: ``convert`` writes them to stdout, the GUI to its
+    output box, and programs can iterate over them directly. Async programs
+    use ``abatches``, ``arun`` and ``aconvert``, which do the blocking work
+    in the executor of ``limiter``.
     """
 
-    @property
-    @abstractmethod
-    def name(self) -> str:
-        """The name of the converter (used for CLI command)."""
-        pass
+    #: The name of the converter (used for CLI command).
+    name: str = ""
 
-    @property
-    @abstractmethod
-    def help(self) -> str:
-        """Help text for the converter."""
-        pass
+    #: Help text for the converter.
+    help: str = ""
+
+    #: Version of the results; bump it when they change, so results stored
+    #: in the result cache by an earlier version are not reused.
+    version: str = "1"
+
+    #: Executor and concurrency limit of the async API (None for the shared default).
+    limiter: Optional["AsyncLimiter"] = None
 
+    @classmethod
     @abstractmethod
-    def configure_args(self, builder: InterfaceBuilder):
+    def configure_args(cls, builder: InterfaceBuilder):
         """
         Define arguments for this converter using the generic builder.
         :param builder: The InterfaceBuilder to add arguments/groups to.
         """
         pass
 
-    @abstractmethod
+    def convert_batch(self, **kwargs: Any) -> Iterator[ResultBatch]:
+        """
+        Perform the conversion and yield its results, without printing anything.
+        Converters that only override ``convert`` still work: what it prints
+        is captured as the output of a single row.
+        :param kwargs: Dictionary of argument names and values.
+        :raises ConverterError: If the converter overrides neither method.
+        """
+        if type(self).convert is BaseConverter.convert:
+            raise ConverterError(f"Converter {self.name} implements neither convert_batch nor convert")
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.convert(**kwargs)
+        text = out.getvalue()
+        yield ResultBatch([""], [text[:-1] if text.endswith("\n") else text], [None])
+
+    def render(self, batch: ResultBatch) -> str:
+        """Text shown for a batch of results."""
+        return render_lines(batch)
+
+    def export_sinks(self, kwargs: Dict[str, Any]) -> List[FileSink]:
+        """
+        Sinks requested by the arguments themselves: an ``export`` argument
+        exports to a file in the format given by its extension.
+        """
+        return [open_export(kwargs['export'])] if kwargs.get('export') else []
+
+    def cache_key(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        """
+        Key of the results of a conversion in the on-disk result cache, or
+        None if they are not cached. Keys must cover everything results
+        depend on: the input content, the converter and its ``version``,
+        and the options.
+        """
+        return None
+
+    def run(self, sinks: Iterable[ResultSink], **kwargs: Any):
+        """
+        Write every result batch to each sink, then close the sinks.
+        Results with a ``cache_key`` are replayed from the result cache when
+        stored there (unless ``no_cache`` is set), and stored otherwise.
+        If the conversion fails, the sinks are discarded instead, so no
+        incomplete export is left behind.
+        :raises ExportError: If a sink fails to export its results.
+        """
+        sinks = list(sinks)
+        try:
+            self._run(sinks, kwargs)
+        except BaseException:
+            self._discard(sinks)
+            raise
+
+    def _run(self, sinks: List[ResultSink], kwargs: Dict[str, Any]):
+        key = None if kwargs.get('no_cache') else self.cache_key(kwargs)
+        cache = default_result_cache() if key else None
+        if cache is None:
+            for batch in self._measured_batches(kwargs):
+                self._write(sinks, batch)
+            self._close(sinks)
+            return
+
+        cached = cache.get(key)
+        METRICS.count("result_cache_hits" if cached else "result_cache_misses", 1, self.name)
+        if cached is not None:
+            self._replay(cached, sinks)
+            return
+
+        writer = cache.writer(key)
+        try:
+            for batch in self._measured_batches(kwargs):
+                self._write(sinks, batch)
+                writer.write(batch)
+            self._close(sinks)
+            writer.commit([sink for sink in sinks if isinstance(sink, FileSink) and sink.written])
+        finally:
+            writer.discard()
+
+    def _replay(self, cached: "CachedResult", sinks: List[ResultSink]):
+        """Write cached results to sinks, copying stored exports where there are some."""
+        remaining = []
+        for sink in sinks:
+            stored = cached.export(sink) if isinstance(sink, FileSink) else None
+            if stored is None:
+                remaining.append(sink)
+                continue
+            with METRICS.stage(f"copy:{type(sink).__name__}", self.name):
+                try:
+                    shutil.copyfile(stored, sink.path)
+                except OSError as e:
+                    raise ExportError(f"Failed to export {sink.path}: {e}")
+            sink.written = True
+        if remaining:
+            for batch in self._measured(cached.batches(), "cache"):
+                self._write(remaining, batch)
+        self._close(remaining)
+
+    def _measured_batches(self, kwargs: Dict[str, Any]) -> Iterator[ResultBatch]:
+        """``convert_batch``, recording its time, rows and errors in METRICS."""
+        return self._measured(self.convert_batch(**kwargs), "convert")
+
+    def _measured(self, batches: Iterable[ResultBatch], stage: str) -> Iterator[ResultBatch]:
+        for batch in METRICS.timed(batches, stage, self.name):
+            METRICS.count("rows", len(batch), self.name)
+            if batch.error_count:
+                METRICS.count("errors", batch.error_count, self.name)
+            yield batch
+
+    def _write(self, sinks: List[ResultSink], batch: ResultBatch):
+        for sink in sinks:
+            with METRICS.stage(f"write:{type(sink).__name__}", self.name):
+                sink.write(batch)
+
+    def _close(self, sinks: List[ResultSink]):
+        for sink in sinks:
+            with METRICS.stage(f"close:{type(sink).__name__}", self.name):
+                sink.close()
+
+    @staticmethod
+    def _discard(sinks: List[ResultSink]):
+        """Discard the sinks of a failed conversion; exports already complete are kept."""
+        for sink in sinks:
+            if isinstance(sink, FileSink) and sink.written:
+                continue
+            with contextlib.suppress(Exception):
+                sink.discard()
+
+    def abatches(self, **kwargs: Any) -> AsyncIterator[ResultBatch]:
+        """Async version of ``convert_batch``: each batch is produced in the executor, on demand."""
+        return self._limiter().iterate(lambda: self._measured_batches(kwargs))
+
+    async def arun(self, sinks: Iterable[ResultSink], **kwargs: Any):
+        """
+        Async version of ``run``. Sinks are written in the executor too, as
+        file exports block.
+        :raises ExportError: If a sink fails to export its results.
+        """
+        limiter = self._limiter()
+        sinks = list(sinks)
+        try:
+            async for batch in self.abatches(**kwargs):
+                await limiter.call(self._write, sinks, batch)
+            await limiter.call(self._close, sinks)
+        except BaseException:
+            await limiter.call(self._discard, sinks)
+            raise
+
+    def _limiter(self) -> "AsyncLimiter":
+        from .aio import default_limiter
+        return self.limiter or default_limiter
+
+    async def aconvert(self, **kwargs: Any) -> "ResultBuffer":
+        """
+        Perform the conversion without blocking the event loop and return all
+        results in a ResultBuffer. An ``export`` argument is honoured as in ``convert``.
+        """
+        from .buffer import BufferSink
+        collect = BufferSink()
+        await self.arun([collect] + self.export_sinks(kwargs), **kwargs)
+        return collect.buffer
+
     def convert(self, **kwargs: Any):
         """
-        Perform the conversion based on the provided arguments.
+        Perform the conversion based on the provided arguments and print the results.
         :param kwargs: Dictionary of argument names and values.
         """
+        self.convert_to(sys.stdout, **kwargs)
+
+    def convert_to(self, stream: TextIO, **kwargs: Any):
+        """Perform the conversion and write the results, and any export status, to a text stream."""
+        exports = self.export_sinks(kwargs)
+        try:
+            self.run([TextSink(stream, render=self.render)] + exports, **kwargs)
+        except ExportError as e:
+            stream.write(f"\n{e}\n")
+            return
+        for sink in exports:
+            if sink.written:
+                stream.write(f"\nSuccessfully exported to {sink.path}\n")
+
+    @classmethod
+    def warm_up(cls):
+        """
+        Prepare for a stream of requests in a long-running process (e.g. import
+        optional engines, pre-generate keys). Called once by ``serve``.
+        """
         pass
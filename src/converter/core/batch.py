@@ -0,0 +1,301 @@
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .base import BaseConverter
+from .arguments import InterfaceBuilder, ArgumentType
+from .exceptions import ValidationError
+from .exporters import ExcelSink
+from .memo import LRUCache
+from .metrics import METRICS
+from .result_cache import content_key
+from .parallel import map_chunks, resolve_workers
+from .results import ResultBatch, FileSink
+from .streaming import STDIN, open_input, iter_lines, iter_text_lines, chunked
+from .tables import TableChunk, read_table
+
+# Arguments that do not change the results, left out of cache keys
+CACHE_NEUTRAL = ("input", "export", "export_excel", "workers", "no_cache")
+
+# Chunks with a larger share of distinct lines are converted whole:
+# deduplicating them would cost more than it saves.
+MEMO_MAX_DISTINCT = 0.5
+
+
+def _cell_text(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+class BatchConverter(BaseConverter):
+    """
+    Base class for line-oriented converters.
+
+    Each entry of ``modes`` is an exclusive argument holding the batch text.
+    Input can also be streamed from ``--input FILE`` or stdin (``--input -``,
+    or a mode flag given without a value). Lines are converted and written
+    ``chunk_size`` at a time, so memory stays bounded regardless of input size;
+    exports stream each chunk to their file as well. Each chunk becomes one
+    ``ResultBatch``.
+
+    With ``--column NAME``, the input is a .csv or .xlsx table instead: the
+    named column is converted and the results are exported next to the
+    original columns, the table being read ``chunk_size`` rows at a time.
+    """
+
+    #: Names of the exclusive mode arguments.
+    modes: Tuple[str, ...] = ()
+
+    #: Number of lines converted and written at a time.
+    chunk_size: int = 10000
+
+    #: Whether chunks convert independently of each other, so ``--workers``
+    #: may spread them over several processes.
+    chunk_safe: bool = False
+
+    #: Modes whose chunks are deduplicated: each distinct line is converted
+    #: once, and values converted in earlier chunks are reused from an LRU
+    #: cache. Only worth it when converting a line costs more than hashing it.
+    memo_modes: Tuple[str, ...] = ()
+
+    #: Number of distinct lines kept in the cache, per mode and chunk options.
+    memo_size: int = 65536
+
+    @classmethod
+    def add_batch_arguments(cls, builder: InterfaceBuilder):
+        """Add the arguments shared by all batch converters."""
+        builder.add_argument("input", type=ArgumentType.FILE_OPEN, metavar="INPUT_FILE", help="Read input lines from a file ('-' for stdin)")
+        builder.add_argument("column", metavar="NAME", help="Convert this column of a .csv or .xlsx input table, exporting the results next to its columns")
+        if cls.chunk_safe:
+            builder.add_argument("workers", metavar="N", help="Convert chunks in N worker processes (0 for one per CPU)")
+        builder.add_argument("export", type=ArgumentType.FILE_SAVE, metavar="OUTPUT_FILE", help="Export result to a .xlsx, .csv, .jsonl or .parquet file")
+        builder.add_argument("export_excel", type=ArgumentType.FILE_SAVE, metavar="OUTPUT_FILE", help="Export result to Excel file")
+        builder.add_argument("no_cache", action="store_true", help="Convert the input file again instead of reusing cached results")
+
+    def convert_line(self, mode: str, line: str) -> Any:
+        """
+        Convert a single stripped, non-empty line.
+        :raises ValueError: If the line cannot be converted (OverflowError is accepted too).
+        """
+        raise NotImplementedError
+
+    def format_error(self, line: str, error: Exception) -> str:
+        """Message reported for a line that failed to convert."""
+        return f"Error parsing '{line}': {error}"
+
+    def convert_chunk(self, mode: str, lines: List[str]) -> ResultBatch:
+        """Convert a chunk of lines. Override to process a chunk at once."""
+        return self.convert_each(lines, lambda line: self.convert_line(mode, line))
+
+    def chunk_options(self, mode: str, counts: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Keyword arguments for ``convert_chunk`` that depend on the whole chunk
+        (e.g. a unit detected from all its values), computed before it is
+        deduplicated. Values are cached separately for each set of options.
+        :param counts: Number of occurrences of each distinct line.
+        """
+        return {}
+
+    def process_chunk(self, mode: str, lines: List[str]) -> ResultBatch:
+        """Convert a chunk, deduplicating it first in ``memo_modes``."""
+        if mode not in self.memo_modes:
+            return self.convert_chunk(mode, lines)
+        counts = Counter(lines)
+        if len(counts) > MEMO_MAX_DISTINCT * len(lines):
+            return self.convert_chunk(mode, lines)
+
+        options = self.chunk_options(mode, counts)
+        cache = self.memo_cache(mode, options)
+        hits, misses = cache.hits, cache.misses
+        results, missing = cache.lookup(counts)
+        if missing:
+            batch = self.convert_chunk(mode, missing, **options)
+            converted = dict(zip(missing, zip(batch.outputs, batch.errors)))
+            cache.update(converted)
+            results.update(converted)
+        METRICS.count("duplicate_rows", len(lines) - len(counts), self.name)
+        METRICS.count("cache_hits", cache.hits - hits, self.name)
+        METRICS.count("cache_misses", cache.misses - misses, self.name)
+
+        rows = list(map(results.__getitem__, lines))
+        return ResultBatch(list(lines), [row[0] for row in rows], [row[1] for row in rows])
+
+    def convert_values(self, mode: str, values: List[Any]) -> ResultBatch:
+        """
+        Convert a chunk of typed values, such as the outputs of an earlier
+        stage of a Pipeline (the batch's inputs may be the values themselves).
+        They are converted as text by default: override to take the types a
+        mode understands (e.g. ints as timestamps) without parsing them again.
+        """
+        return self.process_chunk(mode, list(map(str, values)))
+
+    def memo_cache(self, mode: str, options: Dict[str, Any]) -> LRUCache:
+        """The cache of converted lines for a mode and chunk options."""
+        caches = self.__dict__.setdefault("_memo_caches", {})
+        key = (mode,) + tuple(sorted(options.items()))
+        if key not in caches:
+            caches[key] = LRUCache(self.memo_size)
+        return caches[key]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes start with empty caches
+        state = self.__dict__.copy()
+        state.pop("_memo_caches", None)
+        return state
+
+    def convert_each(self, lines: List[str], convert: Callable[[str], Any],
+                     bulk: Optional[Callable[[Iterator[str]], Iterator[Any]]] = None) -> ResultBatch:
+        """
+        Apply a per-line conversion, turning failures into error rows.
+        Lines are mapped in bulk; a failing line is recorded and mapping resumes after it.
+        :param bulk: Lazily maps an iterator of lines to their values, like ``map(convert, lines)``
+                     but cheaper (e.g. a chain of builtins). It must raise the same errors.
+        """
+        bulk = bulk or partial(map, convert)
+        remaining = iter(lines)
+        values: List[Any] = []
+        errors: List[Optional[str]] = [None] * len(lines)
+        while len(values) < len(lines):
+            try:
+                values.extend(bulk(remaining))
+            except (ValueError, OverflowError) as e:
+                # extend() keeps the values mapped so far; the failing line
+                # has been consumed from ``remaining``
+                i = len(values)
+                values.append(None)
+                errors[i] = self.format_error(lines[i], e)
+        return ResultBatch(list(lines), values, errors)
+
+    def merge_fallback(self, lines: List[str], values: List[Any], fallback, convert: Callable[[str], Any],
+                       errors: Optional[Dict[int, str]] = None) -> ResultBatch:
+        """
+        Build a batch from the output of a vectorized engine.
+        :param values: Converted value per line; ignored where ``fallback`` is set.
+        :param fallback: Boolean NumPy mask of lines the engine left to ``convert``.
+        :param errors: Error messages the engine already determined, by line index.
+        """
+        batch = ResultBatch(list(lines), list(values), [None] * len(lines))
+        for i in fallback.nonzero()[0].tolist():
+            single = self.convert_each([lines[i]], convert)
+            batch.outputs[i], batch.errors[i] = single.outputs[0], single.errors[0]
+        for i, message in (errors or {}).items():
+            batch.outputs[i] = None
+            batch.errors[i] = self.format_error(lines[i], ValueError(message))
+        return batch
+
+    def resolve_mode(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Find the selected mode: the first one with a value, else the first one present when reading --input."""
+        for mode in self.modes:
+            if kwargs.get(mode):
+                return mode
+        if kwargs.get('input'):
+            for mode in self.modes:
+                if mode in kwargs and kwargs[mode] is not None:
+                    return mode
+        return None
+
+    @contextmanager
+    def open_lines(self, mode: str, kwargs: Dict[str, Any]) -> Iterator[Iterator[str]]:
+        """Open the selected input source and yield an iterator over its lines."""
+        value = kwargs.get(mode)
+        path = kwargs.get('input')
+        if path and value and value != STDIN:
+            raise ValidationError("Give the values either inline or through --input, not both.")
+        if not path and value != STDIN:
+            yield iter_text_lines(value)
+            return
+        with open_input(path or STDIN) as stream:
+            yield iter_lines(stream)
+
+    def convert_batch(self, **kwargs: Any) -> Iterator[ResultBatch]:
+        mode = self.resolve_mode(kwargs)
+        if mode is None:
+            return
+
+        workers = resolve_workers(kwargs.get('workers'))
+        if workers > 1 and not self.chunk_safe:
+            raise ValidationError(f"Converter {self.name} does not support --workers")
+
+        if kwargs.get('column'):
+            yield from self.convert_table(mode, kwargs, workers)
+            return
+
+        with self.open_lines(mode, kwargs) as lines:
+            chunks = chunked(lines, self.chunk_size)
+            if workers > 1:
+                yield from map_chunks(self, mode, chunks, workers)
+                return
+            for chunk in chunks:
+                yield self.process_chunk(mode, chunk)
+
+    def convert_table(self, mode: str, kwargs: Dict[str, Any], workers: int) -> Iterator[ResultBatch]:
+        """
+        Convert a column of the --input table (CSV from stdin), chunk by chunk.
+        Empty cells are left empty rather than reported as errors.
+        """
+        column, value, path = kwargs['column'], kwargs.get(mode), kwargs.get('input')
+        if value and value != STDIN:
+            raise ValidationError("--column converts a column of the --input table, not inline values.")
+        tables = read_table(path or STDIN, self.chunk_size)
+
+        # Chunks are consumed by the conversion below while their tables are kept here
+        pending = deque()
+
+        def values() -> Iterator[List[str]]:
+            for table in tables:
+                if column not in table:
+                    raise ValidationError(f"No column '{column}' in {path or 'stdin'} (columns: {', '.join(table)})")
+                cells = list(map(_cell_text, table[column]))
+                present = [i for i, cell in enumerate(cells) if cell]
+                pending.append((table, cells, present))
+                if present:
+                    yield cells if len(present) == len(cells) else [cells[i] for i in present]
+
+        if workers > 1:
+            converted = map_chunks(self, mode, values(), workers)
+        else:
+            converted = (self.process_chunk(mode, chunk) for chunk in values())
+        output_column = self.output_column(column, mode)
+        for batch in converted:
+            table, cells, present = pending.popleft()
+            while not present:
+                yield ResultBatch(cells, [None] * len(cells), [None] * len(cells), table=table, output_column=output_column)
+                table, cells, present = pending.popleft()
+            yield self._table_batch(table, cells, present, batch, output_column)
+        for table, cells, _ in pending:
+            yield ResultBatch(cells, [None] * len(cells), [None] * len(cells), table=table, output_column=output_column)
+
+    def output_column(self, column: str, mode: str) -> str:
+        """Name of the exported column holding the results of ``column``."""
+        return f"{column}_{mode}"
+
+    @staticmethod
+    def _table_batch(table: TableChunk, cells: List[str], present: List[int],
+                     batch: ResultBatch, output_column: str) -> ResultBatch:
+        """Results of the non-empty cells of a table chunk, scattered back to its rows."""
+        if len(present) == len(cells):
+            outputs, errors = batch.outputs, batch.errors
+        else:
+            outputs, errors = [None] * len(cells), [None] * len(cells)
+            for i, output, error in zip(present, batch.outputs, batch.errors):
+                outputs[i], errors[i] = output, error
+        return ResultBatch(cells, outputs, errors, table=table, output_column=output_column)
+
+    def cache_key(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Results of an input file are cached by its content, the mode and the other options."""
+        mode = self.resolve_mode(kwargs)
+        path = kwargs.get('input')
+        if mode is None or not path or path == STDIN or kwargs.get(mode) not in ("", STDIN):
+            return None
+        options = {name: value for name, value in kwargs.items()
+                   if name not in CACHE_NEUTRAL and name not in self.modes and value not in (None, False, "")}
+        return content_key(path, self.name, self.version, mode, options, self.cache_environment(mode))
+
+    def cache_environment(self, mode: str) -> List[Any]:
+        """Settings of this process that results of a mode depend on (e.g. the local time zone)."""
+        return []
+
+    def export_sinks(self, kwargs: Dict[str, Any]) -> List[FileSink]:
+        sinks = super().export_sinks(kwargs)
+        if kwargs.get('export_excel'):
+            sinks.append(ExcelSink(kwargs['export_excel']))
+        return sinks
@@ -0,0 +1,290 @@
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .results import ResultBatch, ResultSink, Row
+
+# Array type codes tried in order for integer outputs
+_INT_CODES = ("q", "Q")
+
+
+def _offsets(strings: List[str]) -> array:
+    """Start offsets of strings joined end to end, plus the total length."""
+    positions = accumulate(map(len, strings), initial=0)
+    try:
+        return array("I", positions)
+    except OverflowError:
+        return array("Q", accumulate(map(len, strings), initial=0))
+
+
+class _Strings:
+    """Strings stored as one joined string and their offsets in it."""
+    __slots__ = ("text", "offsets")
+
+    def __init__(self, strings: List[str]):
+        self.text = "".join(strings)
+        self.offsets = _offsets(strings)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.text[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        text, offsets = self.text, self.offsets
+        return (text[start:end] for start, end in zip(offsets, islice(offsets, 1, None)))
+
+    def slice(self, start: int, stop: int) -> List[str]:
+        text, offsets = self.text, self.offsets
+        return [text[offsets[i]:offsets[i + 1]] for i in range(start, stop)]
+
+
+class _Segment:
+    """
+    One appended batch, stored compactly:
+
+    - inputs as a single string and offsets into it;
+    - outputs as a typed array when they are all ints, all floats or all
+      strings (failed rows hold a placeholder), else as a plain list;
+    - errors as a table of messages by row, the rows without a message
+      having succeeded.
+
+    Table columns of rows converted from a table are kept as they are.
+    """
+    __slots__ = ("inputs", "outputs", "errors", "columns", "table", "output_column", "length")
+
+    def __init__(self, batch: ResultBatch):
+        self.length = len(batch)
+        self.columns = batch.columns
+        self.table = batch.table
+        self.output_column = batch.output_column
+        self.inputs = _Strings(batch.inputs)
+        self.errors: Dict[int, str] = {}
+        if batch.error_count:
+            self.errors = {i: error for i, error in enumerate(batch.errors) if error is not None}
+        self.outputs = self._pack(batch.outputs)
+
+    def _pack(self, outputs: List[Any]):
+        types = set(map(type, outputs))
+        if type(None) in types:
+            # Failed rows have None outputs; any other None keeps the list
+            if outputs.count(None) != len(self.errors) or any(outputs[i] is not None for i in self.errors):
+                return outputs
+            types.discard(type(None))
+            outputs = list(outputs)
+            placeholder = "" if types == {str} else 0
+            for i in self.errors:
+                outputs[i] = placeholder
+        if len(types) != 1:
+            return outputs
+        kind = types.pop()
+        if kind is int:
+            for code in _INT_CODES:
+                try:
+                    return array(code, outputs)
+                except OverflowError:
+                    continue
+        elif kind is float:
+            return array("d", outputs)
+        elif kind is str:
+            return _Strings(outputs)
+        return outputs
+
+    def output(self, index: int) -> Any:
+        return None if index in self.errors else self.outputs[index]
+
+    def iter_outputs(self) -> Iterator[Any]:
+        if not self.errors:
+            return iter(self.outputs)
+        errors = self.errors
+        return (None if i in errors else value for i, value in enumerate(self.outputs))
+
+    def iter_errors(self) -> Iterator[Optional[str]]:
+        if not self.errors:
+            return iter([None] * self.length)
+        return map(self.errors.get, range(self.length))
+
+    def batch(self, start: int, stop: int) -> ResultBatch:
+        """Rows from ``start`` to ``stop`` as a list-based batch."""
+        if isinstance(self.outputs, _Strings):
+            outputs = self.outputs.slice(start, stop)
+        else:
+            outputs = list(self.outputs[start:stop])
+        errors = [None] * (stop - start)
+        for i, error in self.errors.items():
+            if start <= i < stop:
+                outputs[i - start] = None
+                errors[i - start] = error
+        table = None
+        if self.table is not None:
+            table = {name: values[start:stop] for name, values in self.table.items()}
+        return ResultBatch(self.inputs.slice(start, stop), outputs, errors, self.columns, table, self.output_column)
+
+
+class _Column(Sequence):
+    """Read-only view of one column (inputs, outputs or errors) of a ResultBuffer."""
+    def __init__(self, buffer: "ResultBuffer", field: str):
+        self._buffer = buffer
+        self._field = field
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._buffer.row(index)[("inputs", "outputs", "errors").index(self._field)]
+
+    def __iter__(self) -> Iterator[Any]:
+        for segment in self._buffer._segments:
+            if self._field == "inputs":
+                yield from segment.inputs
+            elif self._field == "outputs":
+                yield from segment.iter_outputs()
+            else:
+                yield from segment.iter_errors()
+
+    def count(self, value: Any) -> int:
+        if self._field == "errors" and value is None:
+            return len(self) - self._buffer.error_count
+        return super().count(value)
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"<{self._field} of {len(self)} rows>"
+
+
+class _TableColumn(Sequence):
+    """Read-only view of one table column of a ResultBuffer."""
+    def __init__(self, buffer: "ResultBuffer", name: str):
+        self._buffer = buffer
+        self._name = name
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        segment, offset = self._buffer._locate(index)
+        return segment.table[self._name][offset] if segment.table else None
+
+    def __iter__(self) -> Iterator[Any]:
+        for segment in self._buffer._segments:
+            if segment.table:
+                yield from segment.table[self._name]
+            else:
+                yield from [None] * segment.length
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"<column {self._name} of {len(self)} rows>"
+
+
+class ResultBuffer(ResultBatch):
+    """
+    Results of a whole conversion, kept compactly in memory.
+
+    Appended batches are stored with their inputs as one string per batch
+    plus offsets, their outputs in typed arrays, and a table of error
+    messages, which takes several times less memory than lists of Python
+    objects. ``inputs``, ``outputs`` and ``errors`` are read-only views, so
+    a buffer can be written to any sink like a ResultBatch; so are the
+    columns of ``table`` for rows converted from a table.
+    """
+    def __init__(self, columns: Optional[List[str]] = None):
+        self.columns = columns
+        self.table: Optional[Dict[str, _TableColumn]] = None
+        self.output_column = "Output"
+        self._segments: List[_Segment] = []
+        self._starts: List[int] = []
+        self._length = 0
+        self._error_count = 0
+        self.inputs = _Column(self, "inputs")
+        self.outputs = _Column(self, "outputs")
+        self.errors = _Column(self, "errors")
+
+    # Views are set per instance; this keeps dataclass comparisons away
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __repr__(self) -> str:
+        return f"ResultBuffer({self._length} rows, {self._error_count} errors)"
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def error_count(self) -> int:
+        return self._error_count
+
+    def append(self, batch: ResultBatch):
+        if not len(batch):
+            return
+        if not self._segments:
+            self.columns = batch.columns
+            self.output_column = batch.output_column
+            if batch.table is not None:
+                self.table = {name: _TableColumn(self, name) for name in batch.table}
+        segment = _Segment(batch)
+        self._segments.append(segment)
+        self._starts.append(self._length)
+        self._length += segment.length
+        self._error_count += len(segment.errors)
+
+    def _locate(self, index: int):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        number = bisect_right(self._starts, index) - 1
+        return self._segments[number], index - self._starts[number]
+
+    def row(self, index: int) -> Row:
+        segment, offset = self._locate(index)
+        return segment.inputs[offset], segment.output(offset), segment.errors.get(offset)
+
+    def rows(self) -> Iterator[Row]:
+        for segment in self._segments:
+            yield from zip(segment.inputs, segment.iter_outputs(), segment.iter_errors())
+
+    def slice(self, start: int, stop: int) -> Iterator[ResultBatch]:
+        """
+        The rows from ``start`` to ``stop`` (excluded), as list-based batches
+        that do not cross the boundaries of the appended batches.
+        """
+        start, stop = max(start, 0), min(stop, self._length)
+        if start >= stop:
+            return
+        number = bisect_right(self._starts, start) - 1
+        while start < stop:
+            segment, first = self._segments[number], start - self._starts[number]
+            last = min(segment.length, stop - self._starts[number])
+            yield segment.batch(first, last)
+            start += last - first
+            number += 1
+
+    def batches(self) -> Iterator[ResultBatch]:
+        """The appended batches, rebuilt one at a time as lists."""
+        return self.slice(0, self._length)
+
+    def error_rows(self) -> Iterator[int]:
+        """Numbers of the rows that failed, in order."""
+        for start, segment in zip(self._starts, self._segments):
+            for i in sorted(segment.errors):
+                yield start + i
+
+
+class BufferSink(ResultSink):
+    """Appends every batch to a ResultBuffer."""
+    def __init__(self, buffer: Optional[ResultBuffer] = None):
+        self.buffer = buffer if buffer is not None else ResultBuffer()
+
+    def write(self, batch: ResultBatch):
+        self.buffer.append(batch)
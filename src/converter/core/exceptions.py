@@ -9,3 +9,7 @@ class ValidationError(ConverterError):
 class ConversionError(ConverterError):
     """Raised when conversion fails."""
     pass
+
+class ExportError(ConverterError):
+    """Raised when results cannot be exported."""
+    pass
@@ -0,0 +1,276 @@
+import contextlib
+import csv
+import json
+import os
+from typing import Dict, Optional, Type
+from .exceptions import ExportError, ValidationError
+from .results import ResultBatch, FileSink
+
+# Rows written to the file system are buffered this much
+BUFFER_SIZE = 1 << 20
+
+
+def _remove(path: str):
+    """Remove an incomplete export, if it was created."""
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+class ExcelSink(FileSink):
+    """
+    Streams rows into an .xlsx workbook with openpyxl's write-only mode.
+    A new sheet is started whenever one reaches Excel's row limit.
+    """
+    #: Rows per sheet, including the header row.
+    max_rows = 1048576
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._workbook = None
+        self._header = None
+        self._sheet = None
+        self._sheet_rows = 0
+
+    def _new_sheet(self):
+        self._sheet = self._workbook.create_sheet(f"Sheet{len(self._workbook.worksheets) + 1}")
+        self._sheet.append(self._header)
+        self._sheet_rows = 1
+
+    def write(self, batch: ResultBatch):
+        if not len(batch):
+            return
+        try:
+            if self._workbook is None:
+                from openpyxl import Workbook  # Deferred: only needed for Excel export
+                self._workbook = Workbook(write_only=True)
+                self._header = self.header(batch)
+                self._new_sheet()
+            for row in self.export_rows(batch):
+                if self._sheet_rows >= self.max_rows:
+                    self._new_sheet()
+                self._sheet.append(row)
+                self._sheet_rows += 1
+        except Exception as e:
+            raise ExportError(f"Failed to export Excel: {e}")
+
+    def close(self):
+        if self._workbook is None:
+            return
+        try:
+            self._workbook.save(self.path)
+        except Exception as e:
+            raise ExportError(f"Failed to export Excel: {e}")
+        self.written = True
+
+    def discard(self):
+        # Nothing reaches the file before the workbook is saved; closing the
+        # sheets ends their row writers (openpyxl removes its temporary files at exit)
+        if self._workbook is None:
+            return
+        for sheet in self._workbook.worksheets:
+            with contextlib.suppress(Exception):
+                sheet.close()
+        self._workbook = None
+
+
+class CsvSink(FileSink):
+    """Writes rows to a CSV file through a buffered writer."""
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = None
+        self._writer = None
+
+    def write(self, batch: ResultBatch):
+        if not len(batch):
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.path, "w", newline="", encoding="utf-8", buffering=BUFFER_SIZE)
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(self.header(batch))
+            self._writer.writerows(self.export_rows(batch))
+        except OSError as e:
+            raise ExportError(f"Failed to export CSV: {e}")
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError as e:
+            raise ExportError(f"Failed to export CSV: {e}")
+        self.written = True
+
+    def discard(self):
+        if self._file is None:
+            return
+        with contextlib.suppress(OSError):
+            self._file.close()
+        self._file = None
+        _remove(self.path)
+
+
+class JsonlSink(FileSink):
+    """Writes one JSON object per row. Values JSON cannot represent are written as strings."""
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = None
+        self._header = None
+
+    def write(self, batch: ResultBatch):
+        if not len(batch):
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.path, "w", encoding="utf-8", buffering=BUFFER_SIZE)
+                self._header = self.header(batch)
+            self._file.write("".join(
+                json.dumps(dict(zip(self._header, row)), ensure_ascii=False, default=str) + "\n"
+                for row in self.export_rows(batch)
+            ))
+        except OSError as e:
+            raise ExportError(f"Failed to export JSONL: {e}")
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError as e:
+            raise ExportError(f"Failed to export JSONL: {e}")
+        self.written = True
+
+    def discard(self):
+        if self._file is None:
+            return
+        with contextlib.suppress(OSError):
+            self._file.close()
+        self._file = None
+        _remove(self.path)
+
+
+class ParquetSink(FileSink):
+    """
+    Writes each batch as a row group of a Parquet file. Requires pyarrow.
+    Columns keep their types, inferred from the values, and outputs are
+    null for rows that failed. A column whose values no Arrow type fits
+    (e.g. integers beyond 64 bits) is written as strings. When a later
+    batch does not fit the types of the file (a column that was all null,
+    then integers; integers, then values beyond 64 bits), the row groups
+    written so far are rewritten with the column widened.
+    """
+    def __init__(self, path: str):
+        super().__init__(path)
+        try:
+            import pyarrow  # Deferred: optional dependency
+            import pyarrow.parquet
+        except ImportError:
+            raise ValidationError("Parquet export requires pyarrow (pip install 'universal-converter[parquet]')")
+        self._pa = pyarrow
+        self._writer = None
+        self._schema = None
+        # File being written: ``path``, or a temporary file once rewritten
+        self._target = path
+        self._rewrites = 0
+
+    def _column(self, values):
+        pa = self._pa
+        try:
+            return pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+    def _merge(self, schema):
+        """Schema fitting both the file and a new batch: strings where their types conflict."""
+        pa = self._pa
+        fields = []
+        for old, new in zip(self._schema, schema):
+            if new.type == old.type or new.type == pa.null():
+                fields.append(old)
+            elif old.type == pa.null():
+                fields.append(new)
+            else:
+                fields.append(pa.field(old.name, pa.string()))
+        return pa.schema(fields)
+
+    def _rewrite(self, schema):
+        """Copy the row groups written so far to a new file with a wider schema."""
+        pq = self._pa.parquet
+        self._writer.close()
+        previous = self._target
+        self._target = f"{self.path}.{self._rewrites}.tmp"
+        self._rewrites += 1
+        self._writer = pq.ParquetWriter(self._target, schema)
+        self._schema = schema
+        source = pq.ParquetFile(previous)
+        try:
+            for i in range(source.num_row_groups):
+                self._writer.write_table(source.read_row_group(i).cast(schema))
+        finally:
+            source.close()
+        if previous != self.path:
+            os.remove(previous)
+
+    def write(self, batch: ResultBatch):
+        if not len(batch):
+            return
+        pa = self._pa
+        header = self.header(batch)
+        columns = [list(values) for values in zip(*self.export_rows(batch, error_output=None))]
+        try:
+            table = pa.table({name: self._column(values) for name, values in zip(header, columns)})
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pa.parquet.ParquetWriter(self._target, table.schema)
+            elif table.schema != self._schema:
+                schema = self._merge(table.schema)
+                if schema != self._schema:
+                    self._rewrite(schema)
+                table = table.cast(schema)
+            self._writer.write_table(table)
+        except (pa.ArrowException, OverflowError, OSError) as e:
+            raise ExportError(f"Failed to export Parquet: {e}")
+
+    def close(self):
+        if self._writer is None:
+            return
+        try:
+            self._writer.close()
+            if self._target != self.path:
+                os.replace(self._target, self.path)
+        except (self._pa.ArrowException, OSError) as e:
+            raise ExportError(f"Failed to export Parquet: {e}")
+        self.written = True
+
+    def discard(self):
+        if self._writer is None:
+            return
+        with contextlib.suppress(self._pa.ArrowException, OSError):
+            self._writer.close()
+        self._writer = None
+        _remove(self._target)
+        if self._target != self.path:
+            _remove(self.path)
+
+
+#: Export sink per file extension.
+EXPORTERS: Dict[str, Type[FileSink]] = {
+    ".xlsx": ExcelSink,
+    ".csv": CsvSink,
+    ".jsonl": JsonlSink,
+    ".parquet": ParquetSink,
+}
+
+
+def open_export(path: str, default: Optional[str] = None) -> FileSink:
+    """
+    Create the export sink matching a file's extension.
+    :param default: Extension used when the path has none.
+    :raises ValidationError: If the format is not supported.
+    """
+    extension = os.path.splitext(path)[1].lower() or default
+    sink_cls = EXPORTERS.get(extension)
+    if sink_cls is None:
+        supported = ", ".join(EXPORTERS)
+        raise ValidationError(f"Unsupported export format '{extension or path}' (supported: {supported})")
+    return sink_cls(path)
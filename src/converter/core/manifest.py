@@ -0,0 +1,175 @@
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+MANIFEST_VERSION = 1
+ENTRY_POINT_GROUP = "universal_converter.converters"
+
+
+def cache_dir() -> str:
+    """
+    Directory for on-disk caches.
+    Honours UNIVERSAL_CONVERTER_CACHE_DIR, then XDG_CACHE_HOME.
+    """
+    path = os.environ.get("UNIVERSAL_CONVERTER_CACHE_DIR")
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "universal-converter")
+
+
+def _stat_stamp(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _package_sources(module: str, origin: str) -> List[str]:
+    """The source files of the top-level package of a module, or the module alone."""
+    try:
+        spec = importlib.util.find_spec(module.partition(".")[0])
+    except (ImportError, ValueError):
+        spec = None
+    roots = list(spec.submodule_search_locations or []) if spec else []
+    if not roots:
+        return [origin]
+    sources = []
+    for root in roots:
+        for directory, subdirs, files in os.walk(root):
+            subdirs[:] = sorted(d for d in subdirs if d != "__pycache__")
+            sources.extend(os.path.join(directory, name) for name in sorted(files) if name.endswith(".py"))
+    return sources
+
+
+def _module_stamp(target: str) -> Optional[List[Any]]:
+    """
+    Identify the current source of a 'module:attr' target without importing it.
+    A spec may depend on any module of the converter's package (e.g. choices
+    defined in an engine), so the whole package is stamped.
+    """
+    module = target.partition(":")[0]
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        return None
+    digest = hashlib.sha256()
+    for path in _package_sources(module, spec.origin):
+        digest.update(json.dumps([path, _stat_stamp(path)]).encode("utf-8"))
+    return [spec.origin, digest.hexdigest()]
+
+
+def _core_stamp() -> List[Any]:
+    """Arguments shared through base classes live in this package; their changes invalidate every entry."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    return [_stat_stamp(os.path.join(here, name)) for name in ("arguments.py", "base.py", "batch.py")]
+
+
+def _site_stamp() -> Dict[str, List[int]]:
+    """Installing or removing a distribution touches its site directory."""
+    stamp = {}
+    for entry in sys.path:
+        if entry.endswith(("site-packages", "dist-packages")):
+            st = _stat_stamp(entry)
+            if st:
+                stamp[entry] = st
+    return stamp
+
+
+class PluginManifest:
+    """
+    Cached converter metadata, stored as JSON.
+
+    Each entry records a converter's name, help text and argument spec,
+    stamped with the modification times of the package that defines it, so
+    the CLI can build its parser without importing any converter module.
+    The entry point listing is cached as well and refreshed when a site
+    directory changes.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(cache_dir(), "manifest.json")
+        self._data: Dict[str, Any] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        core = _core_stamp()
+        if data.get("version") != MANIFEST_VERSION or data.get("core") != core:
+            data = {"version": MANIFEST_VERSION, "core": core, "converters": {}}
+        data.setdefault("converters", {})
+        self._data = data
+
+    def entry_points(self) -> Dict[str, str]:
+        """
+        Get converters advertised through the entry point group, as name -> 'module:attr'.
+        """
+        cached = self._data.get("entry_points")
+        site = _site_stamp()
+        if cached is not None and cached.get("site") == site:
+            return cached["targets"]
+
+        targets = {}
+        try:
+            from importlib.metadata import entry_points
+            eps = entry_points()
+            if hasattr(eps, "select"):
+                selected = eps.select(group=ENTRY_POINT_GROUP)
+            else:
+                selected = eps.get(ENTRY_POINT_GROUP, [])
+            for ep in selected:
+                targets[ep.name] = ep.value
+        except Exception as e:
+            logger.debug(f"Entry point discovery failed: {e}")
+
+        self._data["entry_points"] = {"site": site, "targets": targets}
+        self._dirty = True
+        return targets
+
+    def get(self, name: str, target: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached metadata for a converter, or None if missing or stale.
+        """
+        entry = self._data["converters"].get(name)
+        if not entry or entry.get("target") != target:
+            return None
+        if entry.get("stamp") != _module_stamp(target):
+            return None
+        return entry
+
+    def put(self, name: str, target: str, help: str, spec: Dict[str, Any]):
+        """Record the metadata of a converter that has just been loaded."""
+        self._data["converters"][name] = {
+            "target": target,
+            "help": help,
+            "spec": spec,
+            "stamp": _module_stamp(target),
+        }
+        self._dirty = True
+
+    def save(self):
+        """Write the manifest if it changed. Failures are not fatal."""
+        if not self._dirty:
+            return
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f"Could not write plugin manifest {self.path}: {e}")
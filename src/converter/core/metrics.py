@@ -0,0 +1,183 @@
+import json
+import sys
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, or None where it is not available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Metrics:
+    """
+    Stage timers and counters, per converter.
+
+    Stages are named steps of a conversion ("import", "arguments",
+    "convert", "write:<sink>"...); counters count rows, errors and requests.
+    Recording takes a lock and two clock reads, so it is cheap enough to
+    stay enabled: batches hold thousands of rows.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[Tuple[str, str], List[float]] = {}
+        self._counters: Dict[Tuple[str, str], float] = {}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def add_time(self, stage: str, seconds: float, converter: str = ""):
+        with self._lock:
+            entry = self._stages.setdefault((stage, converter), [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def count(self, counter: str, value: float = 1, converter: str = ""):
+        with self._lock:
+            key = (counter, converter)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def take(self) -> Dict[str, Any]:
+        """
+        The values recorded since the last call, which are then cleared
+        (e.g. for a worker process to hand them over to its parent).
+        """
+        with self._lock:
+            taken = {"stages": self._stages, "counters": self._counters}
+            self._stages, self._counters = {}, {}
+        return taken
+
+    def merge(self, taken: Dict[str, Any]):
+        """Add values returned by ``take``, possibly in another process."""
+        with self._lock:
+            for key, (seconds, calls) in taken["stages"].items():
+                entry = self._stages.setdefault(key, [0.0, 0])
+                entry[0] += seconds
+                entry[1] += calls
+            for key, value in taken["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def stage(self, stage: str, converter: str = "") -> Iterator[None]:
+        """Time a block of code as one call of a stage."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, perf_counter() - start, converter)
+
+    def timed(self, iterable: Iterable[Any], stage: str, converter: str = "") -> Iterator[Any]:
+        """Iterate, timing the production of each item as one call of a stage."""
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.add_time(stage, perf_counter() - start, converter)
+                yield item
+        finally:
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All values as plain data (e.g. for JSON)."""
+        with self._lock:
+            stages = [{"stage": stage, "converter": converter, "seconds": seconds, "calls": calls}
+                      for (stage, converter), (seconds, calls) in sorted(self._stages.items())]
+            counters = [{"counter": counter, "converter": converter, "value": value}
+                        for (counter, converter), value in sorted(self._counters.items())]
+        return {"stages": stages, "counters": counters, "peak_rss_bytes": peak_rss_bytes()}
+
+    def summary(self) -> str:
+        """Human-readable table of stages, throughput and peak memory."""
+        snapshot = self.snapshot()
+        lines = [f"{'stage':<20} {'converter':<12} {'calls':>7} {'seconds':>10}"]
+        for entry in snapshot["stages"]:
+            lines.append(f"{entry['stage']:<20} {entry['converter'] or '-':<12} {entry['calls']:>7} {entry['seconds']:>10.4f}")
+
+        counters = {(c["counter"], c["converter"]): c["value"] for c in snapshot["counters"]}
+        convert = {e["converter"]: e["seconds"] for e in snapshot["stages"] if e["stage"] == "convert"}
+        for (counter, converter), rows in sorted(counters.items()):
+            if counter != "rows":
+                continue
+            errors = counters.get(("errors", converter), 0)
+            seconds = convert.get(converter)
+            rate = f", {rows / seconds:,.0f} rows/s" if seconds else ""
+            lines.append(f"{converter}: {rows:,.0f} rows, {errors:,.0f} errors{rate}")
+            if ("result_cache_hits", converter) in counters:
+                lines.append(f"{converter}: results replayed from the result cache")
+            if ("cache_hits", converter) in counters:
+                hits, misses = counters[("cache_hits", converter)], counters.get(("cache_misses", converter), 0)
+                duplicates = counters.get(("duplicate_rows", converter), 0)
+                lines.append(f"{converter} cache: {hits:,.0f} hits, {misses:,.0f} misses, {duplicates:,.0f} duplicate rows")
+
+        if snapshot["peak_rss_bytes"] is not None:
+            lines.append(f"peak RSS: {snapshot['peak_rss_bytes'] / (1 << 20):.1f} MiB")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def prometheus(self) -> str:
+        """Values in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        label = _label_value
+        lines = [
+            "# HELP converter_stage_seconds_total Time spent per conversion stage.",
+            "# TYPE converter_stage_seconds_total counter",
+        ]
+        lines += [f'converter_stage_seconds_total{{stage="{label(e["stage"])}",converter="{label(e["converter"])}"}} {e["seconds"]:.6f}'
+                  for e in snapshot["stages"]]
+        lines += [
+            "# HELP converter_stage_calls_total Calls per conversion stage.",
+            "# TYPE converter_stage_calls_total counter",
+        ]
+        lines += [f'converter_stage_calls_total{{stage="{label(e["stage"])}",converter="{label(e["converter"])}"}} {e["calls"]}'
+                  for e in snapshot["stages"]]
+
+        names = sorted({c["counter"] for c in snapshot["counters"]})
+        for name in names:
+            lines.append(f"# TYPE converter_{name}_total counter")
+            lines += [f'converter_{name}_total{{converter="{label(c["converter"])}"}} {_sample_value(c["value"])}'
+                      for c in snapshot["counters"] if c["counter"] == name]
+
+        if snapshot["peak_rss_bytes"] is not None:
+            lines += [
+                "# HELP converter_peak_rss_bytes Peak resident set size of the process.",
+                "# TYPE converter_peak_rss_bytes gauge",
+                f"converter_peak_rss_bytes {snapshot['peak_rss_bytes']}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _label_value(value: str) -> str:
+    """A label value escaped for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sample_value(value: float) -> str:
+    # Integral values are written exactly: :g would round large counts
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+#: Metrics of this process.
+METRICS = Metrics()
@@ -0,0 +1,104 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .exceptions import ValidationError
+from .metrics import METRICS
+from .results import ResultBatch
+
+# Converter instance of the current worker process
+_converter = None
+
+
+def resolve_workers(value: Optional[str]) -> int:
+    """
+    Parse a --workers value: a positive count, or 0 for one worker per CPU.
+    :raises ValidationError: If the value is not a non-negative integer.
+    """
+    if value in (None, ""):
+        return 1
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        workers = -1
+    if workers < 0:
+        raise ValidationError(f"Invalid number of workers: {value}")
+    return workers or os.cpu_count() or 1
+
+
+def _init_worker(converter):
+    global _converter
+    _converter = converter
+    # Forked workers start with a copy of the parent's values
+    METRICS.reset()
+
+
+def _convert_chunk(task: Tuple[str, Union[str, List[str]]]) -> Tuple[List[Any], Dict[int, str], Dict[str, Any]]:
+    mode, lines = task
+    # Chunks travel as one string and errors as a sparse dict, which is
+    # much cheaper to pickle than lists of per-line objects.
+    if isinstance(lines, str):
+        lines = lines.split("\n")
+    batch = _converter.process_chunk(mode, lines)
+    # Metrics recorded here (cache hits, stage timers) go back to the parent
+    return batch.outputs, {i: error for i, error in enumerate(batch.errors) if error}, METRICS.take()
+
+
+def _to_batch(lines: List[str], result: Tuple[List[Any], Dict[int, str], Dict[str, Any]]) -> ResultBatch:
+    outputs, errors, metrics = result
+    METRICS.merge(metrics)
+    batch = ResultBatch(lines, outputs, [None] * len(lines))
+    for i, error in errors.items():
+        batch.errors[i] = error
+    return batch
+
+
+def imap(function: Callable[..., Any], items: Iterable[Any], workers: int,
+         initializer: Optional[Callable[..., None]] = None, initargs: Tuple = ()) -> Iterator[Any]:
+    """
+    Apply a picklable function to items in a pool of worker processes.
+    Results are yielded in input order, with at most two items per worker in
+    flight, so streamed input still uses bounded memory.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    try:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(function, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def map_chunks(converter, mode: str, chunks: Iterable[List[str]], workers: int) -> Iterator[ResultBatch]:
+    """
+    Convert chunks with ``converter.process_chunk`` in a pool of worker processes,
+    yielding batches in input order. Input that fits in a single chunk is
+    converted in this process.
+    :param converter: A picklable converter; each worker receives a copy.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if second is None:
+        yield converter.process_chunk(mode, first)
+        return
+
+    # Chunks are consumed by imap below while their lines are kept here
+    sent = deque()
+
+    def texts():
+        for chunk in chain((first, second), chunks):
+            sent.append(chunk)
+            text = "\n".join(chunk)
+            # Lines with newlines of their own (e.g. table cells) are sent as a list
+            yield (mode, text if text.count("\n") == len(chunk) - 1 else chunk)
+
+    for result in imap(_convert_chunk, texts(), workers, _init_worker, (converter,)):
+        yield _to_batch(sent.popleft(), result)
@@ -0,0 +1,123 @@
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+from .arguments import InterfaceBuilder, ArgumentType
+from .batch import BatchConverter
+from .exceptions import ValidationError
+from .metrics import METRICS
+from .registry import ConverterRegistry
+from .results import ResultBatch
+from .streaming import STDIN
+
+
+class Stage(NamedTuple):
+    """One step of a pipeline: a batch converter and the mode it runs in."""
+    converter: BatchConverter
+    mode: str
+
+    def __str__(self) -> str:
+        return f"{self.converter.name}:{self.mode}"
+
+    @classmethod
+    def parse(cls, spec: str) -> "Stage":
+        """
+        Build a stage from a 'converter:mode' spec (e.g. 'number:hex2dec').
+        :raises ValidationError: If the spec does not name a batch converter and one of its modes.
+        """
+        name, _, mode = spec.partition(":")
+        if not name or not mode:
+            raise ValidationError(f"Invalid pipeline stage '{spec}': expected CONVERTER:MODE")
+        converter = ConverterRegistry.get_converter(name)()
+        if not isinstance(converter, BatchConverter):
+            raise ValidationError(f"Converter {name} cannot be used in a pipeline")
+        if mode not in converter.modes:
+            raise ValidationError(f"Unknown mode '{mode}' for {name} (modes: {', '.join(converter.modes)})")
+        return cls(converter, mode)
+
+
+class Pipeline(BatchConverter):
+    """
+    Batch converters chained in one pass: each chunk of input lines goes
+    through every stage in turn, and each stage receives the outputs of the
+    previous one with their types (``convert_values``), not as text. Rows
+    that fail at a stage keep that error and skip the stages after it.
+
+    A pipeline is used like any batch converter, its lines being given as
+    ``values`` or through ``input`` (stdin when neither is given)::
+
+        pipeline = Pipeline.from_specs(["number:hex2dec", "datetime:to_dt"])
+        for batch in pipeline.convert_batch(values="0x63b175c0"):
+            print(batch.outputs)  # ['2023-01-01T12:00:00+00:00']
+    """
+    name = "pipe"
+    help = "Chain batch converters in one pass (e.g. number:hex2dec datetime:to_dt)"
+    modes = ("values",)
+    chunk_safe = True
+
+    def __init__(self, stages: Iterable[Union[Stage, Sequence[Any]]]):
+        self.stages = [Stage(*stage) for stage in stages]
+        if not self.stages:
+            raise ValidationError("A pipeline needs at least one stage")
+        self.chunk_safe = all(stage.converter.chunk_safe for stage in self.stages)
+        self.chunk_size = min(stage.converter.chunk_size for stage in self.stages)
+        # Cached results depend on every stage
+        self.version = " ".join(f"{stage}@{stage.converter.version}" for stage in self.stages)
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[str]) -> "Pipeline":
+        """Build a pipeline from 'converter:mode' specs, loading the converters from the registry."""
+        return cls(map(Stage.parse, specs))
+
+    def __repr__(self) -> str:
+        return f"Pipeline({' '.join(map(str, self.stages))})"
+
+    @classmethod
+    def configure_args(cls, builder: InterfaceBuilder):
+        group = builder.add_group(exclusive=True)
+        group.add_argument("values", type=ArgumentType.TEXT, metavar="VALUES", nargs="?", const="-",
+                           help="Values to convert, one per line (default: stdin, or --input)")
+        cls.add_batch_arguments(builder)
+
+    def _with_values(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        # Without values, the lines come from --input, else stdin
+        return kwargs if kwargs.get("values") is not None else dict(kwargs, values=STDIN)
+
+    def convert_batch(self, **kwargs: Any) -> Iterator[ResultBatch]:
+        return super().convert_batch(**self._with_values(kwargs))
+
+    def cache_key(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        return super().cache_key(self._with_values(kwargs))
+
+    def cache_environment(self, mode: str) -> List[Any]:
+        return [stage.converter.cache_environment(stage.mode) for stage in self.stages]
+
+    def output_column(self, column: str, mode: str) -> str:
+        return f"{column}_{self.stages[-1].mode}"
+
+    def process_chunk(self, mode: str, lines: List[str]) -> ResultBatch:
+        first = self.stages[0]
+        with METRICS.stage(f"stage:{first}", self.name):
+            batch = first.converter.process_chunk(first.mode, lines)
+        return self._continue(batch)
+
+    def convert_values(self, mode: str, values: List[Any]) -> ResultBatch:
+        first = self.stages[0]
+        with METRICS.stage(f"stage:{first}", self.name):
+            batch = first.converter.convert_values(first.mode, values)
+        return self._continue(batch)
+
+    def _continue(self, batch: ResultBatch) -> ResultBatch:
+        """Run the outputs of the first stage through the other stages."""
+        outputs, errors = batch.outputs, batch.errors
+        for stage in self.stages[1:]:
+            with METRICS.stage(f"stage:{stage}", self.name):
+                if errors.count(None) == len(errors):
+                    step = stage.converter.convert_values(stage.mode, outputs)
+                    outputs, errors = step.outputs, step.errors
+                    continue
+                ok = [i for i, error in enumerate(errors) if error is None]
+                if not ok:
+                    break
+                step = stage.converter.convert_values(stage.mode, [outputs[i] for i in ok])
+                outputs, errors = list(outputs), list(errors)
+                for i, output, error in zip(ok, step.outputs, step.errors):
+                    outputs[i], errors[i] = output, error
+        return ResultBatch(batch.inputs, outputs, errors)
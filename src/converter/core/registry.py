@@ -1,36 +1,181 @@
-from typing import Dict, Type
+import importlib
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Type
 from .base import BaseConverter
+from .arguments import InterfaceBuilder
+from .exceptions import ConverterError
+from .manifest import PluginManifest
 from ..utils.logger import setup_logger
 
 logger = setup_logger()
 
+@dataclass
+class ConverterInfo:
+    """
+    Class-level description of a converter, available without instantiating it.
+    """
+    name: str
+    help: str
+    target: Optional[str] = None  # 'module:attr', for converters loaded on demand
+    spec: Dict[str, Any] = field(default_factory=dict)
+
+    def build_args(self, builder: InterfaceBuilder) -> InterfaceBuilder:
+        """Apply this converter's argument spec to a builder."""
+        return builder.load_spec(self.spec)
+
+
+def describe(converter_cls: Type[BaseConverter], target: Optional[str] = None) -> ConverterInfo:
+    """
+    Read name, help and argument spec from a converter class.
+    Converters that still define these per instance are instantiated once as a fallback.
+    """
+    name, help = converter_cls.name, converter_cls.help
+    configure = inspect.getattr_static(converter_cls, "configure_args", None)
+    owner = converter_cls
+    if not isinstance(name, str) or not isinstance(help, str) or not isinstance(configure, classmethod):
+        owner = converter_cls()
+        name, help = owner.name, owner.help
+    if not name:
+        raise ConverterError(f"Converter {converter_cls.__name__} does not define a name")
+
+    builder = InterfaceBuilder()
+    owner.configure_args(builder)
+    return ConverterInfo(name=name, help=help, target=target, spec=builder.to_spec())
+
+
 class ConverterRegistry:
     """
     Registry for available converters.
+
+    Converters are either registered directly (``register``) or known by a
+    'module:attr' target (``register_lazy`` and the
+    ``universal_converter.converters`` entry point group). Metadata for
+    targets is served from a cached manifest, so only the converter that is
+    actually used gets imported.
     """
     _converters: Dict[str, Type[BaseConverter]] = {}
+    _infos: Dict[str, ConverterInfo] = {}
+    _lazy: Dict[str, str] = {}
+    _manifest: Optional[PluginManifest] = None
+    _discovered = False
 
     @classmethod
     def register(cls, converter_cls: Type[BaseConverter]):
         """
         Register a converter class.
         """
-        # Instantiate to get the name property, or we could make name a class property.
-        # However, for simplicity, let's assume we can access name via an instance or class attribute.
-        # To be safe and clean, we will instantiate it later, but we need the name now.
-        # Let's assume the class has a 'name' attribute or property.
-        # If it's a property on instance, we might need to instantiate it.
-        # Let's instantiate it to register.
         try:
-            instance = converter_cls()
-            cls._converters[instance.name] = converter_cls
-            logger.debug(f"Registered converter: {instance.name}")
+            target = f"{converter_cls.__module__}:{converter_cls.__qualname__}"
+            info = describe(converter_cls, target)
         except Exception as e:
             logger.error(f"Failed to register converter {converter_cls}: {e}")
+            return
+        cls._converters[info.name] = converter_cls
+        cls._infos[info.name] = info
+        logger.debug(f"Registered converter: {info.name}")
+
+    @classmethod
+    def register_lazy(cls, name: str, target: str):
+        """
+        Register a converter by the 'module:attr' path of its class.
+        The module is imported on first use.
+        """
+        cls._lazy[name] = target
+
+    @classmethod
+    def use_manifest(cls, manifest: Optional[PluginManifest]):
+        """Replace the metadata manifest (mainly for tests)."""
+        cls._manifest = manifest
+        cls._discovered = False
+
+    @classmethod
+    def discover(cls):
+        """Add converters advertised through entry points."""
+        if cls._discovered:
+            return
+        cls._discovered = True
+        cls._lazy.update(cls._get_manifest().entry_points())
+
+    @classmethod
+    def get_metadata(cls) -> Dict[str, ConverterInfo]:
+        """
+        Get the metadata of every known converter, importing only those missing from the manifest.
+        """
+        cls.discover()
+        manifest = cls._get_manifest()
+        infos = {}
+        for name, target in cls._lazy.items():
+            if name in cls._infos:
+                infos[name] = cls._infos[name]
+                continue
+            entry = manifest.get(name, target)
+            if entry is None:
+                if cls._load(name) is None:
+                    continue
+                info = cls._infos[name]
+                manifest.put(name, target, info.help, info.spec)
+                infos[name] = info
+            else:
+                infos[name] = ConverterInfo(name=name, help=entry["help"], target=target, spec=entry["spec"])
+        for name, info in cls._infos.items():
+            infos.setdefault(name, info)
+        manifest.save()
+        return infos
+
+    @classmethod
+    def list_converters(cls) -> Dict[str, str]:
+        """
+        Get the name and help text of every known converter.
+        """
+        return {name: info.help for name, info in cls.get_metadata().items()}
+
+    @classmethod
+    def get_converter(cls, name: str) -> Type[BaseConverter]:
+        """
+        Get a single converter class, importing its module if needed.
+        """
+        if name not in cls._converters:
+            cls.discover()
+            cls._load(name)
+        try:
+            return cls._converters[name]
+        except KeyError:
+            raise ConverterError(f"Unknown converter: {name}")
 
     @classmethod
     def get_converters(cls) -> Dict[str, Type[BaseConverter]]:
         """
         Get all registered converters.
         """
+        cls.discover()
+        for name in list(cls._lazy):
+            if name not in cls._converters:
+                cls._load(name)
         return cls._converters
+
+    @classmethod
+    def _get_manifest(cls) -> PluginManifest:
+        if cls._manifest is None:
+            cls._manifest = PluginManifest()
+        return cls._manifest
+
+    @classmethod
+    def _load(cls, name: str) -> Optional[Type[BaseConverter]]:
+        target = cls._lazy.get(name)
+        if target is None:
+            return None
+        module_name, _, attr = target.partition(":")
+        try:
+            module = importlib.import_module(module_name)
+            converter_cls = getattr(module, attr) if attr else None
+        except (ImportError, AttributeError) as e:
+            logger.error(f"Failed to load converter {name} from {target}: {e}")
+            return None
+        if name not in cls._converters and converter_cls is not None:
+            # Plugins are not required to call register() themselves
+            cls.register(converter_cls)
+        if name not in cls._converters:
+            logger.error(f"{target} does not provide a converter named {name}")
+            return None
+        return cls._converters[name]
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Iterator, List, Optional, Union
+from ..utils.logger import setup_logger
+from .manifest import cache_dir
+from .results import FileSink, ResultBatch
+
+logger = setup_logger()
+
+#: Default size limit of the cache, in MiB (UNIVERSAL_CONVERTER_RESULT_CACHE_MB; 0 disables it)
+DEFAULT_MAX_MB = 1024
+
+_BLOCK_SIZE = 1 << 20
+
+
+def content_key(path: str, *parts: Any) -> Optional[str]:
+    """
+    Hash of a file's content and other JSON-compatible parts (converter,
+    mode, options...), or None if the file cannot be read.
+    """
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8"))
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_BLOCK_SIZE), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class CachedResult:
+    """A cache entry: the result batches of a conversion and the files it exported."""
+    def __init__(self, path: str):
+        self.path = path
+
+    def batches(self) -> Iterator[ResultBatch]:
+        with open(os.path.join(self.path, "batches.pickle"), "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def export(self, sink: FileSink) -> Optional[str]:
+        """Stored file exported by a sink of the same kind, if any."""
+        path = os.path.join(self.path, f"export-{type(sink).__name__}")
+        return path if os.path.exists(path) else None
+
+
+class _EntryWriter:
+    """
+    Writes a new entry in a temporary directory, renamed into place by
+    ``commit``. Failing to write is not fatal: the entry is dropped, as is
+    an entry that grows beyond the size limit of the cache.
+    """
+    def __init__(self, cache: "ResultCache", key: str):
+        self.cache = cache
+        self.key = key
+        self.tmp: Optional[str] = None
+        self._file: Optional[BinaryIO] = None
+        try:
+            os.makedirs(cache.path, mode=0o700, exist_ok=True)
+            self.tmp = tempfile.mkdtemp(prefix=f".{key[:16]}-", dir=cache.path)
+            self._file = open(os.path.join(self.tmp, "batches.pickle"), "wb")
+        except OSError as e:
+            self._fail(e)
+
+    def write(self, batch: ResultBatch):
+        if self._file is None:
+            return
+        try:
+            pickle.dump(batch, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            # TypeError and AttributeError: objects that cannot be pickled
+            self._fail(e)
+            return
+        if self._file.tell() > self.cache.max_bytes:
+            self._fail(f"larger than {self.cache.max_bytes} bytes")
+
+    def commit(self, exports: List[FileSink]):
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+            self._file = None
+            for sink in exports:
+                shutil.copyfile(sink.path, os.path.join(self.tmp, f"export-{type(sink).__name__}"))
+            if self.cache._size(self.tmp) > self.cache.max_bytes:
+                self._fail(f"larger than {self.cache.max_bytes} bytes")
+                return
+            os.rename(self.tmp, os.path.join(self.cache.path, self.key))
+            self.tmp = None
+        except OSError as e:
+            # Including an entry stored meanwhile by another process
+            self._fail(e)
+            return
+        self.cache.evict()
+
+    def _fail(self, error: Union[Exception, str]):
+        logger.debug(f"Results not cached in {self.cache.path}: {error}")
+        self.discard()
+
+    def discard(self):
+        """Drop the entry unless it was committed."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.tmp is not None:
+            shutil.rmtree(self.tmp, ignore_errors=True)
+            self.tmp = None
+
+
+class ResultCache:
+    """
+    Results of whole conversions on disk, one directory per key, with the
+    files they were exported to. Least recently used entries are evicted
+    once the cache holds more than ``max_bytes``.
+    """
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or os.path.join(cache_dir(), "results")
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("UNIVERSAL_CONVERTER_RESULT_CACHE_MB", DEFAULT_MAX_MB)) << 20
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """The entry stored under a key, marked as recently used; None if missing."""
+        path = os.path.join(self.path, key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return CachedResult(path)
+
+    def writer(self, key: str) -> _EntryWriter:
+        """Start storing an entry."""
+        return _EntryWriter(self, key)
+
+    def entries(self) -> List[os.DirEntry]:
+        try:
+            return [entry for entry in os.scandir(self.path) if entry.is_dir() and not entry.name.startswith(".")]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _size(path: str) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+    def evict(self):
+        """Delete the least recently used entries until the cache fits in ``max_bytes``."""
+        entries = sorted(self.entries(), key=lambda entry: entry.stat().st_mtime, reverse=True)
+        total = 0
+        for entry in entries:
+            size = self._size(entry.path)
+            if total + size > self.max_bytes:
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                total += size
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def default_result_cache() -> Optional[ResultCache]:
+    """The cache in the cache directory, or None if it is disabled."""
+    cache = ResultCache()
+    return cache if cache.max_bytes > 0 else None
@@ -0,0 +1,149 @@
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# One converted line: (input, output, error message or None)
+Row = Tuple[str, Any, Optional[str]]
+
+
+@dataclass
+class ResultBatch:
+    """
+    Columnar results of one chunk of input.
+    ``outputs`` keep their converted types (int, float, str...); a row whose
+    ``errors`` entry is set failed to convert and its output is None.
+    Structured results have dicts as outputs, with the keys named by ``columns``.
+    Rows converted from a column of a table carry all the table's columns
+    in ``table``; their output is exported as a new ``output_column``.
+    """
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[Any] = field(default_factory=list)
+    errors: List[Optional[str]] = field(default_factory=list)
+    columns: Optional[List[str]] = None
+    table: Optional[Dict[str, List[Any]]] = None
+    output_column: str = "Output"
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Row]) -> "ResultBatch":
+        batch = cls()
+        for line, output, error in rows:
+            batch.inputs.append(line)
+            batch.outputs.append(output)
+            batch.errors.append(error)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.inputs)
+
+    def rows(self) -> Iterator[Row]:
+        """Iterate over (input, output, error) rows."""
+        return zip(self.inputs, self.outputs, self.errors)
+
+    @property
+    def error_count(self) -> int:
+        return len(self.errors) - self.errors.count(None)
+
+    def values(self, output: Any) -> List[Any]:
+        """Values of a structured output in ``columns`` order (all None for a failed row)."""
+        return [output.get(column) if output else None for column in self.columns]
+
+    def text_lines(self) -> Iterator[str]:
+        """
+        Text of each row: the error message, or the output. Structured rows
+        are tab-separated: the input, then the error message or the values.
+        """
+        if self.columns is None:
+            # Empty table cells have neither an output nor an error
+            return (f"{error if error else '' if output is None else output}"
+                    for output, error in zip(self.outputs, self.errors))
+        return ("\t".join(str(value) for value in [line] + ([error] if error else self.values(output)))
+                for line, output, error in self.rows())
+
+
+def render_lines(batch: ResultBatch) -> str:
+    """Default text rendering: one line per row."""
+    return "".join(f"{line}\n" for line in batch.text_lines())
+
+
+class ResultSink(ABC):
+    """
+    Consumer of result batches (terminal, GUI, file export...).
+    ``close`` is called once every batch has been written, or ``discard``
+    instead when the results stopped short (e.g. a cancelled conversion).
+    """
+    @abstractmethod
+    def write(self, batch: ResultBatch):
+        pass
+
+    def close(self):
+        pass
+
+    def discard(self):
+        pass
+
+
+class TextSink(ResultSink):
+    """
+    Writes batches as text to a stream (stdout by default).
+    Structured results are preceded by a header line.
+    """
+    def __init__(self, stream: Optional[TextIO] = None, render: Callable[[ResultBatch], str] = render_lines):
+        self.stream = stream
+        self.render = render
+        self._header = False
+
+    def write(self, batch: ResultBatch):
+        text = self.render(batch)
+        if batch.columns is not None and not self._header:
+            text = "\t".join(["Input"] + batch.columns) + "\n" + text
+            self._header = True
+        (self.stream or sys.stdout).write(text)
+
+
+class CollectSink(ResultSink):
+    """Keeps every batch in memory, for callers that want all results at once."""
+    def __init__(self):
+        self.batches: List[ResultBatch] = []
+
+    def write(self, batch: ResultBatch):
+        self.batches.append(batch)
+
+    def rows(self) -> Iterator[Row]:
+        for batch in self.batches:
+            yield from batch.rows()
+
+
+class FileSink(ResultSink):
+    """
+    Base class for sinks that export results to a file.
+    Each row is exported as Input/Output columns, with "Error" as the output
+    of rows that failed. Structured results get one column per field and an
+    Error column instead of Output.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        #: Set once the file has been written.
+        self.written = False
+
+    @staticmethod
+    def header(batch: ResultBatch) -> List[str]:
+        """Column names of the exported rows."""
+        if batch.table is not None:
+            return list(batch.table) + [batch.output_column]
+        if batch.columns is None:
+            return ["Input", batch.output_column]
+        return ["Input"] + batch.columns + ["Error"]
+
+    @staticmethod
+    def export_rows(batch: ResultBatch, error_output: Any = "Error") -> Iterator[Tuple[Any, ...]]:
+        """
+        Rows of a batch as exported, matching ``header``.
+        :param error_output: Output written for rows that failed.
+        """
+        if batch.table is not None:
+            results = (error_output if error else output for output, error in zip(batch.outputs, batch.errors))
+            return zip(*batch.table.values(), results)
+        if batch.columns is None:
+            return ((line, error_output if error else output) for line, output, error in batch.rows())
+        return (tuple([line] + batch.values(output) + [error]) for line, output, error in batch.rows())
@@ -0,0 +1,47 @@
+import io
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterable, Iterator, List, TextIO
+from .exceptions import ValidationError
+
+STDIN = "-"
+
+@contextmanager
+def open_input(path: str) -> Iterator[TextIO]:
+    """
+    Open an input source for line-by-line reading.
+    :param path: A file path, or '-' for standard input (left open on exit).
+    """
+    if path == STDIN:
+        yield sys.stdin
+        return
+    try:
+        stream = open(path, "r", encoding="utf-8", buffering=1 << 20)
+    except OSError as e:
+        raise ValidationError(f"Cannot read input file '{path}': {e}")
+    with stream:
+        yield stream
+
+
+def iter_lines(stream: Iterable[str]) -> Iterator[str]:
+    """Yield stripped, non-empty lines from a text stream."""
+    for raw in stream:
+        line = raw.strip()
+        if line:
+            yield line
+
+
+def iter_text_lines(text: str) -> Iterator[str]:
+    """Yield stripped, non-empty lines from an in-memory batch without splitting it up front."""
+    return iter_lines(io.StringIO(text))
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Group an iterable into lists of at most ``size`` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,63 @@
+import os
+import sys
+from typing import Any, Dict, Iterator, List
+from .exceptions import ValidationError
+from .streaming import STDIN, chunked
+
+# One chunk of a table: column name -> values, in file order
+TableChunk = Dict[str, List[Any]]
+
+#: Table formats read by column mode, by extension; stdin is read as CSV.
+TABLE_FORMATS = (".csv", ".xlsx")
+
+
+def _csv_chunks(path: str, chunk_size: int) -> Iterator[TableChunk]:
+    import pandas as pd  # Deferred: only needed for column mode
+
+    source = path if path != STDIN else sys.stdin
+    try:
+        # Cells are kept as text, exactly as written
+        reader = pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False, na_filter=False)
+        with reader:
+            for frame in reader:
+                yield {name: frame[name].tolist() for name in frame.columns}
+    except (OSError, pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise ValidationError(f"Cannot read CSV file '{path}': {e}")
+
+
+def _xlsx_chunks(path: str, chunk_size: int) -> Iterator[TableChunk]:
+    from openpyxl import load_workbook  # Deferred: only needed for column mode
+
+    try:
+        workbook = load_workbook(path, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValidationError(f"Cannot read Excel file '{path}': {e}")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        names = [str(name) if name is not None else f"Column{i + 1}" for i, name in enumerate(header)]
+        width = len(names)
+        for chunk in chunked(rows, chunk_size):
+            # Rows may be shorter or longer than the header row
+            cells = [row[:width] + (None,) * (width - len(row)) for row in chunk]
+            yield dict(zip(names, map(list, zip(*cells))))
+    finally:
+        workbook.close()
+
+
+def read_table(path: str, chunk_size: int) -> Iterator[TableChunk]:
+    """
+    Read a .csv or .xlsx table (CSV for stdin) in chunks of ``chunk_size``
+    rows, so tables of any length stream through in bounded memory. The
+    first row holds the column names. CSV cells are read as text; Excel
+    cells keep their types.
+    :raises ValidationError: If the format is not supported or the file cannot be read.
+    """
+    extension = os.path.splitext(path)[1].lower() if path != STDIN else ".csv"
+    if extension == ".csv":
+        return _csv_chunks(path, chunk_size)
+    if extension == ".xlsx":
+        return _xlsx_chunks(path, chunk_size)
+    raise ValidationError(f"Unsupported table format '{extension or path}' (supported: {', '.join(TABLE_FORMATS)})")
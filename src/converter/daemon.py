@@ -0,0 +1,363 @@
+"""
+``universal-converter serve``: a long-running process that keeps the
+converters imported and warm.
+
+Requests are JSON objects::
+
+    {"command": "number", "args": {"hex2dec": "0xA\n0xB"}, "format": "text"}
+
+``args`` are the converter's keyword arguments, as the CLI would pass them.
+A request may also be a list of such objects, handled in order. The CLI
+adds the caller's time zone as ``"zone"``; a conversion that depends on
+the local zone (e.g. ``datetime --to-ts`` on naive datetimes) is refused
+with ``{"status": 1, "run_locally": true, ...}`` when it differs from the
+daemon's, and the CLI then runs it locally.
+
+Over the Unix socket, each request is one line and the reply is a series
+of JSON lines: ``{"text": ...}`` (or ``{"rows": [...]}`` with
+``"format": "rows"``) as results are produced, then ``{"status": 0}``, or
+``{"status": 1, "error": ...}`` on failure. Connections are persistent.
+
+Over HTTP, ``POST /convert`` takes the same request and answers with a
+single JSON object per request, holding the joined text or rows. HTTP
+requests must carry the daemon's token (``Authorization: Bearer TOKEN``,
+the token being written to ``daemon.token`` next to the socket), a
+``Host`` of 127.0.0.1 or localhost and no ``Origin``, and requests to
+``/convert`` must be ``application/json``: web pages can then neither
+send requests to the daemon nor reach it through DNS rebinding.
+
+Metrics (stage times, rows, errors, requests, peak memory) are served in
+the Prometheus text format by ``GET /metrics``, or as the text of a
+``{"metrics": true}`` request.
+"""
+import hmac
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from .client import default_socket_path, default_token_path, local_zone
+from .core.base import BaseConverter
+from .core.batch import BatchConverter
+from .core.exceptions import ConverterError, ValidationError
+from .core.metrics import METRICS
+from .core.registry import ConverterRegistry
+from .core.results import ResultBatch, ResultSink
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+Send = Callable[[Dict[str, Any]], None]
+
+
+class _MessageStream:
+    """Text stream that forwards writes as {"text": ...} messages."""
+    def __init__(self, send: Send):
+        self.send = send
+
+    def write(self, text: str):
+        if text:
+            self.send({"text": text})
+
+    def flush(self):
+        pass
+
+
+class _RowsSink(ResultSink):
+    """Forwards batches as {"rows": [[input, output, error], ...]} messages."""
+    def __init__(self, send: Send):
+        self.send = send
+
+    def write(self, batch: ResultBatch):
+        message: Dict[str, Any] = {"rows": [list(row) for row in batch.rows()]}
+        if batch.columns is not None:
+            message["columns"] = batch.columns
+        self.send(message)
+
+
+class ConverterDaemon:
+    """
+    Serves conversion requests from warm converter instances.
+
+    Converter instances may keep per-call state, so each one serves a
+    single request at a time: idle instances are pooled per converter and
+    a new one is created when all are busy.
+    """
+    def __init__(self):
+        self._idle: Dict[str, List[BaseConverter]] = {}
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        """Import every converter, let it prepare, and keep one instance of each ready."""
+        for name, converter_cls in ConverterRegistry.get_converters().items():
+            try:
+                converter_cls.warm_up()
+                self._idle.setdefault(name, []).append(converter_cls())
+            except Exception as e:
+                logger.error(f"Failed to warm up converter {name}: {e}")
+
+    @contextmanager
+    def converter(self, name: str) -> Iterator[BaseConverter]:
+        """Borrow an instance of a converter for one request."""
+        with self._lock:
+            idle = self._idle.setdefault(name, [])
+            instance = idle.pop() if idle else None
+        if instance is None:
+            instance = ConverterRegistry.get_converter(name)()
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                self._idle[name].append(instance)
+
+    def handle(self, request: Any, send: Send):
+        """Run one request, or a list of requests, sending reply messages as they are produced."""
+        if isinstance(request, list):
+            for item in request:
+                self.handle(item, send)
+            return
+        if isinstance(request, dict) and request.get("metrics"):
+            send({"text": METRICS.prometheus()})
+            send({"status": 0})
+            return
+        command = request.get("command") if isinstance(request, dict) else None
+        # Metrics are labelled with known converter names only, so requests
+        # cannot create any number of series
+        label = ""
+        try:
+            if not isinstance(command, str):
+                raise ValidationError("A request needs a 'command'")
+            if command not in ConverterRegistry.get_metadata():
+                raise ConverterError(f"Unknown converter: {command}")
+            label = command
+            args = request.get("args") or {}
+            if not isinstance(args, dict):
+                raise ValidationError("'args' must be an object")
+
+            with METRICS.stage("request", command), self.converter(command) as converter:
+                zone = request.get("zone")
+                if zone is not None and zone != local_zone() and _depends_on_zone(converter, args):
+                    send({"status": 1, "run_locally": True,
+                          "error": "The conversion depends on the local time zone, which differs from the daemon's"})
+                    return
+                if request.get("format", "text") == "rows":
+                    converter.run([_RowsSink(send)] + converter.export_sinks(args), **args)
+                else:
+                    converter.convert_to(_MessageStream(send), **args)
+        except ConverterError as e:
+            METRICS.count("failed_requests", 1, label)
+            send({"status": 1, "error": str(e)})
+            return
+        except Exception as e:
+            logger.exception(f"Request failed: {e}")
+            METRICS.count("failed_requests", 1, label)
+            send({"status": 1, "error": f"An unexpected error occurred: {e}"})
+            return
+        send({"status": 0})
+
+    def collect(self, request: Any) -> Any:
+        """Run a request and gather its reply into one object (a list for a list of requests)."""
+        if isinstance(request, list):
+            return [self.collect(item) for item in request]
+        reply: Dict[str, Any] = {}
+
+        def send(message: Dict[str, Any]):
+            if "text" in message:
+                reply["text"] = reply.get("text", "") + message["text"]
+            elif "rows" in message:
+                reply.setdefault("rows", []).extend(message["rows"])
+                if "columns" in message:
+                    reply["columns"] = message["columns"]
+            else:
+                reply.update(message)
+
+        self.handle(request, send)
+        return reply
+
+
+def _depends_on_zone(converter: BaseConverter, args: Dict[str, Any]) -> bool:
+    """Whether results depend on the local time zone, as recorded in their cache key."""
+    if not isinstance(converter, BatchConverter):
+        return False
+    mode = converter.resolve_mode(args)
+    return mode is not None and any(converter.cache_environment(mode))
+
+
+def _dumps(message: Any) -> bytes:
+    return json.dumps(message, default=str).encode("utf-8")
+
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        def send(message: Dict[str, Any]):
+            self.wfile.write(_dumps(message) + b"\n")
+            self.wfile.flush()
+
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                send({"status": 1, "error": "Invalid JSON request"})
+                continue
+            self.server.converters.handle(request, send)
+
+
+# Host names under which the HTTP daemon may be addressed
+LOCAL_HOSTS = ("127.0.0.1", "localhost")
+
+
+def _host_name(header: str) -> str:
+    """Host name of a Host header, without the port."""
+    name, colon, port = header.rpartition(":")
+    return (name if colon and port.isdigit() else header).lower()
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    def _refused(self, json_body: bool = False) -> bool:
+        """Reply with an error and return True unless the request may be served."""
+        if _host_name(self.headers.get("Host", "")) not in LOCAL_HOSTS or self.headers.get("Origin") is not None:
+            self._reply(403, {"status": 1, "error": "Forbidden"})
+            return True
+        token = self.headers.get("Authorization", "")
+        if not hmac.compare_digest(token.encode("utf-8"), f"Bearer {self.server.token}".encode("utf-8")):
+            self._reply(401, {"status": 1, "error": "Missing or invalid token"})
+            return True
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if json_body and content_type != "application/json":
+            self._reply(415, {"status": 1, "error": "Requests must be application/json"})
+            return True
+        return False
+
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self._reply(404, {"status": 1, "error": "Not found"})
+            return
+        if self._refused():
+            return
+        data = METRICS.prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/convert":
+            self._reply(404, {"status": 1, "error": "Not found"})
+            return
+        if self._refused(json_body=True):
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length))
+        except ValueError:
+            self._reply(400, {"status": 1, "error": "Invalid JSON request"})
+            return
+        self._reply(200, self.server.converters.collect(request))
+
+    def _reply(self, code: int, body: Any):
+        data = _dumps(body)
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Clients give up connecting after a moment, so bursts must not fill the backlog
+    request_queue_size = 128
+
+    def __init__(self, path: str, converters: ConverterDaemon):
+        self.converters = converters
+        # Only the owner may connect
+        umask = os.umask(0o077)
+        try:
+            super().__init__(path, _SocketHandler)
+        finally:
+            os.umask(umask)
+
+
+class HTTPServer(ThreadingHTTPServer):
+    """
+    HTTP daemon on localhost. Clients authenticate with ``token`` (random
+    unless given), which ``serve`` writes to a file only the owner can read.
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, port: int, converters: ConverterDaemon, host: str = "127.0.0.1", token: Optional[str] = None):
+        self.converters = converters
+        self.token = token or secrets.token_urlsafe(32)
+        super().__init__((host, port), _HTTPHandler)
+
+
+def write_token(path: str, token: str):
+    """Write the token of an HTTP daemon, readable by the owner only."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+
+
+def _claim_socket(path: str):
+    """Remove a stale socket file, refusing if a daemon still answers on it."""
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise ValidationError(f"A daemon is already listening on {path}")
+
+
+def serve(socket_path: Optional[str] = None, port: Optional[int] = None):
+    """
+    Serve requests until interrupted: over HTTP on localhost if a port is
+    given, else over a Unix socket.
+    """
+    daemon = ConverterDaemon()
+    daemon.warm_up()
+
+    token_path = None
+    if port is not None:
+        server = HTTPServer(port, daemon)
+        token_path = default_token_path(socket_path)
+        write_token(token_path, server.token)
+        where = f"http://127.0.0.1:{server.server_address[1]}/convert (token in {token_path})"
+    else:
+        socket_path = socket_path or default_socket_path()
+        _claim_socket(socket_path)
+        server = UnixServer(socket_path, daemon)
+        where = socket_path
+
+    logger.info(f"Serving converters on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(token_path or socket_path)
+        except OSError:
+            pass
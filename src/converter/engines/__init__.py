@@ -0,0 +1,9 @@
+"""
+Conversion engines.
+
+The ``*_engine`` modules are vectorized with NumPy/pandas, which they
+import at the top; they must only be imported lazily, from code paths
+that handle chunks large enough to pay for it. ``keys`` needs
+cryptography and serves the CSR converter. Other modules here are pure
+Python and shared with the per-row paths.
+"""
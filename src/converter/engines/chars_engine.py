@@ -0,0 +1,59 @@
+from typing import List, Tuple
+import numpy as np
+
+# Byte value -> digit value, 255 where the byte is not a decimal digit
+DIGIT_VALUES = np.full(256, 255, dtype=np.uint8)
+for _i, _c in enumerate(b"0123456789"):
+    DIGIT_VALUES[_c] = _i
+
+# Decimal digits that always fit in an unsigned 64-bit accumulator
+MAX_DIGITS = 19
+
+_PLUS, _MINUS = b"+-"
+
+
+def byte_matrix(lines: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lay a chunk of strings out as a 2-D uint8 array, one row per string.
+    :return: (bytes of shape (n, width) padded with zeros, lengths, ASCII mask).
+             Non-ASCII strings are left empty and flagged False in the mask.
+    """
+    try:
+        packed = np.array(lines, dtype=np.bytes_)
+        ascii_mask = np.ones(len(lines), dtype=bool)
+    except UnicodeEncodeError:
+        ascii_mask = np.array([line.isascii() for line in lines], dtype=bool)
+        packed = np.array([line if ok else "" for line, ok in zip(lines, ascii_mask)], dtype=np.bytes_)
+    width = max(packed.dtype.itemsize, 1)
+    matrix = packed.view(np.uint8).reshape(len(lines), width) if len(lines) else np.zeros((0, 1), np.uint8)
+    lengths = np.char.str_len(packed).astype(np.int64) if len(lines) else np.zeros(0, np.int64)
+    return matrix, lengths, ascii_mask
+
+
+def parse_integers(matrix: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse rows of a byte matrix as decimal integers, as int() does for
+    plain digits with an optional sign.
+    :return: (magnitudes as uint64, negative mask, ok mask). Rows that are
+             not plain integers or may not fit in 64 bits are not ok; the
+             caller handles them another way.
+    """
+    n = len(lengths)
+    sign = np.zeros(n, dtype=np.int64)
+    if n and matrix.shape[1]:
+        first = matrix[:, 0]
+        sign = ((first == _PLUS) | (first == _MINUS)).astype(np.int64)
+    negative = (sign == 1) & (matrix[:, 0] == _MINUS) if n else np.zeros(0, dtype=bool)
+
+    ndigits = lengths - sign
+    ok = (ndigits >= 1) & (ndigits <= MAX_DIGITS)
+    width = int(min(matrix.shape[1], lengths[ok].max(initial=0)))
+
+    values = np.zeros(n, dtype=np.uint64)
+    ten = np.uint64(10)
+    for j in range(width):
+        digits = DIGIT_VALUES[matrix[:, j]]
+        active = ok & (j >= sign) & (j < lengths)
+        ok &= ~active | (digits < 10)
+        values = np.where(active, values * ten + digits.astype(np.uint64), values)
+    return values, negative, ok
@@ -0,0 +1,156 @@
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from .chars_engine import byte_matrix, parse_integers
+from .timeunits import MIN_US, MAX_US, UNIT_SCALE, unit_for_magnitude
+
+_INT64_MAX = np.uint64(2**63 - 1)
+# Bounds of Python ints that fit in int64
+_INT64_LOW, _INT64_HIGH = -2**63, 2**63 - 1
+
+
+def _median_low(values: np.ndarray) -> float:
+    k = (len(values) - 1) // 2
+    return float(np.partition(values, k)[k])
+
+
+def _parse_floats(text: List[str]) -> np.ndarray:
+    """
+    Parse decimal strings to float64, NaN where invalid.
+    pandas only finds the valid rows: its fast parser is not correctly
+    rounded, while NumPy's string conversion matches float().
+    """
+    out = np.full(len(text), np.nan)
+    valid = pd.to_numeric(pd.Series(text, dtype=object), errors="coerce").notna().to_numpy(dtype=bool)
+    if valid.any():
+        strings = [value for value, ok in zip(text, valid) if ok]
+        try:
+            out[valid] = np.array(strings).astype(np.float64)
+        except ValueError:
+            out[valid] = [float(value) for value in strings]
+    return out
+
+
+def timestamps_to_iso(lines: List[str], unit: Optional[str] = None) -> Tuple[List, np.ndarray, Dict[int, str], str]:
+    """
+    Convert a chunk of epoch timestamps to UTC ISO 8601 strings.
+
+    The unit (s/ms/us/ns) is detected once for the whole chunk, unless given.
+    :return: (outputs, fallback mask, errors by row, unit). Rows flagged in
+             the fallback mask could not be handled here (exotic syntax,
+             NaN/inf, out of range) and must be converted per row with the
+             returned unit; rows in ``errors`` are definitely invalid.
+    """
+    n = len(lines)
+    matrix, lengths, _ = byte_matrix(lines)
+    magnitudes, negative, is_int = parse_integers(matrix, lengths)
+    is_int &= magnitudes <= _INT64_MAX
+    ints = np.where(is_int, magnitudes, 0).astype(np.int64)
+    ints = np.where(negative, -ints, ints)
+
+    floats = np.full(n, np.nan)
+    is_float = ~is_int
+    if is_float.any():
+        floats[is_float] = _parse_floats([lines[i] for i in np.flatnonzero(is_float)])
+
+    parsed = is_int | ~np.isnan(floats)
+    errors = {}
+    fallback = np.zeros(n, dtype=bool)
+    for i in np.flatnonzero(~parsed):
+        line = lines[i]
+        if "_" in line or not line.isascii() or line.lower().lstrip("+-") in ("nan", "inf", "infinity"):
+            # float() accepts underscores, non-ASCII digits and special values
+            fallback[i] = True
+        else:
+            errors[i] = f"could not convert string to float: {line!r}"
+
+    # Integers beyond int64 would lose precision as floats: they are left to
+    # the per-row conversion, like in ``epochs_to_iso``
+    for i in np.flatnonzero(is_float & (np.abs(floats) >= 2.0**63)):
+        if lines[i].strip().lstrip("+-").isdigit():
+            fallback[i] = True
+            floats[i] = np.nan
+
+    outputs, rejected, unit = _epochs_to_iso(ints, is_int, floats, unit)
+    return outputs, fallback | rejected, errors, unit
+
+
+def epochs_to_iso(values: List[Union[int, float]], unit: Optional[str] = None) -> Tuple[List, np.ndarray, str]:
+    """
+    Convert a chunk of epoch timestamps given as numbers (ints and floats)
+    to UTC ISO 8601 strings, like ``timestamps_to_iso`` without parsing.
+    :return: (outputs, fallback mask, unit). Rows flagged in the fallback
+             mask (ints beyond int64, NaN/inf, out of range) must be
+             converted per row with the returned unit.
+    """
+    n = len(values)
+    kinds = set(map(type, values))
+    ints, is_int, floats = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=bool), np.full(n, np.nan)
+    if kinds == {float}:
+        floats = np.array(values, dtype=np.float64)
+    elif kinds == {int} and min(values) >= _INT64_LOW and max(values) <= _INT64_HIGH:
+        ints, is_int = np.array(values, dtype=np.int64), np.ones(n, dtype=bool)
+    else:
+        is_int = np.fromiter((type(value) is int and _INT64_LOW <= value <= _INT64_HIGH for value in values), bool, n)
+        ints = np.fromiter((value if ok else 0 for value, ok in zip(values, is_int.tolist())), np.int64, n)
+        floats = np.fromiter((value if type(value) is float else np.nan for value in values), np.float64, n)
+    outputs, fallback, unit = _epochs_to_iso(ints, is_int, floats, unit)
+    # Ints beyond int64 are left to the per-row conversion
+    return outputs, fallback | ~(is_int | ~np.isnan(floats)), unit
+
+
+def _epochs_to_iso(ints: np.ndarray, is_int: np.ndarray, floats: np.ndarray,
+                   unit: Optional[str]) -> Tuple[List, np.ndarray, str]:
+    """
+    Format timestamps held in ``ints`` where ``is_int`` is set, else in
+    ``floats`` (NaN for rows that are not timestamps, which are skipped).
+    :return: (outputs, mask of the NaN/inf and out of range rows, unit).
+    """
+    n = len(ints)
+    parsed = is_int | ~np.isnan(floats)
+    values = np.where(is_int, ints.astype(np.float64), floats)
+    finite = parsed & np.isfinite(values)
+    fallback = parsed & ~finite
+    if unit is None:
+        unit = unit_for_magnitude(_median_low(np.abs(values[finite]))) if finite.any() else "s"
+
+    us = np.zeros(n, dtype=np.int64)
+    in_range = np.zeros(n, dtype=bool)
+
+    int_rows = is_int
+    if unit == "ns":
+        q = np.floor_divide(ints, 1000)
+        r = ints - q * 1000
+        int_us = q + ((r > 500) | ((r == 500) & (q % 2 == 1)))
+        in_range |= int_rows
+        us = np.where(int_rows, int_us, us)
+        float_values, scale = values / 1000, 1
+    else:
+        scale = UNIT_SCALE[unit]
+        int_ok = int_rows & (ints >= MIN_US // scale) & (ints <= MAX_US // scale)
+        in_range |= int_ok
+        us = np.where(int_ok, ints * scale, us)
+        float_values = values
+
+    float_rows = finite & ~is_int
+    with np.errstate(invalid="ignore", over="ignore"):
+        frac, whole = np.modf(np.where(float_rows, float_values, 0.0))
+        whole_us = whole * scale
+        float_ok = float_rows & (whole_us > MIN_US) & (whole_us < MAX_US)
+        float_us = whole.astype(np.int64) * scale + np.rint(frac * scale).astype(np.int64)
+    in_range |= float_ok
+    us = np.where(float_ok, float_us, us)
+
+    in_range &= (us >= MIN_US) & (us <= MAX_US)
+    fallback |= finite & ~in_range
+
+    ok = in_range & ~fallback
+    strings = np.datetime_as_string(us[ok].astype("datetime64[us]"), unit="us")
+    whole_second = (us[ok] % 10**6) == 0
+    strings = np.where(whole_second, strings.astype("U19"), strings)
+    strings = np.char.add(strings, "+00:00")
+
+    outputs = [None] * n
+    for i, value in zip(np.flatnonzero(ok).tolist(), strings.tolist()):
+        outputs[i] = value
+    return outputs, fallback, unit
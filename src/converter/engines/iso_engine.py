@@ -0,0 +1,164 @@
+import re
+import time
+from collections import Counter
+from typing import List, NamedTuple, Optional, Tuple
+import numpy as np
+from .chars_engine import byte_matrix
+
+# Shape of the ISO 8601 datetimes the fast path handles:
+# YYYY-MM-DD(T| )HH:MM:SS[(.|,)f+][Z|+HH:MM|+HHMM]
+_SHAPE = re.compile(r"\d{4}-\d\d-\d\d[T ]\d\d:\d\d:\d\d(?:([.,])(\d+))?(Z|[+-]\d\d:\d\d|[+-]\d{4})?", re.ASCII)
+
+# Offset kinds, by the length of their suffix
+_OFFSET_LENGTHS = {"": 0, "Z": 1, "+HHMM": 5, "+HH:MM": 6}
+
+# Larger microsecond counts do not convert to float exactly
+_FLOAT_EXACT_US = 2**53
+
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+# Rows sampled to infer the layout of a chunk
+SAMPLE_SIZE = 64
+
+
+def local_time_is_utc() -> bool:
+    return time.timezone == 0 and (not time.daylight or time.altzone == 0)
+
+
+class Layout(NamedTuple):
+    """Fixed layout of the datetimes of a chunk: every field at a known offset."""
+    fraction_mark: str  # "." or ",", "" without fractional seconds
+    fraction_digits: int
+    offset: str  # "", "Z", "+HHMM" or "+HH:MM"
+
+    @property
+    def length(self) -> int:
+        fraction = 1 + self.fraction_digits if self.fraction_digits else 0
+        return 19 + fraction + _OFFSET_LENGTHS[self.offset]
+
+    @classmethod
+    def of(cls, line: str) -> Optional["Layout"]:
+        match = _SHAPE.fullmatch(line)
+        if match is None:
+            return None
+        mark, fraction, offset = match.groups()
+        if offset and offset != "Z":
+            offset = "+HH:MM" if ":" in offset else "+HHMM"
+        return cls(mark or "", len(fraction or ""), offset or "")
+
+
+def infer_layout(lines: List[str], sample_size: int = SAMPLE_SIZE) -> Optional[Layout]:
+    """The most common layout among rows sampled across the chunk, None if no row has one."""
+    step = max(len(lines) // sample_size, 1)
+    layouts = Counter(filter(None, map(Layout.of, lines[::step])))
+    return layouts.most_common(1)[0][0] if layouts else None
+
+
+def _field(columns: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Decimal value of the digits in columns ``start`` to ``stop``."""
+    value = columns[start].astype(np.int64)
+    for column in range(start + 1, stop):
+        value = value * 10 + columns[column]
+    return value
+
+
+def _days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Days since 1970-01-01 of proleptic Gregorian dates (H. Hinnant's algorithm)."""
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _punctuation(layout: Layout) -> List[Tuple[int, bytes]]:
+    """Column and accepted bytes of every non-digit character of the layout."""
+    columns = [(4, b"-"), (7, b"-"), (10, b"T "), (13, b":"), (16, b":")]
+    end = 19
+    if layout.fraction_digits:
+        columns.append((end, layout.fraction_mark.encode()))
+        end += 1 + layout.fraction_digits
+    if layout.offset == "Z":
+        columns.append((end, b"Z"))
+    elif layout.offset:
+        columns.append((end, b"+-"))
+        if layout.offset == "+HH:MM":
+            columns.append((end + 3, b":"))
+    return columns
+
+
+def parse_layout(lines: List[str], layout: Layout) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert the rows of a chunk that have exactly ``layout`` to epoch
+    seconds, reading every field at its fixed offset.
+
+    Naive values are local time, as in datetime.timestamp(); they are only
+    handled here when the local zone is UTC. Like fromisoformat, digits
+    beyond microseconds are truncated.
+    :return: (float64 timestamps, ok mask). Rows that are not ok must be
+             parsed another way.
+    """
+    n = len(lines)
+    width = layout.length
+    matrix, lengths, ascii_mask = byte_matrix(lines)
+    ok = ascii_mask & (lengths == width)
+    if matrix.shape[1] < width or (not layout.offset and not local_time_is_utc()):
+        return np.zeros(n), np.zeros(n, dtype=bool)
+
+    # One contiguous row per column; in ``columns``, digits become their
+    # values and other bytes wrap around to large uint8 values
+    raw = np.ascontiguousarray(matrix[:, :width].T)
+    columns = raw - np.uint8(ord("0"))
+
+    punctuation = _punctuation(layout)
+    for column, accepted in punctuation:
+        found = np.zeros(n, dtype=bool)
+        for byte in accepted:
+            found |= raw[column] == byte
+        ok &= found
+    for column in sorted(set(range(width)) - {column for column, _ in punctuation}):
+        ok &= columns[column] < 10
+
+    year, month, day = _field(columns, 0, 4), _field(columns, 5, 7), _field(columns, 8, 10)
+    hour, minute, second = _field(columns, 11, 13), _field(columns, 14, 16), _field(columns, 17, 19)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_index = np.clip(month - 1, 0, 11)
+    month_days = _DAYS_IN_MONTH[month_index] + (leap & (month == 2))
+    ok &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+    ok &= (hour < 24) & (minute < 60) & (second < 60)
+
+    microseconds = np.zeros(n, dtype=np.int64)
+    if layout.fraction_digits:
+        kept = min(layout.fraction_digits, 6)
+        microseconds = _field(columns, 20, 20 + kept) * 10 ** (6 - kept)
+
+    offset = np.zeros(n, dtype=np.int64)
+    if layout.offset in ("+HHMM", "+HH:MM"):
+        start = width - _OFFSET_LENGTHS[layout.offset]
+        minutes_start = start + (4 if layout.offset == "+HH:MM" else 3)
+        hours, minutes = _field(columns, start + 1, start + 3), _field(columns, minutes_start, minutes_start + 2)
+        ok &= (hours < 24) & (minutes < 60)
+        offset = np.where(raw[start] == ord("-"), -1, 1) * (hours * 60 + minutes)
+
+    seconds = _days_from_civil(year, month, day) * 86400 + hour * 3600 + minute * 60 + second - offset * 60
+    us = seconds * 10**6 + microseconds
+    ok &= np.abs(us) < _FLOAT_EXACT_US
+    return np.where(ok, us, 0) / 1e6, ok
+
+
+def iso_to_timestamps(lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert a chunk of ISO 8601 strings to epoch seconds.
+
+    The dominant layout of the chunk is inferred once from a sample, and
+    the rows having it are parsed with fixed-offset slicing.
+    :return: (float64 timestamps, fallback mask). Rows flagged in the
+             fallback mask (other layouts, invalid, naive in a non-UTC
+             zone, beyond the exact float range) must be converted per row.
+    """
+    layout = infer_layout(lines)
+    if layout is None:
+        return np.zeros(len(lines)), np.ones(len(lines), dtype=bool)
+    values, ok = parse_layout(lines, layout)
+    return values, ~ok
@@ -0,0 +1,100 @@
+import queue
+import threading
+from typing import Callable, Dict, Optional
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+DEFAULT_KEY_TYPE = "rsa2048"
+
+# Key type name -> function generating a private key of that type
+KEY_TYPES: Dict[str, Callable[[], object]] = {
+    "rsa2048": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "rsa3072": lambda: rsa.generate_private_key(public_exponent=65537, key_size=3072),
+    "rsa4096": lambda: rsa.generate_private_key(public_exponent=65537, key_size=4096),
+    "ec-p256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "ec-p384": lambda: ec.generate_private_key(ec.SECP384R1()),
+    "ed25519": ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def generate_key(key_type: str = DEFAULT_KEY_TYPE):
+    """
+    Generate a new private key for a CSR.
+    :raises ValueError: If the key type is unknown.
+    """
+    try:
+        factory = KEY_TYPES[key_type]
+    except KeyError:
+        raise ValueError(f"Unknown key type '{key_type}' (choose from {', '.join(KEY_TYPES)})")
+    return factory()
+
+
+def signing_hash(key) -> Optional[hashes.HashAlgorithm]:
+    """
+    Hash to sign with for a private key: None for Ed25519, which hashes
+    internally, and a digest matching the key strength otherwise.
+    """
+    if isinstance(key, ed25519.Ed25519PrivateKey):
+        return None
+    if isinstance(key, ec.EllipticCurvePrivateKey) and key.curve.key_size > 256:
+        return hashes.SHA384()
+    return hashes.SHA256()
+
+
+class KeyPool:
+    """
+    Private keys of one type generated ahead of time by a background thread.
+
+    Key generation releases the GIL, so the pool fills up while the process
+    serves other requests. ``get`` returns a pooled key at once, or
+    generates one on the spot when the pool has run dry. If generating a
+    key fails in the background, the thread logs the error and stops, and
+    ``get`` raises it to the caller once the pool is empty.
+    """
+    def __init__(self, key_type: str = DEFAULT_KEY_TYPE, size: int = 8, factory: Optional[Callable[[], object]] = None):
+        self.key_type = key_type
+        self.factory = factory or (lambda: generate_key(key_type))
+        self._keys: "queue.Queue" = queue.Queue(maxsize=size)
+        self._stopped = threading.Event()
+        self.error: Optional[Exception] = None
+        self._thread: Optional[threading.Thread] = threading.Thread(target=self._fill, name="key-pool", daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        while not self._stopped.is_set():
+            try:
+                key = self.factory()
+            except Exception as e:
+                logger.error(f"Key pool stopped: generating a {self.key_type} key failed: {e}")
+                self.error = e
+                self._stopped.set()
+                return
+            while not self._stopped.is_set():
+                try:
+                    self._keys.put(key, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def get(self):
+        """Take a key from the pool, generating one if none is ready."""
+        try:
+            return self._keys.get_nowait()
+        except queue.Empty:
+            if self.error is not None:
+                raise self.error
+            return self.factory()
+
+    def available(self) -> int:
+        """Number of keys ready to be taken."""
+        return self._keys.qsize()
+
+    def close(self):
+        """Stop generating keys. Keys already in the pool can still be taken."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,124 @@
+import datetime
+import math
+import re
+import statistics
+import sys
+from itertools import repeat
+from typing import Iterable, Optional, Union
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# datetime.min / datetime.max as microseconds since the epoch
+MIN_US = -62135596800 * 10**6
+MAX_US = 253402300800 * 10**6 - 1
+
+# Microseconds per unit; nanoseconds are divided down instead.
+UNIT_SCALE = {"s": 10**6, "ms": 10**3, "us": 1}
+
+# Upper magnitude bound of each unit. 1e11 s is the year 5138, so any
+# larger "seconds" value in practice is a finer unit.
+UNIT_BOUNDS = ((1e11, "s"), (1e14, "ms"), (1e17, "us"))
+
+
+def unit_for_magnitude(magnitude: float) -> str:
+    """Guess the unit of an epoch timestamp from its absolute value."""
+    for bound, unit in UNIT_BOUNDS:
+        if magnitude < bound:
+            return unit
+    return "ns"
+
+
+def detect_unit(values: Iterable[float], counts: Optional[Iterable[int]] = None) -> str:
+    """
+    Guess the unit shared by a chunk of timestamps from their median magnitude.
+    :param counts: Number of occurrences of each value, when they are deduplicated.
+    """
+    magnitudes = []
+    for value, count in zip(values, counts if counts is not None else repeat(1)):
+        try:
+            value = float(value)
+        except OverflowError:
+            continue
+        if math.isfinite(value):
+            magnitudes.append((abs(value), count))
+    if not magnitudes:
+        return "s"
+    if counts is None:
+        return unit_for_magnitude(statistics.median_low(magnitude for magnitude, _ in magnitudes))
+    # Low median of the values repeated ``count`` times each
+    magnitudes.sort()
+    middle = (sum(count for _, count in magnitudes) - 1) // 2
+    seen = 0
+    for magnitude, count in magnitudes:
+        seen += count
+        if seen > middle:
+            return unit_for_magnitude(magnitude)
+
+
+def parse_timestamp(text: str) -> Union[int, float]:
+    """Parse an epoch timestamp, keeping integers exact."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def to_microseconds(value: Union[int, float], unit: str) -> int:
+    """
+    Convert a timestamp in ``unit`` to integer microseconds since the epoch.
+    Fractions round half to even, like datetime.fromtimestamp.
+    """
+    if unit == "ns":
+        if isinstance(value, int):
+            q, r = divmod(value, 1000)
+            return q + (r > 500 or (r == 500 and q % 2 == 1))
+        value, unit = value / 1000, "us"
+    scale = UNIT_SCALE[unit]
+    if isinstance(value, int):
+        return value * scale
+    frac, whole = math.modf(value)
+    return int(whole) * scale + round(frac * scale)
+
+
+def format_utc(microseconds: int) -> str:
+    """ISO 8601 string of a UTC instant, as datetime.isoformat renders it."""
+    return (EPOCH + datetime.timedelta(microseconds=microseconds)).isoformat()
+
+
+# Before 3.11, fromisoformat rejects 'Z', comma fractions, fractions other
+# than 3 or 6 digits and offsets without a colon
+_STRICT_FROMISOFORMAT = sys.version_info < (3, 11)
+_ISO_VARIANTS = re.compile(r"(?:[.,](\d+))?(Z|[+-]\d\d:?\d\d)?$", re.ASCII)
+
+
+def _normalize_iso(text: str) -> str:
+    match = _ISO_VARIANTS.search(text, 19)
+    if match is None or match.start() != 19:
+        return text
+    fraction, offset = match.groups()
+    normalized = text[:19]
+    if fraction:
+        normalized += "." + fraction[:6].ljust(6, "0")
+    if offset == "Z":
+        normalized += "+00:00"
+    elif offset:
+        normalized += offset if ":" in offset else f"{offset[:3]}:{offset[3:]}"
+    return normalized
+
+
+def parse_iso(text: str) -> datetime.datetime:
+    """
+    Parse an ISO 8601 datetime like datetime.fromisoformat on Python 3.11,
+    which also accepts 'Z', comma fractions and offsets without a colon.
+    """
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        if _STRICT_FROMISOFORMAT:
+            normalized = _normalize_iso(text)
+            if normalized != text:
+                try:
+                    return datetime.datetime.fromisoformat(normalized)
+                except ValueError:
+                    pass
+        raise  # The error about the original text
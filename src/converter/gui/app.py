@@ -3,14 +3,24 @@ from tkinter import ttk, filedialog
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from ..core.arguments import InterfaceBuilder, ArgumentType
+from ..core.batch import BatchConverter
 from ..core.exceptions import ConverterError
+from ..core.registry import ConverterRegistry
+from ..core.results import ResultSink
 from ..utils.logger import setup_logger
-from threading import Thread
-import io
-import sys
+from .jobs import ConversionJob
+from .store import ResultStore
+from .views import ResultView
 
 logger = setup_logger()
 
+# Path argument types and the GUIBuilder method picking their value
+PATH_BROWSERS = {
+    ArgumentType.FILE_SAVE: "_browse_save",
+    ArgumentType.FILE_OPEN: "_browse_open",
+    ArgumentType.DIRECTORY: "_browse_directory",
+}
+
 class GUIBuilder(InterfaceBuilder):
     """
     Builds the UI form for a specific converter.
@@ -20,9 +30,11 @@ class GUIBuilder(InterfaceBuilder):
         self.parent = parent
         self.entries = {} # Store entry widgets by arg name
         self.vars = {}    # Store variables
+        self.exclusive = {} # Arguments of exclusive groups, by name
 
     def build_form(self):
         """Generates widgets based on collected arguments."""
+        self.exclusive = {arg.name: arg for group in self.groups if group.exclusive for arg in group.arguments}
 
         for group in self.groups:
             if group.exclusive:
@@ -112,10 +124,12 @@ class GUIBuilder(InterfaceBuilder):
             entry_data['widget'] = txt
             entry_data['type'] = 'text'
 
-        elif arg.type == ArgumentType.FILE_SAVE:
+        elif arg.type in PATH_BROWSERS:
+            # File paths are passed on as typed: the converter streams the
+            # file itself, its content never goes through a Tk widget
             var = tk.StringVar()
             entry_data['var'] = var
-            entry_data['type'] = 'file_save'
+            entry_data['type'] = arg.type.name.lower()
 
             frame_inner = tb.Frame(container)
             frame_inner.pack(side=LEFT, fill=X, expand=True)
@@ -123,11 +137,20 @@ class GUIBuilder(InterfaceBuilder):
             ent = tb.Entry(frame_inner, textvariable=var)
             ent.pack(side=LEFT, fill=X, expand=True, padx=5)
 
-            btn = tb.Button(frame_inner, text="Browse", command=lambda: self._browse_save(var))
+            browse = getattr(self, PATH_BROWSERS[arg.type])
+            btn = tb.Button(frame_inner, text="Browse", command=lambda: browse(var))
             btn.pack(side=LEFT, padx=5)
 
             entry_data['widget'] = ent
 
+        elif arg.choices:
+            var = tk.StringVar(value=arg.default or arg.choices[0])
+            entry_data['var'] = var
+            entry_data['type'] = 'string'
+            combo = tb.Combobox(container, textvariable=var, values=arg.choices, state="readonly")
+            combo.pack(side=LEFT, fill=X, expand=True, padx=5)
+            entry_data['widget'] = combo
+
         else:
             # Default STRING
             var = tk.StringVar()
@@ -142,30 +165,31 @@ class GUIBuilder(InterfaceBuilder):
         if filename:
             var.set(filename)
 
+    def _browse_open(self, var):
+        filename = filedialog.askopenfilename()
+        if filename:
+            var.set(filename)
+
+    def _browse_directory(self, var):
+        dirname = filedialog.askdirectory()
+        if dirname:
+            var.set(dirname)
+
     def _update_visibility(self):
         # For exclusive groups, show/enable only the selected input
         selected = getattr(self, 'mode_var', None)
         if selected:
             val = selected.get()
-            for name, data in self.entries.items():
-                # Re-check exclusive membership
-                is_exclusive_arg = False
-                for group in self.groups:
-                    if group.exclusive:
-                         for arg in group.arguments:
-                             if arg.name == name:
-                                 is_exclusive_arg = True
-                                 break
-
-                if is_exclusive_arg:
-                    if name == val:
-                        # Only pack if it has content (i.e. not a flag in exclusive mode which has no extra widget)
-                        if data['arg'].type != ArgumentType.FLAG:
-                            data['container'].pack(fill=X, padx=10, pady=5)
-                        else:
-                            data['container'].pack_forget() # Hide container for flag (radio button is enough)
+            for name in self.exclusive:
+                data = self.entries[name]
+                if name == val:
+                    # Only pack if it has content (i.e. not a flag in exclusive mode which has no extra widget)
+                    if data['arg'].type != ArgumentType.FLAG:
+                        data['container'].pack(fill=X, padx=10, pady=5)
                     else:
-                        data['container'].pack_forget()
+                        data['container'].pack_forget() # Hide container for flag (radio button is enough)
+                else:
+                    data['container'].pack_forget()
 
     def get_values(self):
         values = {}
@@ -180,25 +204,11 @@ class GUIBuilder(InterfaceBuilder):
 
         selected = getattr(self, 'mode_var', None)
 
-        exclusive_arg_names = []
-        for group in self.groups:
-            if group.exclusive:
-                for arg in group.arguments:
-                    exclusive_arg_names.append(arg.name)
-
         if selected:
             active_name = selected.get()
             # If the selected mode is a flag, set it to True
             # If it's a widget, get its value
-
-            # Find the arg definition
-            active_arg = None
-            for group in self.groups:
-                if group.exclusive:
-                    for arg in group.arguments:
-                        if arg.name == active_name:
-                            active_arg = arg
-                            break
+            active_arg = self.exclusive.get(active_name)
 
             if active_arg and active_arg.type == ArgumentType.FLAG:
                 values[active_name] = True
@@ -206,59 +216,197 @@ class GUIBuilder(InterfaceBuilder):
                 values[active_name] = get_val(active_name, self.entries[active_name])
 
         for name, data in self.entries.items():
-            if name not in exclusive_arg_names:
+            if name not in self.exclusive:
                 val = get_val(name, data)
                 if val:
                     values[name] = val
 
         return values
 
+    def line_count(self, values):
+        """Number of input lines typed into the text fields among ``values``, or None if there are none."""
+        counts = [values[name].count("\n") + 1 for name, data in self.entries.items()
+                  if data.get('type') == 'text' and values.get(name)]
+        return sum(counts) or None
+
+class TextWidgetSink(ResultSink):
+    """
+    Appends rendered result batches to a text widget.
+    """
+    def __init__(self, widget, render):
+        self.widget = widget
+        self.render = render
+
+    def write(self, batch):
+        self.widget.insert(END, self.render(batch))
+
 class ConverterTab(tb.Frame):
-    def __init__(self, parent, converter_cls):
+    #: Milliseconds between two checks for results of a running conversion
+    POLL_INTERVAL = 50
+
+    #: Rows rendered in the Text tab; Tk slows down badly on larger texts
+    TEXT_LIMIT = 10000
+
+    def __init__(self, parent, info):
         super().__init__(parent)
-        self.converter = converter_cls()
+        self.info = info
+        self._converter = None
         self.builder = GUIBuilder(self)
+        self.job = None
 
         # Title/Description
-        lbl_title = tb.Label(self, text=self.converter.name.upper(), font=("Helvetica", 16, "bold"), bootstyle="primary")
+        lbl_title = tb.Label(self, text=info.name.upper(), font=("Helvetica", 16, "bold"), bootstyle="primary")
         lbl_title.pack(pady=(20, 10))
 
-        lbl_help = tb.Label(self, text=self.converter.help, font=("Helvetica", 10))
+        lbl_help = tb.Label(self, text=info.help, font=("Helvetica", 10))
         lbl_help.pack(pady=(0, 20))
 
-        self.converter.configure_args(self.builder)
+        # The form comes from the cached argument spec; the converter module
+        # is only imported for the first conversion
+        info.build_args(self.builder)
         self.builder.build_form()
 
-        # Convert Button
-        btn_convert = tb.Button(self, text="Convert / Execute", bootstyle="success", command=self.on_convert)
-        btn_convert.pack(pady=20)
+        # Convert / Cancel Buttons
+        frame_actions = tb.Frame(self)
+        frame_actions.pack(pady=20)
+
+        self.btn_convert = tb.Button(frame_actions, text="Convert / Execute", bootstyle="success", command=self.on_convert)
+        self.btn_convert.pack(side=LEFT, padx=5)
+
+        self.btn_cancel = tb.Button(frame_actions, text="Cancel", bootstyle="danger", command=self.on_cancel, state=DISABLED)
+        self.btn_cancel.pack(side=LEFT, padx=5)
 
-        # Output Area
+        # Progress
+        frame_progress = tb.Frame(self)
+        frame_progress.pack(fill=X, padx=10)
+
+        self.progress = tb.Progressbar(frame_progress, bootstyle="success-striped")
+        self.progress.pack(side=LEFT, fill=X, expand=True, padx=5)
+
+        self.lbl_status = tb.Label(frame_progress, text="", width=24)
+        self.lbl_status.pack(side=LEFT, padx=5)
+
+        # Output Area: a grid showing only the rows on screen, and the
+        # rendered text of the first rows
         lbl_out = tb.Label(self, text="Output:", font=("Helvetica", 12, "bold"))
         lbl_out.pack(anchor=W, padx=10)
 
-        self.txt_output = tb.Text(self, height=10)
-        self.txt_output.pack(fill=BOTH, expand=True, padx=10, pady=5)
+        self.outputs = tb.Notebook(self)
+        self.outputs.pack(fill=BOTH, expand=True, padx=10, pady=5)
+
+        self.view = ResultView(self.outputs, ResultStore())
+        self.outputs.add(self.view, text="Table")
+
+        self.txt_output = tb.Text(self.outputs, height=10)
+        self.outputs.add(self.txt_output, text="Text")
+        self.outputs.bind("<<NotebookTabChanged>>", lambda e: self._update_text())
+        self._text_rows = 0
+
+    @property
+    def converter(self):
+        if self._converter is None:
+            self._converter = ConverterRegistry.get_converter(self.info.name)()
+            self.text_sink = TextWidgetSink(self.txt_output, self._converter.render)
+            # Batch converters can produce millions of rows: show them in the grid
+            if not isinstance(self._converter, BatchConverter):
+                self.outputs.select(self.txt_output)
+        return self._converter
 
     def on_convert(self):
+        if self.job is not None:
+            return
         kwargs = self.builder.get_values()
-
-        capture = io.StringIO()
-        original_stdout = sys.stdout
-        sys.stdout = capture
+        self._clear_output()
 
         try:
-            self.converter.convert(**kwargs)
-            result = capture.getvalue()
-            self.txt_output.delete("1.0", END)
-            self.txt_output.insert(END, result)
-        except Exception as e:
-            self.txt_output.delete("1.0", END)
-            self.txt_output.insert(END, f"Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            sys.stdout = original_stdout
+            converter = self.converter
+            exports = converter.export_sinks(kwargs)
+        except ConverterError as e:
+            self._show_error(e)
+            return
+
+        self.exports = exports
+        self.total = self.builder.line_count(kwargs)
+        if self.total:
+            self.progress.configure(mode="determinate", maximum=self.total, value=0)
+        else:
+            self.progress.configure(mode="indeterminate")
+            self.progress.start()
+
+        self.btn_convert.configure(state=DISABLED)
+        self.btn_cancel.configure(state=NORMAL)
+        self.lbl_status.configure(text="Converting...")
+        self.job = ConversionJob(converter, kwargs, exports).start()
+        self.after(self.POLL_INTERVAL, self._poll)
+
+    def on_cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.btn_cancel.configure(state=DISABLED)
+            self.lbl_status.configure(text="Cancelling...")
+
+    def _poll(self):
+        job = self.job
+        batches = job.poll()
+        for batch in batches:
+            self.view.store.append(batch)
+        if batches:
+            self.view.refresh()
+            self._update_text()
+        if self.total:
+            self.progress.configure(value=min(job.rows, self.total))
+        if not job.done:
+            if not job.cancelled:
+                self.lbl_status.configure(text=f"{job.rows:,} rows")
+            self.after(self.POLL_INTERVAL, self._poll)
+            return
+        self._finish(job)
+
+    def _finish(self, job):
+        self.job = None
+        self.progress.stop()
+        self.btn_convert.configure(state=NORMAL)
+        self.btn_cancel.configure(state=DISABLED)
+
+        if job.error is not None:
+            self._show_error(job.error)
+            self.lbl_status.configure(text="Failed")
+            logger.error("Conversion failed", exc_info=job.error)
+            return
+        if job.cancelled and not any(export.written for export in self.exports):
+            self.lbl_status.configure(text=f"Cancelled after {job.rows:,} rows")
+            for export in self.exports:
+                self.txt_output.insert(END, f"\nCancelled: incomplete export to {export.path} was discarded\n")
+            return
+
+        self.lbl_status.configure(text=f"Done: {job.rows:,} rows")
+        for export in self.exports:
+            if export.written:
+                self.txt_output.insert(END, f"\nSuccessfully exported to {export.path}\n")
+
+    def _clear_output(self):
+        self.view.store = ResultStore()
+        self.view.reset()
+        self.txt_output.delete("1.0", END)
+        self._text_rows = 0
+
+    def _show_error(self, error):
+        self._clear_output()
+        self.txt_output.insert(END, f"Error: {str(error)}")
+        self.outputs.select(self.txt_output)
+
+    def _update_text(self):
+        """Render rows not shown yet in the Text tab, up to TEXT_LIMIT rows, once the tab is visible."""
+        if self.outputs.select() != str(self.txt_output):
+            return
+        store = self.view.store
+        if self._text_rows >= min(len(store), self.TEXT_LIMIT):
+            return
+        for batch in store.slice(self._text_rows, self.TEXT_LIMIT):
+            self.text_sink.write(batch)
+            self._text_rows += len(batch)
+        if self._text_rows >= self.TEXT_LIMIT:
+            self.txt_output.insert(END, f"\n[Only the first {self.TEXT_LIMIT:,} rows are shown here, see the Table tab for all of them]\n")
 
 
 class App(tb.Window):
@@ -267,17 +415,32 @@ class App(tb.Window):
         self.title("Universal Converter Platform")
         self.geometry("900x700")
 
-        tabs = tb.Notebook(self)
-        tabs.pack(fill=BOTH, expand=True, padx=10, pady=10)
+        self.tabs = tb.Notebook(self)
+        self.tabs.pack(fill=BOTH, expand=True, padx=10, pady=10)
 
-        from ..core.registry import ConverterRegistry
-        from ..converters import datetime_converter, number_converter, csr_converter
+        from .. import converters  # Registers the built-in converters
 
-        converters = ConverterRegistry.get_converters()
+        # Tabs start as empty frames and get their form when first selected
+        self.pending = {}
+        for name, info in ConverterRegistry.get_metadata().items():
+            frame = tb.Frame(self.tabs)
+            self.tabs.add(frame, text=name.upper())
+            self.pending[str(frame)] = (frame, info)
+        self.tabs.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._on_tab_changed(None)
 
-        for name, cls in converters.items():
-            tab = ConverterTab(tabs, cls)
-            tabs.add(tab, text=name.upper())
+    def _on_tab_changed(self, event):
+        entry = self.pending.pop(self.tabs.select(), None)
+        if entry is None:
+            return
+        frame, info = entry
+        try:
+            tab = ConverterTab(frame, info)
+        except Exception as e:
+            logger.exception(f"Failed to build the {info.name} tab: {e}")
+            tb.Label(frame, text=f"Error: {e}").pack(pady=20)
+            return
+        tab.pack(fill=BOTH, expand=True)
 
 def main():
     app = App()
@@ -0,0 +1,102 @@
+import queue
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from ..core.results import ResultBatch, ResultSink
+
+# Marks the end of a job in its queue
+_DONE = object()
+
+
+class ConversionJob:
+    """
+    Runs a conversion on a background thread.
+
+    Batches are written to ``sinks`` (file exports) on the worker thread and
+    queued for the UI thread, which collects them with ``poll``. The queue is
+    bounded, so a UI that falls behind slows the conversion down instead of
+    buffering all results. The exports of a job that is cancelled or fails
+    are discarded rather than left incomplete. Tk is not thread-safe:
+    nothing here touches widgets.
+    """
+    def __init__(self, converter, kwargs: Dict[str, Any], sinks: Iterable[ResultSink] = (), max_queued: int = 16):
+        self.converter = converter
+        self.kwargs = kwargs
+        self.sinks = list(sinks)
+        self.rows = 0
+        #: Exception that ended the conversion, if any.
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self._queue: "queue.Queue[Any]" = queue.Queue(max_queued)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def start(self) -> "ConversionJob":
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """
+        Stop after the batch being converted; results already queued are still
+        delivered, and partial exports are discarded.
+        """
+        self._cancel.set()
+
+    def join(self, timeout: Optional[float] = None):
+        self._thread.join(timeout)
+
+    def _put(self, item: Any):
+        # Give up waiting for room once cancelled, the UI may have stopped polling
+        while not self._cancel.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self):
+        batches = iter(())
+        finished = False
+        try:
+            batches = self.converter.convert_batch(**self.kwargs)
+            for batch in batches:
+                for sink in self.sinks:
+                    sink.write(batch)
+                self._put(batch)
+                if self._cancel.is_set():
+                    break
+            else:
+                finished = True
+        except BaseException as e:
+            self.error = e
+        finally:
+            if hasattr(batches, "close"):
+                batches.close()
+            for sink in self.sinks:
+                try:
+                    if finished and self.error is None:
+                        sink.close()
+                    else:
+                        sink.discard()
+                except Exception as e:
+                    self.error = self.error or e
+            # The end marker must get through even after a cancel
+            self._queue.put(_DONE)
+
+    def poll(self, limit: int = 8) -> List[ResultBatch]:
+        """Take up to ``limit`` finished batches without blocking; sets ``done`` once the job ended."""
+        batches = []
+        while len(batches) < limit and not self.done:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                self.done = True
+            else:
+                self.rows += len(item)
+                batches.append(item)
+        return batches
@@ -0,0 +1,39 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Optional
+from ..core.buffer import ResultBuffer
+from ..core.results import ResultBatch, Row
+
+
+class ResultStore(ResultBuffer):
+    """
+    ResultBuffer of the GUI: adds range reads for views showing a window of
+    rows, and navigation between failed rows.
+    """
+    def __init__(self):
+        super().__init__()
+        self._failed: List[int] = []
+
+    def append(self, batch: ResultBatch):
+        start = len(self)
+        super().append(batch)
+        if batch.error_count:
+            self._failed.extend(start + i for i, error in enumerate(batch.errors) if error)
+
+    def rows_between(self, start: int, stop: int) -> Iterator[Row]:
+        """Rows from ``start`` to ``stop`` (excluded)."""
+        for batch in self.slice(start, stop):
+            yield from batch.rows()
+
+    def next_error(self, after: int) -> Optional[int]:
+        """First failed row after row ``after``, wrapping around to the top; None without errors."""
+        if not self._failed:
+            return None
+        position = bisect_right(self._failed, after)
+        return self._failed[position % len(self._failed)]
+
+    def previous_error(self, before: int) -> Optional[int]:
+        """Last failed row before row ``before``, wrapping around to the bottom; None without errors."""
+        if not self._failed:
+            return None
+        position = bisect_left(self._failed, before) - 1
+        return self._failed[position % len(self._failed)]
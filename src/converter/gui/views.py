@@ -0,0 +1,222 @@
+from tkinter import ttk, filedialog
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+from ..core.exceptions import ConverterError
+from ..core.exporters import open_export
+from .store import ResultStore
+
+#: Row height assumed until the Treeview style says otherwise
+DEFAULT_ROW_HEIGHT = 20
+
+
+class ResultView(tb.Frame):
+    """
+    Input/Output/Error grid over a ResultStore.
+
+    Only the rows on screen exist as Treeview items: scrolling refills the
+    same items from the store, so the cost of showing results does not grow
+    with their number. Selection is a range of row numbers kept here, as the
+    items do not outlive a scroll.
+    """
+    def __init__(self, parent, store: ResultStore):
+        super().__init__(parent)
+        self.store = store
+        self.top = 0
+        self.anchor = None
+        self.cursor = None
+        self._items = []
+        self._columns = None
+
+        toolbar = tb.Frame(self)
+        toolbar.pack(fill=X, pady=(0, 5))
+        tb.Button(toolbar, text="Next error", bootstyle="danger-outline", command=self.next_error).pack(side=LEFT, padx=2)
+        tb.Button(toolbar, text="Previous error", bootstyle="danger-outline", command=self.previous_error).pack(side=LEFT, padx=2)
+        tb.Button(toolbar, text="Copy", bootstyle="secondary-outline", command=self.copy_selection).pack(side=LEFT, padx=2)
+        tb.Button(toolbar, text="Export selection", bootstyle="secondary-outline", command=self.export_selection).pack(side=LEFT, padx=2)
+        self.lbl_info = tb.Label(toolbar, text="")
+        self.lbl_info.pack(side=RIGHT, padx=5)
+
+        body = tb.Frame(self)
+        body.pack(fill=BOTH, expand=True)
+        self.tree = ttk.Treeview(body, show="headings", selectmode="none")
+        self.scrollbar = tb.Scrollbar(body, orient=VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.tree.pack(side=LEFT, fill=BOTH, expand=True)
+        self.tree.tag_configure("error", foreground="#e74c3c")
+        self.tree.tag_configure("selected", background="#375a7f")
+
+        self._set_columns(None)
+        self.tree.bind("<Configure>", lambda e: self.refresh())
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<Shift-Button-1>", lambda e: self._on_click(e, extend=True))
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units"))
+        self.tree.bind("<Up>", lambda e: self._move_cursor(-1, e))
+        self.tree.bind("<Down>", lambda e: self._move_cursor(1, e))
+        self.tree.bind("<Prior>", lambda e: self._move_cursor(-self._visible_count(), e))
+        self.tree.bind("<Next>", lambda e: self._move_cursor(self._visible_count(), e))
+        self.tree.bind("<Control-a>", lambda e: self.select(0, len(self.store) - 1))
+        self.tree.bind("<Control-c>", lambda e: self.copy_selection())
+
+    # Layout
+
+    def _set_columns(self, columns):
+        self._columns = columns
+        names = ["Input", "Output", "Error"] if columns is None else ["Input"] + columns + ["Error"]
+        self.tree.configure(columns=names)
+        for name in names:
+            self.tree.heading(name, text=name, anchor=W)
+            self.tree.column(name, anchor=W, stretch=True, width=120)
+
+    def _row_height(self) -> int:
+        height = ttk.Style().lookup("Treeview", "rowheight")
+        try:
+            return int(height) or DEFAULT_ROW_HEIGHT
+        except (TypeError, ValueError):
+            return DEFAULT_ROW_HEIGHT
+
+    def _visible_count(self) -> int:
+        # Leaves room for the heading row
+        return max(1, self.tree.winfo_height() // self._row_height() - 1)
+
+    def _values(self, row):
+        line, output, error = row
+        if self._columns is None:
+            return (line, "" if error or output is None else output, error or "")
+        values = [output.get(column, "") if output else "" for column in self._columns]
+        return tuple([line] + values + [error or ""])
+
+    def refresh(self):
+        """Fill the items on screen from the store; call after appending batches."""
+        if self.store.columns != self._columns:
+            self._set_columns(self.store.columns)
+
+        count = self._visible_count()
+        while len(self._items) < count:
+            self._items.append(self.tree.insert("", END, values=()))
+        while len(self._items) > count:
+            self.tree.delete(self._items.pop())
+
+        total = len(self.store)
+        self.top = max(0, min(self.top, total - count))
+        selection = self.selection()
+        rows = list(self.store.rows_between(self.top, self.top + count))
+        for offset, item in enumerate(self._items):
+            if offset >= len(rows):
+                self.tree.item(item, values=(), tags=())
+                continue
+            index = self.top + offset
+            tags = []
+            if rows[offset][2]:
+                tags.append("error")
+            if selection and selection[0] <= index <= selection[1]:
+                tags.append("selected")
+            self.tree.item(item, values=self._values(rows[offset]), tags=tags)
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + count) / total))
+        else:
+            self.scrollbar.set(0, 1)
+        errors = self.store.error_count
+        self.lbl_info.configure(text=f"{total:,} rows, {errors:,} errors" if errors else f"{total:,} rows")
+
+    def reset(self):
+        self.top = 0
+        self.anchor = self.cursor = None
+        self.refresh()
+
+    # Scrolling
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.top = int(float(value) * len(self.store))
+            self.refresh()
+        else:
+            self.scroll(int(value), unit)
+
+    def scroll(self, amount: int, unit: str = "units"):
+        step = self._visible_count() if unit == "pages" else 1
+        self.top += amount * step
+        self.refresh()
+
+    def show(self, index: int):
+        """Scroll so that a row is on screen."""
+        count = self._visible_count()
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + count:
+            self.top = index - count + 1
+        self.refresh()
+
+    # Selection
+
+    def selection(self):
+        """Selected rows as an inclusive (first, last) range, or None."""
+        if self.anchor is None:
+            return None
+        return min(self.anchor, self.cursor), max(self.anchor, self.cursor)
+
+    def select(self, first: int, last: int):
+        if len(self.store):
+            self.anchor, self.cursor = first, last
+            self.show(last)
+        return "break"
+
+    def _on_click(self, event, extend=False):
+        self.tree.focus_set()
+        item = self.tree.identify_row(event.y)
+        if item not in self._items:
+            return "break"
+        index = self.top + self._items.index(item)
+        if index < len(self.store):
+            self.select(self.anchor if extend and self.anchor is not None else index, index)
+        return "break"
+
+    def _move_cursor(self, amount: int, event):
+        if self.cursor is None:
+            return self.select(self.top, self.top)
+        cursor = max(0, min(len(self.store) - 1, self.cursor + amount))
+        extend = bool(event.state & 0x0001)  # Shift held
+        return self.select(self.anchor if extend else cursor, cursor)
+
+    def next_error(self):
+        index = self.store.next_error(self.cursor if self.cursor is not None else -1)
+        if index is not None:
+            self.select(index, index)
+
+    def previous_error(self):
+        index = self.store.previous_error(self.cursor if self.cursor is not None else len(self.store))
+        if index is not None:
+            self.select(index, index)
+
+    # Copy / export
+
+    def copy_selection(self):
+        """Copy the selected rows to the clipboard as tab-separated text."""
+        selection = self.selection()
+        if selection is None:
+            return "break"
+        lines = ["\t".join(str(value) for value in self._values(row))
+                 for row in self.store.rows_between(selection[0], selection[1] + 1)]
+        self.clipboard_clear()
+        self.clipboard_append("\n".join(lines))
+        return "break"
+
+    def export_selection(self):
+        """Export the selected rows (all rows without a selection) to a file."""
+        selection = self.selection() or (0, len(self.store) - 1)
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Parquet", "*.parquet")])
+        if not filename:
+            return
+        try:
+            sink = open_export(filename)
+            for batch in self.store.slice(selection[0], selection[1] + 1):
+                sink.write(batch)
+            sink.close()
+        except ConverterError as e:
+            self.lbl_info.configure(text=f"Error: {e}")
+            return
+        self.lbl_info.configure(text=f"Exported {selection[1] - selection[0] + 1:,} rows to {filename}")
@@ -0,0 +1,10 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Tests must neither replay results cached by earlier runs nor leave any
+# in the user's cache directory
+_CACHE = tempfile.mkdtemp(prefix="converter-tests-")
+os.environ["UNIVERSAL_CONVERTER_CACHE_DIR"] = _CACHE
+atexit.register(shutil.rmtree, _CACHE, True)
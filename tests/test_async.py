@@ -0,0 +1,92 @@
+import unittest
+import asyncio
+import os
+import tempfile
+import time
+from converter.converters.number_converter import NumberConverter
+from converter.core.aio import AsyncLimiter
+
+
+class SlowNumberConverter(NumberConverter):
+    """Number converter with small chunks that each block for a while."""
+    chunk_size = 10
+
+    def convert_chunk(self, mode, chunk):
+        time.sleep(0.01)
+        return super().convert_chunk(mode, chunk)
+
+
+class TestAsyncAPI(unittest.TestCase):
+    def test_aconvert(self):
+        batch = asyncio.run(NumberConverter().aconvert(hex2dec="0xA\nzz\n0xFF"))
+        self.assertEqual(batch.outputs, [10, None, 255])
+        self.assertEqual(batch.error_count, 1)
+
+    def test_abatches_and_export(self):
+        async def collect(converter, **kwargs):
+            return [batch.outputs async for batch in converter.abatches(**kwargs)]
+
+        converter = NumberConverter()
+        converter.chunk_size = 2
+        self.assertEqual(asyncio.run(collect(converter, dec2hex="1\n2\n3")), [["0x1", "0x2"], ["0x3"]])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.csv")
+            asyncio.run(converter.aconvert(dec2hex="1\n2\n3", export=path))
+            with open(path) as f:
+                self.assertEqual(f.read().split(), ["Input,Output", "1,0x1", "2,0x2", "3,0x3"])
+
+    def test_event_loop_stays_responsive(self):
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.005)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            converter = SlowNumberConverter()
+            converter.limiter = AsyncLimiter(max_concurrency=1)
+            await converter.aconvert(hex2dec="\n".join(["0x1"] * 200))
+            task.cancel()
+            return ticks
+
+        self.assertGreater(asyncio.run(main()), 10)
+
+    def test_large_batch_does_not_starve_others(self):
+        async def main():
+            limiter = AsyncLimiter(max_concurrency=1)
+            big, small = SlowNumberConverter(), SlowNumberConverter()
+            big.limiter = small.limiter = limiter
+            big_task = asyncio.create_task(big.aconvert(hex2dec="\n".join(["0x1"] * 500)))
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            await small.aconvert(hex2dec="0x2")
+            waited = time.perf_counter() - start
+            self.assertFalse(big_task.done())
+            await big_task
+            return waited
+
+        # The big conversion needs ~0.5 s; the small one only waits for a chunk or two
+        self.assertLess(asyncio.run(main()), 0.2)
+
+    def test_batches_are_produced_on_demand(self):
+        produced = []
+
+        class Tracking(SlowNumberConverter):
+            def convert_chunk(self, mode, chunk):
+                produced.append(len(chunk))
+                return super().convert_chunk(mode, chunk)
+
+        async def main():
+            async for _ in Tracking().abatches(hex2dec="\n".join(["0x1"] * 100)):
+                break
+
+        asyncio.run(main())
+        self.assertEqual(len(produced), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
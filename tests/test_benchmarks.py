@@ -0,0 +1,35 @@
+import unittest
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+RUN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "run.py")
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def _run(self, *args):
+        return subprocess.run([sys.executable, RUN, "--filter", "number.hex2dec", "--max-size", "1000",
+                               "--min-time", "0"] + list(args), capture_output=True, text=True)
+
+    def test_results_and_baseline_comparison(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = os.path.join(tmp, "baseline.json")
+            proc = self._run("--output", baseline)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            with open(baseline) as f:
+                saved = json.load(f)
+            self.assertEqual([(r["name"], r["size"], r["rows"]) for r in saved["results"]],
+                             [("number.hex2dec", 1000, 1000)])
+            self.assertIn("python", saved["machine"])
+
+            self.assertEqual(self._run("--compare", baseline, "--threshold", "100").returncode, 0)
+            # Any slowdown at all counts as a regression with a negative threshold
+            proc = self._run("--compare", baseline, "--threshold", "-1")
+            self.assertEqual(proc.returncode, 1)
+            self.assertIn("REGRESSION", proc.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
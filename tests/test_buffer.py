@@ -0,0 +1,98 @@
+import unittest
+import os
+import tempfile
+import tracemalloc
+from array import array
+from converter.converters.number_converter import NumberConverter
+from converter.core.buffer import BufferSink, ResultBuffer
+from converter.core.exporters import CsvSink
+from converter.core.results import ResultBatch
+
+
+def build(batches):
+    buffer = ResultBuffer()
+    for batch in batches:
+        buffer.append(batch)
+    return buffer
+
+
+class TestResultBuffer(unittest.TestCase):
+    def setUp(self):
+        self.batches = [
+            ResultBatch(["0xA", "zz", "0xFFFFFFFFFFFFFFFF"], [10, None, 2 ** 64 - 1], [None, "bad", None]),
+            ResultBatch(["1.5", "x"], [1.5, None], [None, "bad x"]),
+            ResultBatch(["a", "b"], ["A", "B"], [None, None]),
+            ResultBatch(["m"], [{"k": 1}], [None]),
+        ]
+        self.buffer = build(self.batches)
+
+    def test_round_trip(self):
+        expected = [row for batch in self.batches for row in batch.rows()]
+        self.assertEqual(len(self.buffer), len(expected))
+        self.assertEqual(list(self.buffer.rows()), expected)
+        self.assertEqual([self.buffer.row(i) for i in range(len(expected))], expected)
+        self.assertEqual(self.buffer.outputs, [row[1] for row in expected])
+        self.assertEqual(self.buffer.inputs[-1], "m")
+        self.assertEqual(self.buffer.error_count, 2)
+        self.assertEqual(self.buffer.errors.count(None), len(expected) - 2)
+        self.assertEqual(list(self.buffer.error_rows()), [1, 4])
+        self.assertEqual([b.inputs for b in self.buffer.slice(2, 6)], [["0xFFFFFFFFFFFFFFFF"], ["1.5", "x"], ["a"]])
+
+    def test_typed_storage(self):
+        segments = self.buffer._segments
+        self.assertIsInstance(segments[0].outputs, array)
+        self.assertEqual(segments[1].outputs.typecode, "d")
+        self.assertEqual(segments[2].outputs.text, "AB")
+        self.assertIsInstance(segments[3].outputs, list)
+
+    def test_sinks_read_buffer(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.csv")
+            sink = CsvSink(path)
+            sink.write(self.buffer)
+            sink.close()
+            with open(path) as f:
+                self.assertEqual(f.read().splitlines()[:3], ["Input,Output", "0xA,10", "zz,Error"])
+
+    def test_table_round_trip(self):
+        batches = [
+            ResultBatch(["0xA", ""], [10, None], [None, None], table={"id": [1, 2], "Hex": ["0xA", None]},
+                        output_column="Hex_hex2dec"),
+            ResultBatch(["zz"], [None], ["bad"], table={"id": [3], "Hex": ["zz"]}, output_column="Hex_hex2dec"),
+        ]
+        buffer = build(batches)
+        self.assertEqual(list(buffer.slice(0, 3)), batches)
+        self.assertEqual(buffer.table["id"], [1, 2, 3])
+        self.assertEqual(buffer.table["Hex"][-1], "zz")
+        self.assertEqual(buffer.output_column, "Hex_hex2dec")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.csv")
+            sink = CsvSink(path)
+            sink.write(buffer)
+            sink.close()
+            with open(path) as f:
+                self.assertEqual(f.read().splitlines(), ["id,Hex,Hex_hex2dec", "1,0xA,10", "2,,", "3,zz,Error"])
+
+    def test_memory(self):
+        text = "\n".join(hex(i * 7919) if i % 100 else "zz" for i in range(200000))
+        converter = NumberConverter()
+
+        tracemalloc.start()
+        kept = list(converter.convert_batch(hex2dec=text))
+        lists = tracemalloc.get_traced_memory()[0]
+        del kept
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        sink = BufferSink()
+        converter.run([sink], hex2dec=text)
+        compact = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        self.assertEqual(len(sink.buffer), 200000)
+        self.assertLess(compact * 4, lists)
+
+
+if __name__ == "__main__":
+    unittest.main()
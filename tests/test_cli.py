@@ -0,0 +1,83 @@
+import unittest
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# One cold CLI invocation per subcommand, and the heavy modules it is
+# allowed to import. Start-up times are measured by benchmarks/run.py.
+COLD_START = {
+    "number": (["number", "--hex2dec", "0xA"], set()),
+    "datetime": (["datetime", "--to-dt", "1672574400"], set()),
+    "csr": (["csr", "--generate-csr", "--cn", "example.com"], {"cryptography"}),
+}
+HEAVY_MODULES = {"pandas", "numpy", "cryptography", "openpyxl"}
+CONVERTER_MODULES = {"converter.converters.number_converter", "converter.converters.datetime_converter",
+                     "converter.converters.csr_converter"}
+
+# With parse_only, the command stops once its arguments are parsed
+PROBE = """
+import json, sys
+from converter import cli
+if {parse_only!r}:
+    cli.forward = lambda *args, **kwargs: None
+    cli._run = lambda *args, **kwargs: None
+cli.main({argv!r})
+loaded = sorted(m for m in {watched!r} if m in sys.modules)
+print("LOADED=" + json.dumps(loaded))
+"""
+
+class TestCLIColdStart(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache = tempfile.TemporaryDirectory()
+        cls.env = dict(os.environ, UNIVERSAL_CONVERTER_CACHE_DIR=cls.cache.name)
+        # Warm the plugin manifest, as any installed CLI would have
+        subprocess.run([sys.executable, "-m", "converter", "--help"], capture_output=True, env=cls.env)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache.cleanup()
+
+    def _run(self, argv, parse_only=False):
+        code = PROBE.format(argv=argv, parse_only=parse_only, watched=sorted(HEAVY_MODULES | CONVERTER_MODULES))
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=self.env)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        marker = [l for l in proc.stdout.splitlines() if l.startswith("LOADED=")][-1]
+        return set(json.loads(marker[len("LOADED="):]))
+
+    def test_parsing_imports_no_converter(self):
+        for name, (argv, _) in COLD_START.items():
+            with self.subTest(command=name):
+                self.assertEqual(self._run(argv, parse_only=True), set())
+
+    def test_subcommands_only_import_their_dependencies(self):
+        for name, (argv, allowed) in COLD_START.items():
+            with self.subTest(command=name):
+                loaded = self._run(argv)
+                self.assertEqual(loaded & HEAVY_MODULES - allowed, set())
+                self.assertEqual(loaded & CONVERTER_MODULES, {f"converter.converters.{name}_converter"})
+
+    def test_help_lists_all_converters(self):
+        proc = subprocess.run([sys.executable, "-m", "converter", "--help"], capture_output=True, text=True, env=self.env)
+        self.assertEqual(proc.returncode, 0)
+        for name in COLD_START:
+            self.assertIn(name, proc.stdout)
+
+    def test_subcommand_help_served_from_manifest(self):
+        code = (
+            "import sys\n"
+            "from converter import cli\n"
+            "try:\n"
+            "    cli.main(['csr', '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('LOADED=' + str('converter.converters.csr_converter' in sys.modules))\n"
+        )
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=self.env)
+        self.assertIn("--generate-csr", proc.stdout)
+        self.assertIn("LOADED=False", proc.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
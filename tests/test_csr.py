@@ -21,6 +21,153 @@ class TestCSRConverter(unittest.TestCase):
         finally:
             sys.stdout = sys.__stdout__
 
+    def test_decode_csr_batch(self):
+        generated = next(self.converter.convert_batch(generate_csr=True, cn="example.com", c="US"))
+        self.assertEqual(generated.inputs, ["private_key", "csr"])
+
+        pem = generated.outputs[1]
+        decoded = next(self.converter.convert_batch(decode_csr=pem))
+        fields = dict(zip(decoded.inputs, decoded.outputs))
+        self.assertEqual(fields["subject.commonName"], "example.com")
+        self.assertEqual(fields["subject.countryName"], "US")
+        self.assertIn("No Subject Alternative Names found.", self.converter.render(decoded))
+
+    def test_key_types(self):
+        from cryptography import x509
+        expected = {"ec-p256": "sha256", "ec-p384": "sha384", "ed25519": None}
+        for key_type, hash_name in expected.items():
+            with self.subTest(key_type=key_type):
+                batch = next(self.converter.convert_batch(generate_csr=True, cn="example.com", key_type=key_type))
+                csr = x509.load_pem_x509_csr(batch.outputs[1].encode())
+                self.assertTrue(csr.is_signature_valid)
+                algorithm = csr.signature_hash_algorithm
+                self.assertEqual(algorithm.name if algorithm else None, hash_name)
+
+        with self.assertRaises(ValidationError):
+            self.converter.convert(generate_csr=True, cn="example.com", key_type="dsa")
+
+    def test_generate_bulk(self):
+        import json
+        import os
+        import tempfile
+        from converter.core.results import CollectSink
+        with tempfile.TemporaryDirectory() as tmp:
+            subjects = os.path.join(tmp, "subjects.jsonl")
+            with open(subjects, "w") as f:
+                f.write(json.dumps({"cn": "a.example.com", "o": "Acme"}) + "\n")
+                f.write(json.dumps({"o": "No CN"}) + "\n")
+                f.write(json.dumps({"cn": "a.example.com"}) + "\n")
+
+            sink = CollectSink()
+            out = os.path.join(tmp, "out")
+            self.converter.run([sink], generate_bulk=subjects, output_dir=out)
+            rows = list(sink.rows())
+
+            self.assertEqual([row[1] for row in rows],
+                             [os.path.join(out, "a.example.com.csr"), None, os.path.join(out, "a.example.com_2.csr")])
+            self.assertIsNotNone(rows[1][2])
+            self.assertEqual(sorted(os.listdir(out)),
+                             ["a.example.com.csr", "a.example.com.key", "a.example.com_2.csr", "a.example.com_2.key"])
+            with open(rows[0][1]) as f:
+                decoded = next(self.converter.convert_batch(decode_csr=f.read()))
+            self.assertIn("subject.organizationName", decoded.inputs)
+
+    def test_generate_bulk_never_overwrites(self):
+        import json
+        import os
+        import tempfile
+        from unittest import mock
+        from converter.converters import csr_converter
+        from converter.core.results import CollectSink
+        with tempfile.TemporaryDirectory() as tmp:
+            subjects = os.path.join(tmp, "subjects.jsonl")
+            with open(subjects, "w") as f:
+                f.write(json.dumps({"cn": "b.example.com"}) + "\n")
+            out = os.path.join(tmp, "out")
+            os.makedirs(out)
+            with open(os.path.join(out, "b.example.com.csr"), "w") as f:
+                f.write("existing")
+
+            sink = CollectSink()
+            self.converter.run([sink], generate_bulk=subjects, output_dir=out)
+            self.assertEqual(next(sink.rows())[1], os.path.join(out, "b.example.com_2.csr"))
+            with open(os.path.join(out, "b.example.com.csr")) as f:
+                self.assertEqual(f.read(), "existing")
+
+            # A CSR created after the name was chosen is reported, and the key is not left behind
+            key_path, csr_path = os.path.join(out, "c.key"), os.path.join(out, "c.csr")
+            with open(csr_path, "w") as f:
+                f.write("existing")
+            with mock.patch.object(csr_converter, "generate_key", return_value=None), \
+                    mock.patch.object(csr_converter, "build_csr"):
+                error = csr_converter._write_pair(({"cn": "c"}, "rsa2048", key_path, csr_path))
+            self.assertIn("Not overwriting existing file", error)
+            self.assertFalse(os.path.exists(key_path))
+
+    def test_decode_bulk(self):
+        import csv
+        import os
+        import tempfile
+        from io import StringIO
+        import sys
+        pems = [next(self.converter.convert_batch(generate_csr=True, cn=f"host{i}.example.com", key_type="ec-p256")).outputs[1]
+                for i in range(3)]
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "csrs")
+            os.mkdir(source)
+            with open(os.path.join(source, "bundle.pem"), "w") as f:
+                f.write("comment\n" + pems[0] + pems[1])
+            with open(os.path.join(source, "single.csr"), "w") as f:
+                f.write(pems[2])
+            with open(os.path.join(source, "broken.pem"), "w") as f:
+                f.write("not a csr")
+
+            export = os.path.join(tmp, "audit.csv")
+            sys.stdout = StringIO()
+            try:
+                self.converter.convert(decode_bulk=source, workers="2", export=export)
+            finally:
+                sys.stdout = sys.__stdout__
+
+            with open(export, newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([row["Input"] for row in rows], [
+                os.path.join(source, "broken.pem#1"),
+                os.path.join(source, "bundle.pem#1"),
+                os.path.join(source, "bundle.pem#2"),
+                os.path.join(source, "single.csr#1"),
+            ])
+            self.assertTrue(rows[0]["Error"].startswith("Invalid CSR"))
+            self.assertEqual([row["common_name"] for row in rows[1:]], [f"host{i}.example.com" for i in range(3)])
+            self.assertEqual(rows[1]["key_type"], "EC secp256r1")
+            self.assertEqual(rows[1]["key_size"], "256")
+            self.assertEqual(rows[1]["signature_algorithm"], "ecdsa-with-SHA256")
+            self.assertEqual(len(rows[1]["fingerprint_sha256"]), 64)
+
+    def test_key_pool(self):
+        from converter.engines.keys import KeyPool
+        keys = iter(range(100))
+        pool = KeyPool(size=2, factory=lambda: next(keys))
+        try:
+            self.assertIn(pool.get(), range(100))
+        finally:
+            pool.close()
+
+    def test_key_pool_factory_error(self):
+        from converter.engines.keys import KeyPool
+
+        def factory():
+            raise ValueError("no entropy")
+        with self.assertLogs("converter", "ERROR"):
+            pool = KeyPool(size=2, factory=factory)
+            pool._thread.join(5)
+        try:
+            self.assertFalse(pool._thread.is_alive())
+            with self.assertRaisesRegex(ValueError, "no entropy"):
+                pool.get()
+        finally:
+            pool.close()
+
     def test_generate_csr_missing_cn(self):
         with self.assertRaises(ValidationError):
             self.converter.convert(generate_csr=True, c="US") # Missing CN
@@ -0,0 +1,181 @@
+import unittest
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from converter import converters  # Registers the built-in converters
+from converter.client import forward, send_messages
+from converter.core.metrics import METRICS
+from converter.core.registry import ConverterRegistry
+from converter.daemon import ConverterDaemon, HTTPServer, UnixServer, write_token
+
+
+class TestDaemon(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "daemon.sock")
+        cls.daemon = ConverterDaemon()
+        cls.server = UnixServer(cls.path, cls.daemon)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.spec = ConverterRegistry.get_metadata()["number"].spec
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp.cleanup()
+
+    def _forward(self, command, args):
+        out = io.StringIO()
+        spec = ConverterRegistry.get_metadata()[command].spec
+        reply = forward(command, args, spec, out, path=self.path)
+        return reply, out.getvalue()
+
+    def test_forward(self):
+        reply, output = self._forward("number", {"hex2dec": "0xA\n0xB"})
+        self.assertEqual(reply, {"status": 0})
+        self.assertEqual(output, "10\n11\n")
+
+    def test_error_status(self):
+        reply, _ = self._forward("number", {"hex2dec": "0xA", "workers": "x"})
+        self.assertEqual(reply["status"], 1)
+        self.assertIn("error", reply)
+
+    def test_no_daemon(self):
+        reply = forward("number", {"hex2dec": "0xA"}, self.spec, io.StringIO(),
+                        path=os.path.join(self.tmp.name, "missing.sock"))
+        self.assertIsNone(reply)
+
+    def test_stdin_runs_locally(self):
+        reply, _ = self._forward("number", {"hex2dec": None, "input": "-"})
+        self.assertIsNone(reply)
+
+    def test_other_time_zone_runs_locally(self):
+        naive = {"to_ts": "2023-01-01T12:00:00", "to_dt": None}
+        reply, _ = self._forward("datetime", naive)
+        self.assertEqual(reply, {"status": 0})
+        with mock.patch("converter.client.local_zone", return_value=["Asia/Tokyo", ["JST", "JST"], -32400, -32400]):
+            reply, output = self._forward("datetime", naive)
+            self.assertIsNone(reply)
+            self.assertEqual(output, "")
+            # Results that do not depend on the zone are still forwarded
+            reply, _ = self._forward("datetime", {"to_ts": None, "to_dt": "1672574400"})
+            self.assertEqual(reply, {"status": 0})
+
+    def test_relative_paths_resolved(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "in.txt"), "w") as f:
+                f.write("0xA\n0xB\n")
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                reply, _ = self._forward("number", {"hex2dec": "", "input": "in.txt", "export": "out.csv", "no_cache": True})
+            finally:
+                os.chdir(cwd)
+            self.assertEqual(reply["status"], 0)
+            with open(os.path.join(tmp, "out.csv")) as f:
+                self.assertIn("0xB,11", f.read())
+
+    def test_rows_and_request_lists(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            request = [
+                {"command": "number", "args": {"hex2dec": "0xA\nzz"}, "format": "rows"},
+                {"command": "nope"},
+            ]
+            messages = list(send_messages(sock, request))
+        self.assertEqual(messages[0]["rows"], [["0xA", 10, None], ["zz", None, "Error parsing 'zz'"]])
+        self.assertEqual(messages[1], {"status": 0})
+        self.assertEqual(messages[2]["status"], 1)
+
+    def test_unknown_commands_not_in_metrics(self):
+        METRICS.reset()
+        replies = []
+        self.daemon.handle({"command": "nope\"}"}, replies.append)
+        self.assertEqual(replies[0]["status"], 1)
+        labels = {e["converter"] for e in METRICS.snapshot()["stages"]} | {c["converter"] for c in METRICS.snapshot()["counters"]}
+        self.assertEqual(labels, {""})
+
+    def test_concurrent_requests(self):
+        def run(i):
+            return self._forward("number", {"dec2hex": "\n".join(str(n) for n in range(i, i + 100))})
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(run, range(16)))
+        for i, (reply, output) in enumerate(results):
+            self.assertEqual(reply["status"], 0)
+            self.assertEqual(output.split(), [hex(n) for n in range(i, i + 100)])
+
+    def test_warm_latency(self):
+        # A persistent connection pays neither interpreter start-up nor imports
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.path)
+            request = {"command": "number", "args": {"hex2dec": "0xA"}}
+            list(send_messages(sock, request))
+            start = time.perf_counter()
+            for _ in range(50):
+                list(send_messages(sock, request))
+            per_call = (time.perf_counter() - start) / 50
+        self.assertLess(per_call, 0.05)
+
+
+class TestHTTPDaemon(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(0, ConverterDaemon())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.headers = {"Authorization": f"Bearer {self.server.token}", "Content-Type": "application/json"}
+
+    def _request(self, path, body=None, **headers):
+        headers = {name: value for name, value in dict(self.headers, **headers).items() if value is not None}
+        request = urllib.request.Request(self.url + path, data=body, headers=headers)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def test_post_convert(self):
+        status, body = self._request("/convert", json.dumps({"command": "number", "args": {"dec2hex": "255"}}).encode())
+        self.assertEqual((status, json.loads(body)), (200, {"text": "0xff\n", "status": 0}))
+        status, metrics = self._request("/metrics")
+        self.assertEqual(status, 200)
+        self.assertIn('converter_stage_calls_total{stage="request",converter="number"}', metrics.decode())
+
+    def test_refuses_browsers_and_other_clients(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export = os.path.join(tmp, "pwned.xlsx")
+            body = json.dumps({"command": "number", "args": {"hex2dec": "0x41", "export_excel": export}}).encode()
+            for headers, code in (({"Origin": "http://evil.example"}, 403),
+                                  ({"Host": "evil.example"}, 403),
+                                  ({"Content-Type": "text/plain"}, 415),
+                                  ({"Authorization": None}, 401),
+                                  ({"Authorization": "Bearer wrong"}, 401)):
+                with self.subTest(headers=headers):
+                    self.assertEqual(self._request("/convert", body, **headers)[0], code)
+            self.assertFalse(os.path.exists(export))
+        self.assertEqual(self._request("/metrics", Authorization=None)[0], 401)
+        self.assertEqual(self._request("/metrics", Host="localhost:1234")[0], 200)
+
+    def test_token_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "daemon.token")
+            write_token(path, "secret")
+            write_token(path, self.server.token)
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+            with open(path) as f:
+                self.assertEqual(f.read(), self.server.token)
+
+
+if __name__ == "__main__":
+    unittest.main()
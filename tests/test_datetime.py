@@ -1,7 +1,9 @@
 import unittest
+import datetime
 import os
+import random
 import pandas as pd
-from converter.converters.datetime_converter import DatetimeConverter
+from converter.converters.datetime_converter import DatetimeConverter, VECTOR_THRESHOLD
 
 class TestDatetimeConverter(unittest.TestCase):
     def setUp(self):
@@ -45,5 +47,91 @@ class TestDatetimeConverter(unittest.TestCase):
              if os.path.exists(output_file):
                  os.remove(output_file)
 
+    def test_stream_from_stdin(self):
+        from io import StringIO
+        import sys
+        captured_output = StringIO()
+        sys.stdin = StringIO("1672574400\n\nnot-a-ts\n")
+        sys.stdout = captured_output
+
+        try:
+            self.converter.convert(to_dt="-")
+            lines = captured_output.getvalue().splitlines()
+            self.assertEqual(lines[0], "2023-01-01T12:00:00+00:00")
+            self.assertTrue(lines[1].startswith("Error parsing 'not-a-ts'"))
+            self.assertEqual(len(lines), 2)
+        finally:
+            sys.stdin = sys.__stdin__
+            sys.stdout = sys.__stdout__
+
+    def test_vectorized_to_dt_matches_row_path(self):
+        rng = random.Random(4)
+        lines = [repr(rng.uniform(-2e9, 4e9)) for _ in range(3000)]
+        lines += [str(rng.randint(-2 * 10**9, 4 * 10**9)) for _ in range(3000)]
+        lines += ["abc", "nan", "inf", "1_000", "1e400", "253402300800"]
+
+        vectorized = self.converter.convert_chunk("to_dt", lines)
+        per_row = self.converter.convert_each(lines, lambda line: self.converter._to_dt(line, "s"))
+        self.assertEqual(vectorized, per_row)
+
+        # Seconds still convert exactly like datetime.fromtimestamp
+        for line, output in zip(vectorized.inputs[:100], vectorized.outputs):
+            expected = datetime.datetime.fromtimestamp(float(line), tz=datetime.timezone.utc).isoformat()
+            self.assertEqual(output, expected)
+
+        # Nanoseconds, with integers beyond int64 that floats cannot hold exactly
+        ns_lines = [str(rng.randint(10**18, 10**19 - 1)) for _ in range(VECTOR_THRESHOLD)]
+        ns_lines += ["10553985595646326938", "-9223372036854775809", "+18446744073709551616", "99999999999999999999"]
+        ns_vectorized = self.converter.convert_chunk("to_dt", ns_lines)
+        ns_per_row = self.converter.convert_each(ns_lines, lambda line: self.converter._to_dt(line, "ns"))
+        self.assertEqual(ns_vectorized, ns_per_row)
+
+    def test_timestamp_unit_detection(self):
+        base = 1672574400
+        for scale in (1, 10**3, 10**6, 10**9):
+            for count in (1, VECTOR_THRESHOLD):
+                with self.subTest(scale=scale, rows=count):
+                    batch = self.converter.convert_chunk("to_dt", [str(base * scale)] * count)
+                    self.assertEqual(batch.outputs[0], "2023-01-01T12:00:00+00:00")
+
+    def test_vectorized_to_ts_matches_row_path(self):
+        rng = random.Random(5)
+        epoch = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+        lines = []
+        for _ in range(VECTOR_THRESHOLD):
+            moment = epoch + datetime.timedelta(microseconds=rng.randint(-10**16, 10**16))
+            zone = datetime.timezone(datetime.timedelta(minutes=rng.choice([0, 60, -330])))
+            lines.append(moment.astimezone(zone).isoformat(sep=rng.choice("T ")))
+        lines += ["2023-01-01T12:00:00.", "2023-02-30T00:00:00+00:00", "2023-W01-1", "garbage"]
+
+        vectorized = self.converter.convert_chunk("to_ts", lines)
+        per_row = self.converter.convert_each(lines, self.converter._to_ts)
+        self.assertEqual(vectorized, per_row)
+
+    def test_iso_variants(self):
+        variants = ["2023-01-01T12:00:00Z", "2023-01-01 12:00:00+00:00", "2023-01-01T12:00:00,000Z",
+                    "2023-01-01T13:00:00+0100", "2023-01-01T12:00:00.0000009+00:00"]
+        for lines in ([line] * VECTOR_THRESHOLD for line in variants):
+            with self.subTest(line=lines[0]):
+                self.assertEqual(self.converter.convert_chunk("to_ts", lines).outputs[0], 1672574400.0)
+                self.assertEqual(self.converter.convert_chunk("to_ts", lines[:1]).outputs[0], 1672574400.0)
+
+    def test_iso_layout_inference(self):
+        from converter.engines.iso_engine import Layout, infer_layout, iso_to_timestamps
+
+        lines = ["2023-01-01 12:00:00,5Z"] * 90 + ["2023-01-01T12:00:00+00:00"] * 10
+        self.assertEqual(infer_layout(lines), Layout(",", 1, "Z"))
+        values, fallback = iso_to_timestamps(lines + ["2023-01-01 12:00:00,5Q", "2023-02-29 12:00:00,5Z"])
+        self.assertEqual(values[0], 1672574400.5)
+        self.assertEqual(fallback.tolist(), [False] * 90 + [True] * 12)
+        self.assertIsNone(infer_layout(["garbage", "2023-W01-1"]))
+
+    def test_iso_normalization(self):
+        from converter.engines.timeunits import _normalize_iso
+
+        self.assertEqual(_normalize_iso("2023-01-01 12:00:00,5Z"), "2023-01-01 12:00:00.500000+00:00")
+        self.assertEqual(_normalize_iso("2023-01-01T12:00:00.1234567-0530"), "2023-01-01T12:00:00.123456-05:30")
+        self.assertEqual(_normalize_iso("2023-01-01"), "2023-01-01")
+
 if __name__ == '__main__':
     unittest.main()
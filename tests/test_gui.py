@@ -0,0 +1,108 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from converter.converters.number_converter import NumberConverter
+from converter.core.exporters import CsvSink
+from converter.core.results import ResultBatch
+from converter.gui.jobs import ConversionJob
+from converter.gui.store import ResultStore
+
+
+def drain(job, timeout=5.0):
+    batches = []
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        batches.extend(job.poll())
+        time.sleep(0.001)
+    return batches
+
+
+class TestConversionJob(unittest.TestCase):
+    def test_runs_in_background(self):
+        converter = NumberConverter()
+        converter.chunk_size = 2
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.csv")
+            job = ConversionJob(converter, {"hex2dec": "0xA\n0xB\nzz"}, [CsvSink(path)]).start()
+            batches = drain(job)
+            self.assertTrue(job.done)
+            self.assertIsNone(job.error)
+            self.assertEqual(job.rows, 3)
+            self.assertEqual([b.outputs for b in batches], [[10, 11], [None]])
+            with open(path) as f:
+                self.assertEqual(len(f.read().split()), 4)
+
+    def test_cancel(self):
+        started = threading.Event()
+
+        class Slow(NumberConverter):
+            chunk_size = 1
+
+            def convert_chunk(self, mode, chunk):
+                started.set()
+                time.sleep(0.01)
+                return super().convert_chunk(mode, chunk)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.csv")
+            export = CsvSink(path)
+            job = ConversionJob(Slow(), {"hex2dec": "\n".join(["0x1"] * 1000)}, [export]).start()
+            started.wait(5)
+            job.cancel()
+            drain(job)
+            self.assertTrue(job.done)
+            self.assertTrue(job.cancelled)
+            self.assertLess(job.rows, 1000)
+            # The incomplete export is removed, not closed
+            self.assertFalse(export.written)
+            self.assertFalse(os.path.exists(path))
+
+    def test_error(self):
+        job = ConversionJob(NumberConverter(), {"hex2dec": "0xA", "workers": "x"}).start()
+        drain(job)
+        self.assertTrue(job.done)
+        self.assertIsNotNone(job.error)
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ResultStore()
+        self.store.append(ResultBatch(["a", "b", "c"], [1, None, 3], [None, "bad b", None]))
+        self.store.append(ResultBatch(["d"], [4], [None]))
+        self.store.append(ResultBatch(["e", "f"], [None, 6], ["bad e", None]))
+
+    def test_rows(self):
+        self.assertEqual(len(self.store), 6)
+        self.assertEqual(self.store.row(3), ("d", 4, None))
+        self.assertEqual([row[0] for row in self.store.rows_between(1, 5)], ["b", "c", "d", "e"])
+        self.assertEqual([len(b) for b in self.store.slice(2, 6)], [1, 1, 2])
+        self.assertEqual(list(self.store.rows_between(5, 10)), [("f", 6, None)])
+        with self.assertRaises(IndexError):
+            self.store.row(6)
+
+    def test_errors(self):
+        self.assertEqual(self.store.error_count, 2)
+        self.assertEqual(self.store.next_error(-1), 1)
+        self.assertEqual(self.store.next_error(1), 4)
+        self.assertEqual(self.store.next_error(4), 1)
+        self.assertEqual(self.store.previous_error(4), 1)
+        self.assertEqual(self.store.previous_error(1), 4)
+        self.assertIsNone(ResultStore().next_error(0))
+
+
+class TestGUIImports(unittest.TestCase):
+    def test_app_defers_converter_imports(self):
+        code = ("import sys, converter.gui.app; "
+                "print(sorted(m for m in ('pandas', 'numpy', 'cryptography', 'openpyxl', 'asyncio', "
+                "'converter.converters.datetime_converter') if m in sys.modules))")
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
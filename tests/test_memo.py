@@ -0,0 +1,58 @@
+import unittest
+import pickle
+import random
+from converter.converters.datetime_converter import DatetimeConverter, VECTOR_THRESHOLD
+from converter.core.memo import LRUCache
+from converter.core.metrics import METRICS
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction_and_counts(self):
+        cache = LRUCache(2)
+        cache.update({"a": 1, "b": 2})
+        self.assertEqual(cache.lookup(["a", "c"]), ({"a": 1}, ["c"]))
+        cache.update({"c": 3})  # "b" is the least recently used
+        self.assertEqual(cache.lookup(["a", "b", "c"]), ({"a": 1, "c": 3}, ["b"]))
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (3, 2, 2))
+
+
+class TestMemoizedChunks(unittest.TestCase):
+    def setUp(self):
+        self.converter = DatetimeConverter()
+        rng = random.Random(7)
+        seconds = [str(rng.randrange(1600000000, 1700000000)) for _ in range(40)]
+        # A few millisecond values must not change the unit detected from every row
+        self.to_dt = [rng.choice(seconds) for _ in range(VECTOR_THRESHOLD)] + ["1672574400000", "bad"] * 3
+        self.to_ts = [f"2023-01-01T12:00:{rng.randrange(60):02d}Z" for _ in range(300)] + ["bad"]
+
+    def test_same_results_as_whole_chunks(self):
+        for mode, lines in (("to_dt", self.to_dt), ("to_ts", self.to_ts), ("to_dt", self.to_dt[:300])):
+            with self.subTest(mode=mode, rows=len(lines)):
+                self.assertEqual(self.converter.process_chunk(mode, lines), self.converter.convert_chunk(mode, lines))
+
+    def test_cache_across_chunks(self):
+        METRICS.reset()
+        self.converter.process_chunk("to_ts", self.to_ts)
+        cache = self.converter.memo_cache("to_ts", {})
+        distinct = len(set(self.to_ts))
+        self.assertEqual((cache.hits, cache.misses), (0, distinct))
+
+        self.converter.process_chunk("to_ts", self.to_ts[::-1])
+        self.assertEqual((cache.hits, cache.misses), (distinct, distinct))
+        counters = {c["counter"]: c["value"] for c in METRICS.snapshot()["counters"] if c["converter"] == "datetime"}
+        self.assertEqual(counters, {"cache_hits": distinct, "cache_misses": distinct,
+                                    "duplicate_rows": 2 * (len(self.to_ts) - distinct)})
+
+    def test_distinct_chunks_skip_the_cache(self):
+        lines = [str(1600000000 + i) for i in range(100)]
+        self.converter.process_chunk("to_dt", lines)
+        self.assertNotIn("_memo_caches", self.converter.__dict__)
+
+    def test_pickled_without_caches(self):
+        self.converter.process_chunk("to_ts", self.to_ts)
+        copy = pickle.loads(pickle.dumps(self.converter))
+        self.assertNotIn("_memo_caches", copy.__dict__)
+
+
+if __name__ == "__main__":
+    unittest.main()
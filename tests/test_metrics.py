@@ -0,0 +1,104 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from converter import cli
+from converter.converters.number_converter import NumberConverter
+from converter.core.metrics import METRICS, Metrics
+from converter.core.results import CollectSink
+
+
+class TestMetrics(unittest.TestCase):
+    def test_stages_and_counters(self):
+        metrics = Metrics()
+        with metrics.stage("parse", "number"):
+            pass
+        self.assertEqual(list(metrics.timed(iter([1, 2]), "convert", "number")), [1, 2])
+        metrics.count("rows", 2, "number")
+        metrics.count("rows", 3, "number")
+
+        snapshot = metrics.snapshot()
+        calls = {(e["stage"], e["converter"]): e["calls"] for e in snapshot["stages"]}
+        self.assertEqual(calls, {("parse", "number"): 1, ("convert", "number"): 3})
+        self.assertEqual(snapshot["counters"], [{"counter": "rows", "converter": "number", "value": 5}])
+        self.assertIn("number: 5 rows, 0 errors", metrics.summary())
+
+        text = metrics.prometheus()
+        self.assertIn('converter_stage_calls_total{stage="parse",converter="number"} 1', text)
+        self.assertIn('converter_rows_total{converter="number"} 5', text)
+        if snapshot["peak_rss_bytes"] is not None:
+            self.assertIn("converter_peak_rss_bytes ", text)
+
+    def test_prometheus_values_and_labels(self):
+        metrics = Metrics()
+        metrics.count("rows", 12345678, 'x"}\nevil 1')
+        metrics.count("seconds", 0.25, "number")
+        text = metrics.prometheus()
+        self.assertIn('converter_rows_total{converter="x\\"}\\nevil 1"} 12345678\n', text)
+        self.assertIn('converter_seconds_total{converter="number"} 0.25\n', text)
+        self.assertFalse(any(line.startswith("evil") for line in text.splitlines()))
+
+    def test_timed_closes_iterator(self):
+        closed = []
+
+        def produce():
+            try:
+                yield 1
+                yield 2
+            finally:
+                closed.append(True)
+
+        timed = Metrics().timed(produce(), "convert")
+        next(timed)
+        timed.close()
+        self.assertEqual(closed, [True])
+
+    def test_run_records_rows_and_errors(self):
+        METRICS.reset()
+        NumberConverter().run([CollectSink()], hex2dec="0xA\nzz\n0xB")
+        counters = {(c["counter"], c["converter"]): c["value"] for c in METRICS.snapshot()["counters"]}
+        self.assertEqual(counters[("rows", "number")], 3)
+        self.assertEqual(counters[("errors", "number")], 1)
+        stages = {e["stage"] for e in METRICS.snapshot()["stages"]}
+        self.assertTrue({"convert", "write:CollectSink", "close:CollectSink"} <= stages)
+
+    def test_worker_metrics_merged(self):
+        from converter.converters.datetime_converter import DatetimeConverter
+        converter = DatetimeConverter()
+        converter.chunk_size = 100
+        lines = "\n".join(str(1672574400 + i % 10) for i in range(300))
+
+        counts = {}
+        for workers in ("1", "2"):
+            METRICS.reset()
+            converter.run([CollectSink()], to_dt=lines, workers=workers, no_cache=True)
+            counters = {c["counter"]: c["value"] for c in METRICS.snapshot()["counters"]}
+            counts[workers] = counters["duplicate_rows"], counters["cache_hits"] + counters["cache_misses"]
+        self.assertEqual(counts["2"], counts["1"])
+        self.assertEqual(counts["2"][0], 270)
+
+    def test_cli_profile(self):
+        METRICS.reset()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            err = io.StringIO()
+            with redirect_stdout(io.StringIO()), redirect_stderr(err):
+                cli.main(["--profile", "--profile-out", path, "number", "--hex2dec", "0xA"])
+            self.assertIn("number: 1 rows, 0 errors", err.getvalue())
+            with open(path) as f:
+                stages = {e["stage"] for e in json.load(f)["stages"]}
+        self.assertTrue({"arguments", "import", "convert"} <= stages)
+
+    def test_cli_profile_stats(self):
+        import pstats
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.prof")
+            with redirect_stdout(io.StringIO()):
+                cli.main(["--profile-out", path, "number", "--dec2hex", "10"])
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,14 @@
 import unittest
+import importlib.util
 import os
+import tempfile
+import tracemalloc
 import pandas as pd
 from converter.converters.number_converter import NumberConverter
+from converter.core.results import CollectSink
+from converter.core.exporters import ExcelSink, ParquetSink
+from converter.core.results import ResultBatch
+from converter.core.exceptions import ValidationError
 
 class TestNumberConverter(unittest.TestCase):
     def setUp(self):
@@ -23,6 +30,16 @@ class TestNumberConverter(unittest.TestCase):
         finally:
             sys.stdout = sys.__stdout__
 
+    def test_convert_batch(self):
+        sink = CollectSink()
+        self.converter.run([sink], hex2dec="0xA\nzz\nff")
+        self.assertEqual(list(sink.rows()), [
+            ("0xA", 10, None),
+            ("zz", None, "Error parsing 'zz'"),
+            ("ff", 255, None),
+        ])
+        self.assertEqual(sink.batches[0].error_count, 1)
+
     def test_excel_export(self):
         input_str = "0xA"
         output_file = "test_num_output.xlsx"
@@ -43,5 +60,149 @@ class TestNumberConverter(unittest.TestCase):
              if os.path.exists(output_file):
                  os.remove(output_file)
 
+    def test_workers_match_serial(self):
+        text = "\n".join(["0x1F", "zz", str(2 ** 70), "-10"] * 50)
+        self.converter.chunk_size = 16
+        serial, parallel = CollectSink(), CollectSink()
+        self.converter.run([serial], dec2hex=text)
+        self.converter.run([parallel], dec2hex=text, workers="2")
+        self.assertEqual(len(parallel.batches), len(serial.batches))
+        self.assertEqual(list(parallel.rows()), list(serial.rows()))
+
+        with self.assertRaises(ValidationError):
+            self.converter.run([CollectSink()], dec2hex=text, workers="many")
+
+    def test_export_formats(self):
+        import csv
+        import json
+        from io import StringIO
+        import sys
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "out.csv")
+            jsonl_path = os.path.join(tmp, "out.jsonl")
+            sys.stdout = StringIO()
+            try:
+                self.converter.convert(hex2dec="0xA\nzz", export=csv_path)
+                self.converter.convert(hex2dec="0xA\nzz", export=jsonl_path)
+            finally:
+                sys.stdout = sys.__stdout__
+
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                self.assertEqual(list(csv.reader(f)), [["Input", "Output"], ["0xA", "10"], ["zz", "Error"]])
+            with open(jsonl_path, encoding="utf-8") as f:
+                self.assertEqual([json.loads(line) for line in f],
+                                 [{"Input": "0xA", "Output": 10}, {"Input": "zz", "Output": "Error"}])
+
+            with self.assertRaises(ValidationError):
+                self.converter.convert(hex2dec="0xA", export=os.path.join(tmp, "out.txt"))
+
+    def test_failed_conversion_leaves_no_export(self):
+        from io import StringIO
+
+        class Failing(NumberConverter):
+            chunk_size = 2
+
+            def convert_chunk(self, mode, lines):
+                if "fail" in lines:
+                    raise RuntimeError("conversion failed")
+                return super().convert_chunk(mode, lines)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("out.csv", "out.jsonl", "out.xlsx"):
+                path = os.path.join(tmp, name)
+                with self.subTest(export=name), self.assertRaises(RuntimeError):
+                    Failing().convert_to(StringIO(), hex2dec="0xA\n0xB\nfail", export=path, no_cache=True)
+                self.assertFalse(os.path.exists(path))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_export_widens_columns(self):
+        import pyarrow.parquet as pq
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.parquet")
+            sink = ParquetSink(path)
+            # All errors first, then ints, then an int beyond 64 bits
+            sink.write(ResultBatch(["zz"], [None], ["Error parsing 'zz'"]))
+            sink.write(ResultBatch(["0xA", "0xB"], [10, 11], [None, None]))
+            sink.write(ResultBatch([hex(2**70)], [2**70], [None]))
+            sink.close()
+            table = pq.read_table(path)
+            self.assertEqual(os.listdir(tmp), ["out.parquet"])
+        self.assertEqual(str(table.schema.field("Output").type), "string")
+        self.assertEqual(table.column("Output").to_pylist(), [None, "10", "11", str(2**70)])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.parquet")
+            sink = ParquetSink(path)
+            sink.write(ResultBatch(["zz"], [None], ["Error parsing 'zz'"]))
+            sink.write(ResultBatch(["0xA"], [10], [None]))
+            sink.close()
+            self.assertEqual(pq.read_table(path).column("Output").to_pylist(), [None, 10])
+
+    def test_excel_export_rolls_over_sheets(self):
+        from openpyxl import load_workbook
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.xlsx")
+            sink = ExcelSink(path)
+            sink.max_rows = 3
+            self.converter.run([sink], dec2hex="1\n2\n3\n4\n5")
+
+            workbook = load_workbook(path, read_only=True)
+            sheets = [[row for row in sheet.values] for sheet in workbook.worksheets]
+            workbook.close()
+            self.assertEqual(sheets, [
+                [("Input", "Output"), ("1", "0x1"), ("2", "0x2")],
+                [("Input", "Output"), ("3", "0x3"), ("4", "0x4")],
+                [("Input", "Output"), ("5", "0x5")],
+            ])
+
+    def test_stream_from_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("0xA\n\nzz\n0x10\n")
+        try:
+            from io import StringIO
+            import sys
+            captured_output = StringIO()
+            sys.stdout = captured_output
+            self.converter.convert(hex2dec="-", input=f.name, no_cache=True)
+            self.assertEqual(captured_output.getvalue().splitlines(), ["10", "Error parsing 'zz'", "16"])
+        finally:
+            sys.stdout = sys.__stdout__
+            os.remove(f.name)
+
+    def test_chunk_matches_line_conversion(self):
+        lines = ["0xA", "zz", "ff", str(2 ** 80), "-0x1F", "", "1_0", "-0", "0x", "\u0663", hex(2 ** 70), "12"]
+        for mode in self.converter.modes:
+            expected = []
+            for line in lines:
+                try:
+                    expected.append((line, self.converter.convert_line(mode, line), None))
+                except ValueError:
+                    expected.append((line, None, f"Error parsing '{line}'"))
+            self.assertEqual(list(self.converter.convert_chunk(mode, lines).rows()), expected)
+
+    def _stream_peak_memory(self, rows):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            for i in range(rows):
+                f.write(f"{i:#x}\n")
+        try:
+            import sys
+            sys.stdout = open(os.devnull, "w")
+            tracemalloc.start()
+            self.converter.convert(hex2dec="-", input=f.name, no_cache=True)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak
+        finally:
+            sys.stdout.close()
+            sys.stdout = sys.__stdout__
+            os.remove(f.name)
+
+    def test_stream_memory_is_bounded(self):
+        self.converter.chunk_size = 1000
+        small = self._stream_peak_memory(20000)
+        large = self._stream_peak_memory(200000)
+        # Ten times the input must not mean ten times the memory
+        self.assertLess(large, small * 1.5)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import contextlib
+import io
+import os
+import random
+import tempfile
+from unittest import mock
+from converter import cli
+from converter.converters.datetime_converter import DatetimeConverter, VECTOR_THRESHOLD
+from converter.converters.number_converter import NumberConverter
+from converter.core.exceptions import ConverterError, ValidationError
+from converter.core.pipeline import Pipeline, Stage
+
+
+class TestTypedValues(unittest.TestCase):
+    def test_to_dt_matches_text(self):
+        rng = random.Random(3)
+        converter = DatetimeConverter()
+        for scale, size in ((1, 100), (1000, VECTOR_THRESHOLD), (10**9, VECTOR_THRESHOLD)):
+            values = [rng.randrange(1600000000, 1700000000) * scale for _ in range(size)]
+            values[::7] = [value / scale + rng.random() for value in values[::7]]
+            values[1:3] = [2**70, float("nan")]
+            with self.subTest(scale=scale, size=size):
+                typed = converter.convert_values("to_dt", values)
+                text = converter.convert_chunk("to_dt", list(map(str, values)))
+                self.assertEqual(typed.outputs, text.outputs)
+                self.assertEqual([e is None for e in typed.errors], [e is None for e in text.errors])
+
+    def test_other_values_go_through_text(self):
+        self.assertEqual(NumberConverter().convert_values("dec2hex", [10, 255]).outputs, ["0xa", "0xff"])
+        self.assertEqual(NumberConverter().convert_values("hex2dec", [10, "ff"]).outputs, [16, 255])
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = Pipeline.from_specs(["number:hex2dec", "datetime:to_dt"])
+
+    def test_stages(self):
+        batches = list(self.pipeline.convert_batch(values="0x63b175c0\nzz\n0x63B175FC\n0xffffffffffffffffffff"))
+        batch = batches[0]
+        self.assertEqual(batch.inputs, ["0x63b175c0", "zz", "0x63B175FC", "0xffffffffffffffffffff"])
+        self.assertEqual(batch.outputs[::2], ["2023-01-01T12:00:00+00:00", "2023-01-01T12:01:00+00:00"])
+        # Errors come from the stage where the row failed
+        self.assertEqual(batch.errors[1], "Error parsing 'zz'")
+        self.assertTrue(batch.errors[3].startswith(f"Error parsing '{2**80 - 1}'"))
+
+    def test_input_file_and_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "input.txt")
+            with open(path, "w") as f:
+                f.write("".join(f"{hex(1672574400 + i)}\n" for i in range(250)) + "bad\n")
+            self.pipeline.chunk_size = 100
+            expected = [row for batch in self.pipeline.convert_batch(input=path) for row in batch.rows()]
+            workers = [row for batch in self.pipeline.convert_batch(input=path, workers="2") for row in batch.rows()]
+        self.assertEqual(len(expected), 251)
+        self.assertEqual(workers, expected)
+        self.assertEqual(expected[-2][1], "2023-01-01T12:04:09+00:00")
+
+    def test_invalid_stages(self):
+        for specs in (["number"], ["number:to_dt"], ["csr:decode_csr"], []):
+            with self.subTest(specs=specs), self.assertRaises(ValidationError):
+                Pipeline.from_specs(specs)
+        with self.assertRaises(ConverterError):
+            Pipeline.from_specs(["nothing:here"])
+        self.assertEqual(str(Stage(NumberConverter(), "hex2dec")), "number:hex2dec")
+
+    def test_cli(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), mock.patch("sys.stdin", io.StringIO("0x63b175c0\n")):
+            cli.main(["pipe", "number:hex2dec", "datetime:to_dt"])
+        self.assertEqual(out.getvalue(), "2023-01-01T12:00:00+00:00\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
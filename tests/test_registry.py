@@ -1,7 +1,13 @@
 import unittest
-from converter.core.registry import ConverterRegistry
+import os
+import sys
+import tempfile
+import textwrap
+from converter.core.registry import ConverterRegistry, describe
+from converter.core.manifest import PluginManifest
 from converter.core.base import BaseConverter
-from converter.core.arguments import InterfaceBuilder
+from converter.core.arguments import InterfaceBuilder, ArgumentType
+from converter.core.exceptions import ConverterError
 
 class MockConverter(BaseConverter):
     @property
@@ -15,6 +21,37 @@ class MockConverter(BaseConverter):
     def convert(self, **kwargs):
         pass
 
+class ClassLevelConverter(BaseConverter):
+    name = "classlevel"
+    help = "class level help"
+
+    def __init__(self):
+        raise AssertionError("describe() must not instantiate")
+
+    @classmethod
+    def configure_args(cls, builder: InterfaceBuilder):
+        group = builder.add_group(exclusive=True, required=True)
+        group.add_argument("to_x", type=ArgumentType.TEXT, metavar="VALUE", help="Convert")
+        builder.add_argument("export_excel", type=ArgumentType.FILE_SAVE, help="Export")
+
+    def convert(self, **kwargs):
+        pass
+
+PLUGIN_SOURCE = textwrap.dedent("""
+    from converter.core.base import BaseConverter
+
+    class PluginConverter(BaseConverter):
+        name = "plugin"
+        help = "plugin help"
+
+        @classmethod
+        def configure_args(cls, builder):
+            builder.add_argument("value", help="Value")
+
+        def convert(self, **kwargs):
+            pass
+""")
+
 class TestRegistry(unittest.TestCase):
     def test_registry(self):
         ConverterRegistry.register(MockConverter)
@@ -22,5 +59,100 @@ class TestRegistry(unittest.TestCase):
         self.assertIn("mock", converters)
         self.assertEqual(converters["mock"], MockConverter)
 
+    def test_describe_without_instantiating(self):
+        info = describe(ClassLevelConverter)
+        self.assertEqual(info.name, "classlevel")
+        self.assertEqual(info.help, "class level help")
+
+        rebuilt = info.build_args(InterfaceBuilder())
+        self.assertEqual(rebuilt.groups[0].arguments[0].name, "to_x")
+        self.assertEqual(rebuilt.groups[0].arguments[0].type, ArgumentType.TEXT)
+        self.assertEqual(rebuilt.arguments[0].type, ArgumentType.FILE_SAVE)
+
+    def test_legacy_convert_produces_batches(self):
+        import asyncio
+        import io
+
+        class LegacyConverter(ClassLevelConverter):
+            def __init__(self):
+                pass
+
+            def convert(self, **kwargs):
+                print(f"converted {kwargs['to_x']}")
+
+        converter = LegacyConverter()
+        batches = list(converter.convert_batch(to_x="a"))
+        self.assertEqual([batch.outputs for batch in batches], [["converted a"]])
+        out = io.StringIO()
+        converter.convert_to(out, to_x="b")
+        self.assertEqual(out.getvalue(), "converted b\n")
+        buffer = asyncio.run(converter.aconvert(to_x="c"))
+        self.assertEqual(next(buffer.slice(0, 1)).outputs, ["converted c"])
+
+        class EmptyConverter(BaseConverter):
+            name = "empty"
+
+            @classmethod
+            def configure_args(cls, builder):
+                pass
+
+        with self.assertRaises(ConverterError):
+            list(EmptyConverter().convert_batch())
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, "uc_test_plugin.py"), "w") as f:
+            f.write(PLUGIN_SOURCE)
+        sys.path.insert(0, self.tmp.name)
+        self.manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        ConverterRegistry.register_lazy("plugin", "uc_test_plugin:PluginConverter")
+
+    def tearDown(self):
+        sys.path.remove(self.tmp.name)
+        sys.modules.pop("uc_test_plugin", None)
+        ConverterRegistry._lazy.pop("plugin", None)
+        ConverterRegistry._converters.pop("plugin", None)
+        ConverterRegistry._infos.pop("plugin", None)
+        ConverterRegistry.use_manifest(None)
+        self.tmp.cleanup()
+
+    def test_metadata_served_from_manifest(self):
+        ConverterRegistry.use_manifest(PluginManifest(self.manifest_path))
+        self.assertEqual(ConverterRegistry.list_converters()["plugin"], "plugin help")
+        self.assertTrue(os.path.exists(self.manifest_path))
+
+        # A fresh process: nothing imported, metadata comes from the manifest
+        sys.modules.pop("uc_test_plugin")
+        ConverterRegistry._converters.pop("plugin")
+        ConverterRegistry._infos.pop("plugin")
+        ConverterRegistry.use_manifest(PluginManifest(self.manifest_path))
+
+        info = ConverterRegistry.get_metadata()["plugin"]
+        self.assertEqual(info.spec["arguments"][0]["name"], "value")
+        self.assertNotIn("uc_test_plugin", sys.modules)
+
+        converter_cls = ConverterRegistry.get_converter("plugin")
+        self.assertEqual(converter_cls.__name__, "PluginConverter")
+
+    def test_entries_depend_on_whole_package(self):
+        package = os.path.join(self.tmp.name, "uc_test_package")
+        os.makedirs(os.path.join(package, "engines"))
+        for name in ("__init__.py", "plugin.py", os.path.join("engines", "__init__.py")):
+            open(os.path.join(package, name), "w").close()
+        choices = os.path.join(package, "engines", "choices.py")
+        with open(choices, "w") as f:
+            f.write("CHOICES = ('a',)\n")
+
+        manifest = PluginManifest(self.manifest_path)
+        target = "uc_test_package.plugin:PluginConverter"
+        manifest.put("package", target, "help", {})
+        self.assertIsNotNone(manifest.get("package", target))
+
+        # Choices defined in another module of the package change the spec
+        with open(choices, "w") as f:
+            f.write("CHOICES = ('a', 'b')\n")
+        self.assertIsNone(manifest.get("package", target))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import io
+import os
+import tempfile
+from unittest import mock
+from converter.converters.datetime_converter import DatetimeConverter
+from converter.converters.number_converter import NumberConverter
+from converter.core.metrics import METRICS
+from converter.core.result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.dict(os.environ, UNIVERSAL_CONVERTER_CACHE_DIR=os.path.join(self.tmp.name, "cache"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.input = self._write("input.txt", "0xA\nzz\n0x10\n")
+
+    def _write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def _convert(self, converter=None, **kwargs):
+        out = io.StringIO()
+        (converter or NumberConverter()).convert_to(out, **dict(dict(hex2dec="", input=self.input), **kwargs))
+        return out.getvalue()
+
+    def _entries(self):
+        return len(ResultCache().entries())
+
+    def test_hit_replays_results_and_exports(self):
+        export = os.path.join(self.tmp.name, "first.csv")
+        first = self._convert(export=export)
+        self.assertEqual(self._entries(), 1)
+
+        converter = NumberConverter()
+        converter.convert_batch = mock.Mock(side_effect=AssertionError("converted again"))
+        METRICS.reset()
+        again = os.path.join(self.tmp.name, "again.csv")
+        self.assertEqual(self._convert(converter, export=again), first.replace("first.csv", "again.csv"))
+        with open(export) as a, open(again) as b:
+            self.assertEqual(a.read(), b.read())
+        counters = {c["counter"]: c["value"] for c in METRICS.snapshot()["counters"]}
+        self.assertEqual((counters["result_cache_hits"], counters["rows"], counters["errors"]), (1, 3, 1))
+
+        # Exports not stored with the entry are written from the cached results
+        jsonl = os.path.join(self.tmp.name, "again.jsonl")
+        self._convert(converter, export=jsonl)
+        self.assertTrue(os.path.getsize(jsonl))
+
+    def test_key(self):
+        self._convert()
+        self._convert(dec2hex="", hex2dec=None)
+        self._convert(DatetimeConverter(), to_dt="", hex2dec=None)
+        self.assertEqual(self._entries(), 3)
+
+        self._write("input.txt", "0xB\n")
+        self.assertEqual(self._convert(), "11\n")
+        self.assertEqual(self._entries(), 4)
+
+    def test_to_ts_key_depends_on_time_zone(self):
+        converter = DatetimeConverter()
+        kwargs = dict(to_ts="", input=self.input)
+        with mock.patch("time.tzname", ("UTC", "UTC")):
+            utc = converter.cache_key(kwargs)
+        with mock.patch("time.tzname", ("CET", "CEST")):
+            self.assertNotEqual(converter.cache_key(kwargs), utc)
+
+    def test_uncached_conversions(self):
+        self._convert(no_cache=True)
+        self._convert(hex2dec="0xA", input=None)
+        self.assertEqual(self._entries(), 0)
+        with mock.patch.dict(os.environ, UNIVERSAL_CONVERTER_RESULT_CACHE_MB="0"):
+            self._convert()
+        self.assertEqual(self._entries(), 0)
+
+    def test_oversized_and_unpicklable_entries_dropped(self):
+        cache = ResultCache(os.path.join(self.tmp.name, "small"), max_bytes=150)
+        writer = cache.writer("big")
+        for _ in range(4):
+            writer.write("x" * 40)
+        writer.commit([])
+        writer = cache.writer("bad")
+        writer.write(lambda: None)
+        writer.write("x")
+        writer.commit([])
+        self.assertEqual((cache.get("big"), cache.get("bad"), os.listdir(cache.path)), (None, None, []))
+
+    def test_least_recently_used_eviction(self):
+        cache = ResultCache(os.path.join(self.tmp.name, "small"), max_bytes=150)
+        for key, text in (("a", "x" * 40), ("b", "y" * 40)):
+            writer = cache.writer(key)
+            writer.write(text)  # About 60 bytes pickled
+            writer.commit([])
+        os.utime(os.path.join(cache.path, "a"), (0, 0))
+        self.assertIsNotNone(cache.get("a"))  # Used again: "b" is now the oldest
+        writer = cache.writer("c")
+        writer.write("z" * 40)
+        writer.commit([])
+        self.assertEqual(sorted(entry.name for entry in cache.entries()), ["a", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import csv
+import io
+import os
+import tempfile
+from openpyxl import Workbook, load_workbook
+from converter.converters.datetime_converter import DatetimeConverter
+from converter.converters.number_converter import NumberConverter
+from converter.core.buffer import BufferSink
+from converter.core.exceptions import ValidationError
+from converter.core.tables import read_table
+
+
+class TestColumnMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.csv = self._path("input.csv")
+        with open(self.csv, "w", newline="") as f:
+            f.write('id,ts,note\n1,1672574400,a\n2,,b\n3,bad,"c,d"\n4,1672574460,e\n')
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def _convert(self, converter=None, **kwargs):
+        out = io.StringIO()
+        options = dict(to_dt="", input=self.csv, column="ts", no_cache=True)
+        (converter or DatetimeConverter()).convert_to(out, **dict(options, **kwargs))
+        return out.getvalue()
+
+    def test_csv_export(self):
+        export = self._path("output.csv")
+        converter = DatetimeConverter()
+        converter.chunk_size = 3
+        self._convert(converter, export=export)
+        with open(export, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows, [
+            ["id", "ts", "note", "ts_to_dt"],
+            ["1", "1672574400", "a", "2023-01-01T12:00:00+00:00"],
+            ["2", "", "b", ""],
+            ["3", "bad", "c,d", "Error"],
+            ["4", "1672574460", "e", "2023-01-01T12:01:00+00:00"],
+        ])
+
+    def test_xlsx_keeps_cell_types(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        for row in (["Hex", "Count"], ["0xA", 1], [None, 2], ["0x10"], ["zz", 4]):
+            sheet.append(row)
+        source = self._path("input.xlsx")
+        workbook.save(source)
+
+        export = self._path("output.xlsx")
+        self._convert(NumberConverter(), to_dt=None, hex2dec="", input=source, column="Hex", export=export)
+        rows = list(load_workbook(export).active.iter_rows(values_only=True))
+        self.assertEqual(rows, [("Hex", "Count", "Hex_hex2dec"), ("0xA", 1, 10), (None, 2, None),
+                                ("0x10", None, 16), ("zz", 4, "Error")])
+
+    def test_text_and_buffer(self):
+        self.assertEqual(self._convert().splitlines()[:2], ["2023-01-01T12:00:00+00:00", ""])
+
+        sink = BufferSink()
+        DatetimeConverter().run(sinks=[sink], to_dt="", input=self.csv, column="ts", no_cache=True)
+        batch = next(sink.buffer.slice(1, 3))
+        self.assertEqual((batch.table["id"], batch.outputs, batch.output_column), (["2", "3"], [None, None], "ts_to_dt"))
+        self.assertEqual(sink.buffer.error_count, 1)
+
+    def test_workers_keep_rows_aligned(self):
+        # A quoted cell holding a newline is one value, in every chunk and process
+        with open(self.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Hex"])
+            writer.writerows([["0x1"]] * 25 + [["0xA\n0xB"]] + [["0x2"]] * 24)
+        converter = NumberConverter()
+        converter.chunk_size = 10
+        rows = {}
+        for workers in ("1", "2"):
+            sink = BufferSink()
+            converter.run(sinks=[sink], hex2dec="", input=self.csv, column="Hex", workers=workers, no_cache=True)
+            batches = list(sink.buffer.slice(0, 50))
+            rows[workers] = ([output for batch in batches for output in batch.outputs],
+                             [error is None for batch in batches for error in batch.errors])
+        self.assertEqual(rows["2"], rows["1"])
+        self.assertEqual(rows["2"][0][24:27], [1, None, 2])
+        self.assertFalse(rows["2"][1][25])
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValidationError, "columns: id, ts, note"):
+            self._convert(column="missing")
+        with self.assertRaises(ValidationError):
+            self._convert(to_dt="1672574400")
+        with self.assertRaises(ValidationError):
+            list(read_table(self._path("input.txt"), 10))
+
+
+if __name__ == "__main__":
+    unittest.main()